@@ -0,0 +1,15 @@
+"""Add (name, id) index on vbus for keyset pagination
+
+Revision ID: 012_vbu_keyset_index
+Revises: 011_add_must_reset_password
+"""
+from alembic import op
+
+revision = "012_vbu_keyset_index"
+down_revision = "011_add_must_reset_password"
+
+def upgrade():
+    op.create_index("ix_vbus_name_id", "vbus", ["name", "id"])
+
+def downgrade():
+    op.drop_index("ix_vbus_name_id", "vbus")
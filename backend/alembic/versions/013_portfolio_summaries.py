@@ -0,0 +1,58 @@
+"""Add maintained portfolio_summaries table
+
+Revision ID: 013_portfolio_summaries
+Revises: 012_vbu_keyset_index
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, ENUM
+
+revision = "013_portfolio_summaries"
+down_revision = "012_vbu_keyset_index"
+
+def upgrade():
+    op.create_table(
+        "portfolio_summaries",
+        sa.Column("vbu_id", UUID(as_uuid=True), sa.ForeignKey("vbus.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("gm_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("group_leader_id", UUID(as_uuid=True), nullable=True),
+        sa.Column("gm_name", sa.String(255), nullable=False),
+        sa.Column("lifecycle_lane", ENUM(name="lifecyclelane", create_type=False), nullable=False),
+        sa.Column("success_description", sa.Text(), nullable=True),
+        sa.Column("primary_constraint", sa.Text(), nullable=True),
+        sa.Column("portfolio_notes", sa.Text(), nullable=True),
+        sa.Column("health_indicator", sa.String(20), nullable=False),
+        sa.Column("currently_testing", sa.Text(), nullable=True),
+        sa.Column("next_review_date", sa.Date(), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_portfolio_summaries_name", "portfolio_summaries", ["name"])
+    op.create_index("ix_portfolio_summaries_gm_id", "portfolio_summaries", ["gm_id"])
+    op.create_index("ix_portfolio_summaries_group_leader_id", "portfolio_summaries", ["group_leader_id"])
+
+    # Initial population; afterwards rows are maintained by canvas.portfolio.summary
+    op.execute("""
+        INSERT INTO portfolio_summaries (
+            vbu_id, name, gm_id, group_leader_id, gm_name, lifecycle_lane,
+            success_description, primary_constraint, portfolio_notes,
+            health_indicator, currently_testing, next_review_date
+        )
+        SELECT
+            v.id, v.name, v.gm_id, v.group_leader_id, u.name, c.lifecycle_lane,
+            c.success_description, c.primary_constraint, c.portfolio_notes,
+            COALESCE(c.health_indicator_cache, 'Not Started'),
+            CASE c.currently_testing_type
+                WHEN 'thesis' THEN t.text
+                WHEN 'proof_point' THEN pp.description
+            END,
+            (SELECT MIN(mr.review_date) + 30 FROM monthly_reviews mr WHERE mr.canvas_id = c.id)
+        FROM vbus v
+        JOIN users u ON u.id = v.gm_id
+        JOIN canvases c ON c.vbu_id = v.id
+        LEFT JOIN theses t ON c.currently_testing_type = 'thesis' AND t.id = c.currently_testing_id
+        LEFT JOIN proof_points pp ON c.currently_testing_type = 'proof_point' AND pp.id = c.currently_testing_id
+    """)
+
+def downgrade():
+    op.drop_table("portfolio_summaries")
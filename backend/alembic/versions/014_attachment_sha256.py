@@ -0,0 +1,16 @@
+"""add attachments.sha256 content digest
+
+Revision ID: 014_attachment_sha256
+Revises: 013_portfolio_summaries
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "014_attachment_sha256"
+down_revision = "013_portfolio_summaries"
+
+def upgrade():
+    op.add_column("attachments", sa.Column("sha256", sa.String(64), nullable=True))
+
+def downgrade():
+    op.drop_column("attachments", "sha256")
@@ -0,0 +1,17 @@
+"""content-addressed attachment blobs: storage_path is shared, not unique
+
+Revision ID: 015_attachment_blob_store
+Revises: 014_attachment_sha256
+"""
+from alembic import op
+
+revision = "015_attachment_blob_store"
+down_revision = "014_attachment_sha256"
+
+def upgrade():
+    op.drop_constraint("uq_attachments_storage_path", "attachments", type_="unique")
+    op.create_index("ix_attachments_storage_path", "attachments", ["storage_path"])
+
+def downgrade():
+    op.drop_index("ix_attachments_storage_path", table_name="attachments")
+    op.create_unique_constraint("uq_attachments_storage_path", "attachments", ["storage_path"])
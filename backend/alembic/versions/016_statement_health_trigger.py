@@ -0,0 +1,183 @@
+"""Statement-level health indicator triggers using transition tables
+
+Replaces the FOR EACH ROW proof_points trigger from 006. Each statement now
+collects the affected canvases from its transition tables and recomputes each
+of them once with a single FILTER aggregate. The 006 function's UPDATE was
+not correlated to the target row and overwrote every canvas. Run
+`python -m canvas.recompute_health` after upgrading to repair existing values.
+
+Revision ID: 016_statement_health_trigger
+Revises: 015_attachment_blob_store
+"""
+from alembic import op
+
+revision = "016_statement_health_trigger"
+down_revision = "015_attachment_blob_store"
+
+def upgrade():
+    op.execute("DROP TRIGGER IF EXISTS proof_point_health_update ON proof_points;")
+    op.execute("DROP FUNCTION IF EXISTS update_canvas_health_indicator();")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION recompute_canvas_health(canvas_ids uuid[])
+        RETURNS void AS $$
+            UPDATE canvases c
+            SET health_indicator_cache = CASE
+                    WHEN s.stalled > 0 THEN 'At Risk'
+                    WHEN s.started = 0 THEN 'Not Started'
+                    WHEN s.observed > 0 THEN 'On Track'
+                    ELSE 'In Progress'
+                END,
+                health_computed_at = NOW()
+            FROM (
+                SELECT cv.id AS canvas_id,
+                       COUNT(pp.id) FILTER (WHERE pp.status = 'stalled') AS stalled,
+                       COUNT(pp.id) FILTER (WHERE pp.status <> 'not_started') AS started,
+                       COUNT(pp.id) FILTER (WHERE pp.status = 'observed') AS observed
+                FROM canvases cv
+                LEFT JOIN theses t ON t.canvas_id = cv.id
+                LEFT JOIN proof_points pp ON pp.thesis_id = t.id
+                WHERE cv.id = ANY(canvas_ids)
+                GROUP BY cv.id
+            ) s
+            WHERE c.id = s.canvas_id;
+        $$ LANGUAGE sql;
+    """)
+
+    # Only the branch matching TG_OP is planned, so each trigger may expose
+    # just the transition tables its event provides.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION proof_points_health_trigger()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            affected uuid[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                affected := ARRAY(
+                    SELECT DISTINCT t.canvas_id FROM new_rows n JOIN theses t ON t.id = n.thesis_id
+                );
+            ELSIF TG_OP = 'DELETE' THEN
+                affected := ARRAY(
+                    SELECT DISTINCT t.canvas_id FROM old_rows o JOIN theses t ON t.id = o.thesis_id
+                );
+            ELSE
+                affected := ARRAY(
+                    SELECT DISTINCT t.canvas_id
+                    FROM new_rows n
+                    JOIN old_rows o ON o.id = n.id
+                    JOIN theses t ON t.id IN (n.thesis_id, o.thesis_id)
+                    WHERE n.status IS DISTINCT FROM o.status
+                       OR n.thesis_id IS DISTINCT FROM o.thesis_id
+                );
+            END IF;
+            IF cardinality(affected) > 0 THEN
+                PERFORM recompute_canvas_health(affected);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Deleting or moving a thesis changes its canvas' proof points; cascaded
+    # proof point deletes can no longer see the thesis, so catch it here.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION theses_health_trigger()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            affected uuid[];
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                affected := ARRAY(SELECT DISTINCT canvas_id FROM old_rows);
+            ELSE
+                affected := ARRAY(
+                    SELECT DISTINCT c.id
+                    FROM new_rows n
+                    JOIN old_rows o ON o.id = n.id
+                    JOIN canvases c ON c.id IN (n.canvas_id, o.canvas_id)
+                    WHERE n.canvas_id IS DISTINCT FROM o.canvas_id
+                );
+            END IF;
+            IF cardinality(affected) > 0 THEN
+                PERFORM recompute_canvas_health(affected);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Transition tables require one event per trigger
+    op.execute("""
+        CREATE TRIGGER proof_points_health_insert
+            AFTER INSERT ON proof_points
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION proof_points_health_trigger();
+    """)
+    op.execute("""
+        CREATE TRIGGER proof_points_health_update
+            AFTER UPDATE ON proof_points
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION proof_points_health_trigger();
+    """)
+    op.execute("""
+        CREATE TRIGGER proof_points_health_delete
+            AFTER DELETE ON proof_points
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION proof_points_health_trigger();
+    """)
+    op.execute("""
+        CREATE TRIGGER theses_health_update
+            AFTER UPDATE ON theses
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION theses_health_trigger();
+    """)
+    op.execute("""
+        CREATE TRIGGER theses_health_delete
+            AFTER DELETE ON theses
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION theses_health_trigger();
+    """)
+
+def downgrade():
+    for trigger, table in (
+        ("theses_health_delete", "theses"),
+        ("theses_health_update", "theses"),
+        ("proof_points_health_delete", "proof_points"),
+        ("proof_points_health_update", "proof_points"),
+        ("proof_points_health_insert", "proof_points"),
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS theses_health_trigger();")
+    op.execute("DROP FUNCTION IF EXISTS proof_points_health_trigger();")
+    op.execute("DROP FUNCTION IF EXISTS recompute_canvas_health(uuid[]);")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_canvas_health_indicator()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE canvases 
+            SET health_indicator_cache = (
+                CASE 
+                    WHEN EXISTS(SELECT 1 FROM proof_points pp JOIN theses t ON pp.thesis_id = t.id 
+                               WHERE t.canvas_id = c.id AND pp.status = 'stalled') THEN 'At Risk'
+                    WHEN NOT EXISTS(SELECT 1 FROM proof_points pp JOIN theses t ON pp.thesis_id = t.id 
+                                   WHERE t.canvas_id = c.id AND pp.status != 'not_started') THEN 'Not Started'
+                    WHEN EXISTS(SELECT 1 FROM proof_points pp JOIN theses t ON pp.thesis_id = t.id 
+                               WHERE t.canvas_id = c.id AND pp.status = 'observed') 
+                         AND NOT EXISTS(SELECT 1 FROM proof_points pp JOIN theses t ON pp.thesis_id = t.id 
+                                       WHERE t.canvas_id = c.id AND pp.status = 'stalled') THEN 'On Track'
+                    ELSE 'In Progress'
+                END
+            ),
+            health_computed_at = NOW()
+            FROM canvases c
+            JOIN theses t ON t.canvas_id = c.id
+            WHERE t.id = COALESCE(NEW.thesis_id, OLD.thesis_id);
+            RETURN COALESCE(NEW, OLD);
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER proof_point_health_update
+            AFTER INSERT OR UPDATE OR DELETE ON proof_points
+            FOR EACH ROW EXECUTE FUNCTION update_canvas_health_indicator();
+    """)
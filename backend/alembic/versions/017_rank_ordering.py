@@ -0,0 +1,56 @@
+"""Lexicographic rank keys for theses and proof points
+
+Theses move from a unique integer "order" (which reorder_theses could only
+rewrite by dropping and re-adding the constraint) to a rank key under a plain
+unique constraint; the 1-5 position is now derived. Proof points, previously
+ordered by created_at, get the same key.
+
+Revision ID: 017_rank_ordering
+Revises: 016_statement_health_trigger
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "017_rank_ordering"
+down_revision = "016_statement_health_trigger"
+
+# Same shape as canvas.ranking.rank_for_position
+_RANK_FOR = "'a' || lpad(({})::text, 6, '0') || 'V'"
+
+def upgrade():
+    op.add_column("theses", sa.Column("rank", sa.String(255, collation="C"), nullable=True))
+    op.execute(f"""
+        UPDATE theses t SET rank = {_RANK_FOR.format('n.position')}
+        FROM (SELECT id, row_number() OVER (PARTITION BY canvas_id ORDER BY "order") AS position FROM theses) n
+        WHERE n.id = t.id
+    """)
+    op.alter_column("theses", "rank", nullable=False)
+    op.drop_constraint("uq_theses_canvas_order", "theses", type_="unique")
+    op.drop_constraint("ck_thesis_order_range", "theses", type_="check")
+    op.drop_column("theses", "order")
+    op.create_unique_constraint("uq_theses_canvas_rank", "theses", ["canvas_id", "rank"])
+
+    op.add_column("proof_points", sa.Column("rank", sa.String(255, collation="C"), nullable=True))
+    op.execute(f"""
+        UPDATE proof_points p SET rank = {_RANK_FOR.format('n.position')}
+        FROM (SELECT id, row_number() OVER (PARTITION BY thesis_id ORDER BY created_at, id) AS position FROM proof_points) n
+        WHERE n.id = p.id
+    """)
+    op.alter_column("proof_points", "rank", nullable=False)
+    op.create_unique_constraint("uq_proof_points_thesis_rank", "proof_points", ["thesis_id", "rank"])
+
+def downgrade():
+    op.drop_constraint("uq_proof_points_thesis_rank", "proof_points", type_="unique")
+    op.drop_column("proof_points", "rank")
+
+    op.drop_constraint("uq_theses_canvas_rank", "theses", type_="unique")
+    op.add_column("theses", sa.Column("order", sa.Integer(), nullable=True))
+    op.execute("""
+        UPDATE theses t SET "order" = n.position
+        FROM (SELECT id, row_number() OVER (PARTITION BY canvas_id ORDER BY rank) AS position FROM theses) n
+        WHERE n.id = t.id
+    """)
+    op.alter_column("theses", "order", nullable=False)
+    op.drop_column("theses", "rank")
+    op.create_unique_constraint("uq_theses_canvas_order", "theses", ["canvas_id", "order"])
+    op.create_check_constraint("ck_thesis_order_range", "theses", '"order" BETWEEN 1 AND 5')
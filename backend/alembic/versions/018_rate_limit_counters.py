@@ -0,0 +1,24 @@
+"""Add UNLOGGED rate_limit_counters table for the shared rate limiter
+
+Revision ID: 018_rate_limit_counters
+Revises: 017_rank_ordering
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "018_rate_limit_counters"
+down_revision = "017_rank_ordering"
+
+def upgrade():
+    op.create_table(
+        "rate_limit_counters",
+        sa.Column("key", sa.String(255), primary_key=True),
+        sa.Column("window_start", sa.BigInteger(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index("ix_rate_limit_counters_expires_at", "rate_limit_counters", ["expires_at"])
+
+def downgrade():
+    op.drop_table("rate_limit_counters")
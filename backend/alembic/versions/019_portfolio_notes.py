@@ -0,0 +1,45 @@
+"""Move portfolio notes from every canvas row to a versioned portfolio_notes table
+
+Revision ID: 019_portfolio_notes
+Revises: 018_rate_limit_counters
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "019_portfolio_notes"
+down_revision = "018_rate_limit_counters"
+
+def upgrade():
+    op.create_table(
+        "portfolio_notes",
+        sa.Column("version", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_by", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # The notes endpoint wrote the same text to every canvas; carry the most common value over
+    op.execute("""
+        INSERT INTO portfolio_notes (notes)
+        SELECT portfolio_notes FROM canvases
+        WHERE portfolio_notes IS NOT NULL
+        GROUP BY portfolio_notes
+        ORDER BY count(*) DESC, max(updated_at) DESC
+        LIMIT 1
+    """)
+    # The summary now reads the current version directly
+    op.drop_column("portfolio_summaries", "portfolio_notes")
+
+def downgrade():
+    # Before 019 the notes endpoint wrote the current text to every canvas and
+    # summary; put the latest version back there so it survives the drop
+    op.execute("""
+        UPDATE canvases SET portfolio_notes = latest.notes
+        FROM (SELECT notes FROM portfolio_notes ORDER BY version DESC LIMIT 1) latest
+    """)
+    op.add_column("portfolio_summaries", sa.Column("portfolio_notes", sa.Text(), nullable=True))
+    op.execute("""
+        UPDATE portfolio_summaries s SET portfolio_notes = c.portfolio_notes
+        FROM canvases c WHERE c.vbu_id = s.vbu_id
+    """)
+    op.drop_table("portfolio_notes")
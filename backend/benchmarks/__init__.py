@@ -0,0 +1,13 @@
+"""End-to-end API latency benchmarks.
+
+`python -m benchmarks.run` drives weighted scenario mixes (dashboard load,
+canvas open, inline edits, review creation, PDF export, attachment
+upload/download) against `canvas.main.create_app` in-process, or against a
+running server with --base-url, and writes a JSON report of per-route and
+per-scenario latency percentiles and throughput. `python -m benchmarks.compare`
+diffs two reports.
+
+The target database should hold a generated dataset (`python -m canvas.seed
+--vbus 5000 ...`, or pass --seed-args) and be disposable: the write scenarios
+add reviews and attachments and edit existing rows.
+"""
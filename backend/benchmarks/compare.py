@@ -0,0 +1,69 @@
+"""
+Compare two benchmark reports route by route.
+
+Usage: python -m benchmarks.compare BASE.json HEAD.json [--metric p95_ms] [--threshold 10]
+
+Prints each route's percentiles in both reports with the change in percent,
+and exits with status 1 if any route's --metric got more than --threshold
+percent slower, so it can gate an upgrade.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+
+def compare(base: dict, head: dict, metric: str, threshold: float):
+    """Return (rows, regressions) for the routes and scenarios in either report."""
+    rows, regressions = [], []
+    for section in ("routes", "scenarios"):
+        names = sorted(set(base.get(section, {})) | set(head.get(section, {})))
+        for name in names:
+            before, after = base[section].get(name), head[section].get(name)
+            row = {"section": section, "name": name}
+            for key in METRICS:
+                old = before[key] if before else None
+                new = after[key] if after else None
+                change = (new - old) / old * 100 if old and new is not None else None
+                row[key] = (old, new, change)
+            rows.append(row)
+            change = row[metric][2]
+            # Throughput regresses by going down, latency by going up
+            if change is not None and (-change if metric == "throughput_rps" else change) > threshold:
+                regressions.append(row)
+    return rows, regressions
+
+
+def _format(old, new, change) -> str:
+    fmt = lambda value: "-" if value is None else f"{value:.1f}"
+    delta = "" if change is None else f" ({change:+.0f}%)"
+    return f"{fmt(old)} -> {fmt(new)}{delta}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--metric", choices=METRICS, default="p95_ms")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    args = parser.parse_args(argv)
+
+    base = json.loads(Path(args.base).read_text())
+    head = json.loads(Path(args.head).read_text())
+    rows, regressions = compare(base, head, args.metric, args.threshold)
+
+    print(f"base {base['meta'].get('commit')}  head {head['meta'].get('commit')}")
+    for row in rows:
+        cells = "  ".join(f"{key} {_format(*row[key])}" for key in METRICS)
+        print(f"{row['section'][:-1]:8} {row['name']:48} {cells}")
+    if regressions:
+        print(f"{len(regressions)} regressed by more than {args.threshold:g}% on {args.metric}:")
+        for row in regressions:
+            print(f"  {row['name']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
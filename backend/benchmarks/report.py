@@ -0,0 +1,69 @@
+"""Latency recording and the JSON report format."""
+import math
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    """Percentiles in milliseconds, plus throughput over the measured window."""
+    values = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 3) if elapsed > 0 else 0.0,
+        "mean_ms": ms(sum(values) / len(values)) if values else 0.0,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "max_ms": ms(values[-1]) if values else 0.0,
+    }
+
+
+class Recorder:
+    """Collects latencies per route and per scenario while recording is on."""
+
+    def __init__(self):
+        self.recording = False
+        self.routes: Dict[str, List[float]] = defaultdict(list)
+        self.route_errors: Dict[str, int] = defaultdict(int)
+        self.scenarios: Dict[str, List[float]] = defaultdict(list)
+        self.scenario_errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def route(self, name: str, seconds: float, status_code: int) -> None:
+        if not self.recording:
+            return
+        self.routes[name].append(seconds)
+        self.statuses[name][status_code] += 1
+        if status_code >= 400:
+            self.route_errors[name] += 1
+
+    def scenario(self, name: str, seconds: float, failed: bool) -> None:
+        if not self.recording:
+            return
+        self.scenarios[name].append(seconds)
+        if failed:
+            self.scenario_errors[name] += 1
+
+    def report(self, elapsed: float, meta: dict) -> dict:
+        return {
+            "meta": meta,
+            "routes": {
+                name: {**summarize(values, self.route_errors[name], elapsed),
+                       "statuses": {str(code): n for code, n in sorted(self.statuses[name].items())}}
+                for name, values in sorted(self.routes.items())
+            },
+            "scenarios": {
+                name: summarize(values, self.scenario_errors[name], elapsed)
+                for name, values in sorted(self.scenarios.items())
+            },
+        }
@@ -0,0 +1,147 @@
+"""
+Drive a weighted scenario mix against the API and write a JSON latency report.
+
+Usage: python -m benchmarks.run [--duration S] [--warmup S] [--concurrency N]
+                                [--mix name=weight,...] [--base-url URL] [--out FILE]
+
+Without --base-url the app from canvas.main.create_app runs in-process (its
+lifespan included) behind httpx's ASGI transport, so the numbers cover the
+application and database but not a server or network. Each of --concurrency
+workers runs scenarios back to back, picked by weight with a per-worker RNG
+derived from --seed. Only requests finishing after --warmup count.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+from canvas.config import Settings
+from benchmarks.report import Recorder
+from benchmarks.scenarios import DEFAULT_MIX, SCENARIOS, Client, load_dataset
+
+
+def parse_mix(value: str) -> dict:
+    """Parse 'dashboard=30,canvas_open=20' into scenario weights."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}; choose from {sorted(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("Mix needs at least one positive weight")
+    return mix
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def _worker(index, args, http, recorder, dataset, origin, deadline):
+    rng = random.Random(f"{args.seed}:{index}")
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        target = rng.choice(dataset.targets)
+        client = Client(http, recorder, origin)
+        started = time.perf_counter()
+        try:
+            await SCENARIOS[name](client, dataset, target, rng)
+        except httpx.HTTPError:
+            client.failed = True
+        recorder.scenario(name, time.perf_counter() - started, client.failed)
+
+
+async def main(args):
+    """Run the mix and write the report."""
+    try:
+        if args.seed_args is not None:
+            from canvas import seed
+            await seed.main(seed.parse_args(args.seed_args.split()))
+
+        dataset = await load_dataset(args.sample, args.seed)
+        settings = Settings()
+        origin = settings.cors_origins[0] if settings.cors_origins else None
+        recorder = Recorder()
+
+        async with AsyncExitStack() as stack:
+            if args.base_url:
+                http = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+            else:
+                from canvas.main import create_app
+                app = create_app()
+                await stack.enter_async_context(app.router.lifespan_context(app))
+                http = httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=args.timeout,
+                )
+            await stack.enter_async_context(http)
+
+            started = time.perf_counter()
+            deadline = started + args.warmup + args.duration
+            workers = [
+                asyncio.create_task(_worker(i, args, http, recorder, dataset, origin, deadline))
+                for i in range(args.concurrency)
+            ]
+            await asyncio.sleep(args.warmup)
+            recorder.recording = True
+            measured_from = time.perf_counter()
+            await asyncio.gather(*workers)
+            elapsed = time.perf_counter() - measured_from
+
+        report = recorder.report(elapsed, {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.base_url or "asgi",
+            "python": platform.python_version(),
+            "duration_s": round(elapsed, 3),
+            "warmup_s": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "sample": len(dataset.targets),
+            "mix": args.mix,
+            "dataset": dataset.counts,
+        })
+        Path(args.out).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(json.dumps({
+            "status": "success",
+            "out": args.out,
+            "requests": sum(route["count"] for route in report["routes"].values()),
+            "errors": sum(route["errors"] for route in report["routes"].values()),
+        }))
+    except Exception as e:
+        print(json.dumps({"status": "error", "message": str(e)}))
+        sys.exit(1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before recording")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="comma-separated scenario=weight pairs; default %(default)s")
+    parser.add_argument("--sample", type=int, default=200, help="VBUs the scenarios spread over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", default=None, help="benchmark a running server instead of in-process")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed-args", default=None,
+                        help="generate data first with these canvas.seed arguments, e.g. '--vbus 2000'")
+    parser.add_argument("--out", default="benchmark.json")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,242 @@
+"""Benchmark dataset sampling and the user journeys that make up a mix.
+
+Each scenario is one user action as the frontend performs it, issuing the
+same requests in the same order. Routes are recorded under their templates,
+so samples from different VBUs aggregate together.
+"""
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+from uuid import UUID
+import httpx
+from sqlalchemy import func, select
+from canvas.auth.service import AuthService
+from canvas.db import AsyncSessionLocal
+from canvas.models.attachment import Attachment
+from canvas.models.canvas import Canvas
+from canvas.models.monthly_review import MonthlyReview
+from canvas.models.proof_point import ProofPoint, ProofPointStatus
+from canvas.models.thesis import Thesis
+from canvas.models.user import User, UserRole
+from canvas.models.vbu import VBU
+from benchmarks.report import Recorder
+
+UPLOAD_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 256
+# Page size and page cap of the dashboard's ThesisHealthTile
+THESIS_HEALTH_PER_PAGE = 500
+THESIS_HEALTH_MAX_PAGES = 4
+
+
+@dataclass
+class Target:
+    """One sampled VBU with the ids a scenario needs and its GM's token."""
+    vbu_id: UUID
+    canvas_id: UUID
+    token: str
+    thesis_ids: List[UUID]
+    proof_point_ids: List[UUID]
+    attachment_ids: List[UUID] = field(default_factory=list)
+
+
+@dataclass
+class Dataset:
+    admin_token: str
+    targets: List[Target]
+    earliest_review: date
+    counts: Dict[str, int]
+    _review_days: itertools.count = field(default_factory=lambda: itertools.count(1))
+
+    def next_review_date(self) -> date:
+        """A date no review has used yet: walk back from the earliest existing one."""
+        return self.earliest_review - timedelta(days=next(self._review_days))
+
+
+async def load_dataset(sample: int, seed: int) -> Dataset:
+    """Sample VBUs (with canvases and theses) and mint tokens for their GMs and an admin."""
+    auth_service = AuthService()
+    async with AsyncSessionLocal() as db:
+        counts = {}
+        for name, model in (("vbus", VBU), ("theses", Thesis), ("proof_points", ProofPoint),
+                            ("monthly_reviews", MonthlyReview), ("attachments", Attachment)):
+            counts[name] = await db.scalar(select(func.count()).select_from(model))
+
+        admin = await db.scalar(
+            select(User).where(User.role == UserRole.ADMIN, User.is_active.is_(True)).order_by(User.email).limit(1)
+        )
+        if admin is None:
+            raise RuntimeError("No active admin user; seed the database first (python -m canvas.seed)")
+
+        rows = (await db.execute(
+            select(VBU.id, VBU.gm_id, Canvas.id)
+            .join(Canvas, Canvas.vbu_id == VBU.id)
+            .where(select(Thesis.id).where(Thesis.canvas_id == Canvas.id).exists())
+            .order_by(VBU.name, VBU.id)
+        )).all()
+        rows = random.Random(seed).sample(rows, min(sample, len(rows)))
+        if not rows:
+            raise RuntimeError("No canvases with theses; seed the database first (python -m canvas.seed)")
+
+        canvas_ids = [canvas_id for _, _, canvas_id in rows]
+        theses: Dict[UUID, List[UUID]] = {}
+        for thesis_id, canvas_id in await db.execute(
+            select(Thesis.id, Thesis.canvas_id).where(Thesis.canvas_id.in_(canvas_ids)).order_by(Thesis.rank)
+        ):
+            theses.setdefault(canvas_id, []).append(thesis_id)
+        proof_points: Dict[UUID, List[UUID]] = {}
+        attachments: Dict[UUID, List[UUID]] = {}
+        for proof_point_id, canvas_id, attachment_id in await db.execute(
+            select(ProofPoint.id, Thesis.canvas_id, Attachment.id)
+            .join(Thesis, ProofPoint.thesis_id == Thesis.id)
+            .outerjoin(Attachment, Attachment.proof_point_id == ProofPoint.id)
+            .where(Thesis.canvas_id.in_(canvas_ids))
+        ):
+            proof_points.setdefault(canvas_id, []).append(proof_point_id)
+            if attachment_id is not None:
+                attachments.setdefault(canvas_id, []).append(attachment_id)
+
+        gms = {
+            user.id: user for user in
+            (await db.execute(select(User).where(User.id.in_({gm_id for _, gm_id, _ in rows})))).scalars()
+        }
+        tokens = {gm_id: await auth_service.create_access_token(user) for gm_id, user in gms.items()}
+        earliest = await db.scalar(select(func.min(MonthlyReview.review_date))) or date.today()
+
+        return Dataset(
+            admin_token=await auth_service.create_access_token(admin),
+            targets=[
+                Target(
+                    vbu_id=vbu_id, canvas_id=canvas_id, token=tokens[gm_id], thesis_ids=theses[canvas_id],
+                    proof_point_ids=sorted(set(proof_points.get(canvas_id, []))),
+                    attachment_ids=attachments.get(canvas_id, []),
+                )
+                for vbu_id, gm_id, canvas_id in rows
+            ],
+            earliest_review=earliest,
+            counts=counts,
+        )
+
+
+class Client:
+    """Issues requests as a user and records each under its route template."""
+
+    def __init__(self, http: httpx.AsyncClient, recorder: Recorder, origin: Optional[str]):
+        self.http = http
+        self.recorder = recorder
+        self.origin = origin
+        self.failed = False
+
+    async def request(self, route: str, method: str, url: str, token: str, **kwargs) -> httpx.Response:
+        headers = {"Authorization": f"Bearer {token}", "X-CSRF-Token": "benchmark"}
+        if self.origin:
+            headers["Origin"] = self.origin
+        started = time.perf_counter()
+        response = await self.http.request(method, url, headers=headers, **kwargs)
+        await response.aread()
+        self.recorder.route(f"{method} {route}", time.perf_counter() - started, response.status_code)
+        if response.status_code >= 400:
+            self.failed = True
+        return response
+
+
+async def dashboard(client: Client, data: Dataset, target: Target, rng: random.Random) -> None:
+    token = data.admin_token
+    await client.request("/api/portfolio/summary", "GET", "/api/portfolio/summary", token)
+    # ThesisHealthTile pages through the list without detail, then loads one row's proof points on expand
+    theses: List[dict] = []
+    for page in range(1, THESIS_HEALTH_MAX_PAGES + 1):
+        response = await client.request(
+            "/api/portfolio/thesis-health", "GET", "/api/portfolio/thesis-health", token,
+            params={"page": page, "per_page": THESIS_HEALTH_PER_PAGE},
+        )
+        if response.status_code != 200:
+            break
+        body = response.json()
+        theses.extend(body["data"])
+        if len(theses) >= body["meta"]["total"] or not body["data"]:
+            break
+    if theses:
+        thesis_id = rng.choice(theses)["thesis_id"]
+        await client.request(
+            "/api/theses/{thesis_id}/proof-points", "GET", f"/api/theses/{thesis_id}/proof-points", token,
+        )
+    await client.request("/api/vbus", "GET", "/api/vbus", token, params={"per_page": 25})
+
+
+async def canvas_open(client: Client, data: Dataset, target: Target, rng: random.Random) -> None:
+    await client.request("/api/vbus/{vbu_id}/canvas", "GET", f"/api/vbus/{target.vbu_id}/canvas", target.token)
+    await client.request(
+        "/api/canvases/{canvas_id}/reviews", "GET", f"/api/canvases/{target.canvas_id}/reviews", target.token,
+    )
+
+
+async def inline_edit(client: Client, data: Dataset, target: Target, rng: random.Random) -> None:
+    if target.proof_point_ids:
+        await client.request(
+            "/api/proof-points/{proof_point_id}", "PATCH",
+            f"/api/proof-points/{rng.choice(target.proof_point_ids)}", target.token,
+            json={"status": rng.choice(list(ProofPointStatus)).value},
+        )
+    await client.request(
+        "/api/theses/{thesis_id}", "PATCH", f"/api/theses/{rng.choice(target.thesis_ids)}", target.token,
+        json={"description": f"Edited in benchmark {rng.getrandbits(32):08x}"},
+    )
+    await client.request(
+        "/api/vbus/{vbu_id}/canvas", "PUT", f"/api/vbus/{target.vbu_id}/canvas", target.token,
+        json={"primary_focus": f"Focus {rng.getrandbits(16):04x}"},
+    )
+
+
+async def review_create(client: Client, data: Dataset, target: Target, rng: random.Random) -> None:
+    await client.request(
+        "/api/canvases/{canvas_id}/reviews", "POST", f"/api/canvases/{target.canvas_id}/reviews", target.token,
+        json={
+            "review_date": data.next_review_date().isoformat(),
+            "what_moved": "Benchmark review",
+            "currently_testing_type": "thesis",
+            "currently_testing_id": str(rng.choice(target.thesis_ids)),
+            "commitments": [{"text": f"Commitment {order}", "order": order} for order in (1, 2)],
+        },
+    )
+
+
+async def pdf_export(client: Client, data: Dataset, target: Target, rng: random.Random) -> None:
+    await client.request("/api/vbus/{vbu_id}/canvas/pdf", "GET", f"/api/vbus/{target.vbu_id}/canvas/pdf", target.token)
+
+
+async def attachment(client: Client, data: Dataset, target: Target, rng: random.Random) -> None:
+    if not target.proof_point_ids:
+        return
+    response = await client.request(
+        "/api/attachments", "POST", "/api/attachments", target.token,
+        data={"proof_point_id": str(rng.choice(target.proof_point_ids))},
+        files={"file": (f"benchmark-{rng.getrandbits(32):08x}.pdf", UPLOAD_BYTES, "application/pdf")},
+    )
+    if response.status_code == 201:
+        target.attachment_ids.append(UUID(response.json()["data"]["id"]))
+    if target.attachment_ids:
+        await client.request(
+            "/api/attachments/{attachment_id}", "GET",
+            f"/api/attachments/{rng.choice(target.attachment_ids)}", target.token,
+        )
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "dashboard": dashboard,
+    "canvas_open": canvas_open,
+    "inline_edit": inline_edit,
+    "review_create": review_create,
+    "pdf_export": pdf_export,
+    "attachment": attachment,
+}
+
+DEFAULT_MIX = {
+    "dashboard": 30,
+    "canvas_open": 30,
+    "inline_edit": 25,
+    "review_create": 5,
+    "pdf_export": 3,
+    "attachment": 7,
+}
@@ -1,4 +1,18 @@
 from datetime import datetime, timezone
+from typing import Optional
+from fastapi.responses import JSONResponse, Response
+from pydantic_core import to_json
+
+
+class EnvelopeResponse(JSONResponse):
+    """JSON response rendered by pydantic-core in a single pass.
+
+    Pydantic models, UUIDs, datetimes and enums anywhere in the content are
+    serialized directly to bytes, without a jsonable_encoder walk first.
+    """
+
+    def render(self, content) -> bytes:
+        return to_json(content)
 
 
 def success_response(data, status_code=200):
@@ -19,4 +33,37 @@ def list_response(data, total, page=1, per_page=25):
             "per_page": per_page,
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
-    }
\ No newline at end of file
+    }
+
+
+def cursor_response(data, next_cursor, per_page=25, total=None):
+    """Return keyset-paginated list response envelope."""
+    return {
+        "data": data,
+        "meta": {
+            "next_cursor": next_cursor,
+            "per_page": per_page,
+            "total": total,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    }
+
+
+def raw_success_response(data_json: str, status_code=200) -> Response:
+    """Return success response envelope around an already-serialized JSON document."""
+    timestamp = datetime.now(timezone.utc).isoformat()
+    body = f'{{"data":{data_json},"meta":{{"timestamp":"{timestamp}"}}}}'
+    return Response(content=body.encode("utf-8"), status_code=status_code, media_type="application/json")
+
+
+def json_response(envelope: dict, status_code=200, response: Optional[Response] = None) -> EnvelopeResponse:
+    """Send an envelope built by the helpers above as an EnvelopeResponse.
+
+    Returning a Response skips FastAPI's own encoding, and with it the merge of
+    headers set on the route's injected Response; pass that as response to
+    carry them over.
+    """
+    result = EnvelopeResponse(envelope, status_code=status_code)
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
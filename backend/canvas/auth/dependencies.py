@@ -2,9 +2,11 @@ from typing import Callable
 from uuid import UUID
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from canvas.models.user import User, UserRole
 from canvas.auth.service import AuthService
+from canvas.auth.principal_cache import principal_cache
 from canvas.db import get_db_session
 from canvas.config import Settings
 
@@ -16,17 +18,21 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     db: AsyncSession = Depends(get_db_session)
 ) -> User:
-    """Extract user from X-Forwarded-User header (Pritunl Zero) or JWT token."""
+    """Extract user from X-Forwarded-User header (Pritunl Zero) or JWT token.
+
+    Resolved users are kept in the process-wide principal cache so repeat
+    requests skip the users lookup until the entry expires or is invalidated.
+    """
     # Try Pritunl Zero header first
     forwarded_user = request.headers.get("x-forwarded-user")
-    import logging
-    logging.getLogger("canvas").info(f"Auth headers: x-forwarded-user={forwarded_user}")
     if forwarded_user:
-        from sqlalchemy import select
-        from canvas.models.user import User as UserModel
-        result = await db.execute(select(UserModel).where(UserModel.email == forwarded_user))
+        user = principal_cache.get_by_email(forwarded_user)
+        if user is not None:
+            return user
+        result = await db.execute(select(User).where(User.email == forwarded_user))
         user = result.scalar_one_or_none()
         if user and user.is_active:
+            principal_cache.put(user, email=forwarded_user)
             return user
 
     # Fall back to JWT
@@ -43,10 +49,15 @@ async def get_current_user(
     except (KeyError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     
+    user = principal_cache.get_by_id(user_id)
+    if user is not None:
+        return user
+    
     user = await auth_service.get_user_by_id(user_id, db)
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     
+    principal_cache.put(user)
     return user
 
 def require_role(*roles) -> Callable[[User], User]:
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from fastapi import HTTPException, status
+from canvas.config import Settings
+
+T = TypeVar("T")
+
+class PasswordHasher:
+    """Runs bcrypt hashing/verification on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL, so a few threads keep CPU-bound hashing off the
+    event loop. At most ``workers + max_queue`` operations may be pending; past
+    that, callers get a 503 instead of queueing behind a login spike. A slot is
+    held until the bcrypt call itself finishes, even if its caller is cancelled.
+    The pool is created on first use, so it survives a shutdown() and restart.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 32):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._wait_lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) on the hashing pool, or raise 503 if the pool is saturated."""
+        if self._pending >= self.workers + self.max_queue:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        enqueued_at = time.perf_counter()
+
+        def timed():
+            self._record_wait(time.perf_counter() - enqueued_at)
+            return fn(*args)
+
+        future: Future = self._get_executor().submit(timed)
+        self._pending += 1
+        self._submitted += 1
+        loop = asyncio.get_running_loop()
+
+        def on_done(_):
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:  # loop already closed at shutdown
+                pass
+
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def metrics(self) -> dict:
+        """Snapshot of pool load and queue wait time."""
+        started = self._submitted - self._pending
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._pending,
+            "submitted": self._submitted,
+            "rejected": self._rejected,
+            "queue_wait_seconds_total": self._wait_seconds_total,
+            "queue_wait_seconds_max": self._wait_seconds_max,
+            "queue_wait_seconds_avg": self._wait_seconds_total / started if started > 0 else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    def _record_wait(self, waited: float) -> None:
+        # Called from worker threads
+        with self._wait_lock:
+            self._wait_seconds_total += waited
+            if waited > self._wait_seconds_max:
+                self._wait_seconds_max = waited
+
+
+_settings = Settings()
+password_hasher = PasswordHasher(_settings.password_hash_workers, _settings.password_hash_max_queue)
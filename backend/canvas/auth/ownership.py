@@ -0,0 +1,187 @@
+"""Resolve any canvas entity to the VBU that owns it.
+
+Every authorization check comes down to the same question: which VBU does
+this vbu / canvas / thesis / proof point / review / attachment belong to, and
+who are its GM and group leader? resolve_owner answers it with one query that
+walks primary-key joins up to vbus. The answer (the VBU and canvas ids plus the
+GM and group leader ids) is memoized on the request's session under the entity
+and under its VBU and canvas, so later checks in the same request cost nothing.
+"""
+from typing import NamedTuple, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import Row, cast, null, select, union_all
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from canvas.models.user import User, UserRole
+from canvas.models.vbu import VBU
+from canvas.models.canvas import Canvas
+from canvas.models.thesis import Thesis
+from canvas.models.proof_point import ProofPoint
+from canvas.models.monthly_review import MonthlyReview
+from canvas.models.attachment import Attachment
+
+_MEMO_KEY = "canvas.owners"
+
+_NOT_FOUND = {
+    "vbu": "VBU not found",
+    "canvas": "Canvas not found",
+    "thesis": "Thesis not found",
+    "proof_point": "Proof point not found",
+    "review": "Monthly review not found",
+    "attachment": "Attachment not found",
+}
+
+
+class Owner(NamedTuple):
+    """Owning VBU of an entity. vbu_id is None for a standalone attachment."""
+    vbu_id: Optional[UUID]
+    canvas_id: Optional[UUID]
+    gm_id: Optional[UUID]
+    group_leader_id: Optional[UUID]
+
+    @classmethod
+    def of_vbu(cls, vbu: VBU) -> "Owner":
+        return cls(vbu.id, None, vbu.gm_id, vbu.group_leader_id)
+
+
+def _owner_query(kind: str, entity_id: UUID):
+    columns = (VBU.id, Canvas.id, VBU.gm_id, VBU.group_leader_id)
+    if kind == "vbu":
+        return (
+            select(*columns).select_from(VBU)
+            .outerjoin(Canvas, Canvas.vbu_id == VBU.id)
+            .where(VBU.id == entity_id)
+        )
+    if kind == "canvas":
+        return (
+            select(*columns).select_from(Canvas)
+            .join(VBU, Canvas.vbu_id == VBU.id)
+            .where(Canvas.id == entity_id)
+        )
+    if kind == "thesis":
+        return (
+            select(*columns).select_from(Thesis)
+            .join(Canvas, Thesis.canvas_id == Canvas.id)
+            .join(VBU, Canvas.vbu_id == VBU.id)
+            .where(Thesis.id == entity_id)
+        )
+    if kind == "proof_point":
+        return (
+            select(*columns).select_from(ProofPoint)
+            .join(Thesis, ProofPoint.thesis_id == Thesis.id)
+            .join(Canvas, Thesis.canvas_id == Canvas.id)
+            .join(VBU, Canvas.vbu_id == VBU.id)
+            .where(ProofPoint.id == entity_id)
+        )
+    if kind == "review":
+        return (
+            select(*columns).select_from(MonthlyReview)
+            .join(Canvas, MonthlyReview.canvas_id == Canvas.id)
+            .join(VBU, Canvas.vbu_id == VBU.id)
+            .where(MonthlyReview.id == entity_id)
+        )
+    if kind == "attachment":
+        return attachment_owner_query(entity_id)
+    raise ValueError(f"Unknown entity kind: {kind}")
+
+
+def attachment_owner_query(attachment_id: UUID, *columns):
+    """Owner of an attachment, plus any extra Attachment columns, as one UNION ALL.
+
+    Each branch is a plain primary-key join chain: via its proof point, via its
+    monthly review, or (for a standalone upload) no VBU at all. The at-most-one-
+    parent check constraint means exactly one branch can match.
+    """
+    owner_columns = (
+        VBU.id.label("vbu_id"), Canvas.id.label("canvas_id"),
+        VBU.gm_id.label("gm_id"), VBU.group_leader_id.label("group_leader_id"),
+    )
+    no_owner = [cast(null(), PG_UUID(as_uuid=True)).label(c.name) for c in owner_columns]
+    via_proof_point = (
+        select(*owner_columns, *columns).select_from(Attachment)
+        .join(ProofPoint, Attachment.proof_point_id == ProofPoint.id)
+        .join(Thesis, ProofPoint.thesis_id == Thesis.id)
+        .join(Canvas, Thesis.canvas_id == Canvas.id)
+        .join(VBU, Canvas.vbu_id == VBU.id)
+        .where(Attachment.id == attachment_id)
+    )
+    via_review = (
+        select(*owner_columns, *columns).select_from(Attachment)
+        .join(MonthlyReview, Attachment.monthly_review_id == MonthlyReview.id)
+        .join(Canvas, MonthlyReview.canvas_id == Canvas.id)
+        .join(VBU, Canvas.vbu_id == VBU.id)
+        .where(Attachment.id == attachment_id)
+    )
+    standalone = (
+        select(*no_owner, *columns).select_from(Attachment)
+        .where(
+            Attachment.id == attachment_id,
+            Attachment.proof_point_id.is_(None),
+            Attachment.monthly_review_id.is_(None),
+        )
+    )
+    return union_all(via_proof_point, via_review, standalone)
+
+
+async def resolve_owner(db: AsyncSession, kind: str, entity_id: UUID) -> Optional[Owner]:
+    """Return the owning VBU of (kind, entity_id), or None if it doesn't exist."""
+    memo = db.info.setdefault(_MEMO_KEY, {})
+    owner = memo.get((kind, entity_id))
+    if owner is not None:
+        return owner
+
+    row = (await db.execute(_owner_query(kind, entity_id))).first()
+    if row is None:
+        return None
+    return _remember(db, kind, entity_id, Owner(*row))
+
+
+async def resolve_attachment(db: AsyncSession, attachment_id: UUID) -> Optional[Tuple[Row, Owner]]:
+    """Fetch an attachment's file fields and its owner in a single query.
+
+    Returns (row, owner), where row has filename, storage_path, content_type
+    and sha256, or None if the attachment doesn't exist.
+    """
+    row = (await db.execute(attachment_owner_query(
+        attachment_id,
+        Attachment.filename, Attachment.storage_path, Attachment.content_type, Attachment.sha256,
+    ))).first()
+    if row is None:
+        return None
+    return row, _remember(db, "attachment", attachment_id, Owner(*row[:4]))
+
+
+def _remember(db: AsyncSession, kind: str, entity_id: UUID, owner: Owner) -> Owner:
+    memo = db.info.setdefault(_MEMO_KEY, {})
+    memo[(kind, entity_id)] = owner
+    if owner.vbu_id is not None:
+        memo[("vbu", owner.vbu_id)] = owner
+    if owner.canvas_id is not None:
+        memo[("canvas", owner.canvas_id)] = owner
+    return owner
+
+
+def can_access(owner: Owner, user: User, write: bool = False) -> bool:
+    """Role rules shared by every ownership check.
+
+    Admins see everything, GMs and group leaders their own VBUs, and viewers
+    may read (never write) the VBU they are scoped to.
+    """
+    if user.role == UserRole.ADMIN:
+        return True
+    if user.role == UserRole.GROUP_LEADER:
+        return owner.group_leader_id == user.id
+    if user.role == UserRole.GM:
+        return owner.gm_id == user.id
+    return not write and owner.vbu_id is not None and user.vbu_id == owner.vbu_id
+
+
+async def authorize(db: AsyncSession, user: User, kind: str, entity_id: UUID, write: bool = False) -> Owner:
+    """Resolve the owner of (kind, entity_id) and raise 404/403 unless user may access it."""
+    owner = await resolve_owner(db, kind, entity_id)
+    if owner is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_NOT_FOUND[kind])
+    if not can_access(owner, user, write):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    return owner
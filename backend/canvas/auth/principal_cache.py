@@ -0,0 +1,149 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+import asyncpg
+import structlog
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession
+from canvas.models.user import User
+from canvas.config import Settings
+
+logger = structlog.get_logger(__name__)
+
+INVALIDATION_CHANNEL = "principal_cache"
+NOTIFY_SQL = text(f"SELECT pg_notify('{INVALIDATION_CHANNEL}', :user_id)")
+
+class PrincipalCache:
+    """Bounded TTL/LRU cache of authenticated users keyed by id and forwarded email.
+
+    Entries hold a column snapshot rather than the ORM instance, so each hit
+    returns a fresh detached User that no other request can mutate. Writers
+    invalidate locally and announce_invalidation() to the other workers, whose
+    InvalidationListener drops the same entries.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 30.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get_by_id(self, user_id: UUID) -> Optional[User]:
+        """Return a cached user by id, or None on miss/expiry."""
+        return self._get(("id", user_id))
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        """Return a cached user by forwarded email, or None on miss/expiry."""
+        return self._get(("email", email.lower()))
+
+    def put(self, user: User, email: Optional[str] = None) -> None:
+        """Cache user under its id and, for forwarded-user lookups, its email."""
+        if not self.enabled:
+            return
+        snapshot = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        expires_at = time.monotonic() + self.ttl_seconds
+        self._set(("id", user.id), expires_at, snapshot)
+        if email:
+            self._set(("email", email.lower()), expires_at, snapshot)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop every entry for user_id (role, activation or password changed)."""
+        stale = [key for key, (_, snapshot) in self._entries.items() if snapshot["id"] == user_id]
+        for key in stale:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get(self, key: tuple) -> Optional[User]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return User(**snapshot)
+
+    def _set(self, key: tuple, expires_at: float, snapshot: dict) -> None:
+        self._entries[key] = (expires_at, snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+async def announce_invalidation(db: AsyncSession, user_id: UUID) -> None:
+    """Tell every worker's cache to drop user_id once the current transaction commits.
+
+    Call before db.commit(); Postgres delivers the notification on commit and
+    discards it on rollback. The caller still invalidates its own cache.
+    """
+    await db.execute(NOTIFY_SQL, {"user_id": str(user_id)})
+
+
+class InvalidationListener:
+    """Applies invalidations announced by other workers to this worker's cache.
+
+    Holds one dedicated connection LISTENing on INVALIDATION_CHANNEL and
+    reconnects after retry_seconds if it drops. The cache is cleared on every
+    (re)subscribe, since announcements made while unsubscribed are lost; the
+    cache TTL bounds staleness during the gap.
+    """
+
+    def __init__(self, cache: PrincipalCache, retry_seconds: float = 5.0):
+        self.cache = cache
+        self.retry_seconds = retry_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.subscribed = asyncio.Event()
+
+    def start(self, url: URL) -> None:
+        if self._task is None and self.cache.enabled:
+            dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+            self._task = asyncio.create_task(self._run(dsn))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, dsn: str) -> None:
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(INVALIDATION_CHANNEL, self._on_notify)
+                self.cache.clear()
+                self.subscribed.set()
+                await lost.wait()
+                logger.warning("Principal cache invalidation connection lost")
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning("Principal cache invalidation listener failed", error=str(exc))
+            finally:
+                self.subscribed.clear()
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(self.retry_seconds)
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.cache.invalidate(UUID(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed principal cache invalidation", payload=payload)
+
+
+_settings = Settings()
+principal_cache = PrincipalCache(_settings.principal_cache_size, _settings.principal_cache_ttl_seconds)
+invalidation_listener = InvalidationListener(principal_cache)
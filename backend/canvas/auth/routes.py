@@ -1,13 +1,12 @@
-import threading
 from uuid import UUID
-from typing import Dict
-from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from canvas.auth.service import AuthService
 from canvas.auth.user_service import UserService
 from canvas.auth.dependencies import get_current_user, require_role
+from canvas.auth.principal_cache import announce_invalidation, principal_cache
+from canvas.ratelimit import rate_limiter
 from canvas.auth.schemas import LoginRequest, TokenResponse, UserCreate, UserResponse, ResetPasswordRequest
 from canvas.models.user import User, UserRole
 from canvas.db import get_db_session
@@ -19,36 +18,9 @@ auth_service = AuthService()
 user_service = UserService()
 settings = Settings()
 
-# Simple in-memory rate limiting (for production, use Redis)
-# NOTE: This in-memory store is not persistent across server restarts.
-# For multi-instance deployments, use Redis-backed rate limiting.
-rate_limit_store: Dict[str, Dict[str, datetime]] = {}
-rate_limit_lock = threading.Lock()
-
-def check_rate_limit(key: str, limit: int = 5, window_minutes: int = 15) -> None:
-    """Check rate limit for given key"""
-    now = datetime.utcnow()
-    window_start = now - timedelta(minutes=window_minutes)
-    
-    with rate_limit_lock:
-        if key not in rate_limit_store:
-            rate_limit_store[key] = {}
-        
-        # Clean old entries
-        rate_limit_store[key] = {
-            k: v for k, v in rate_limit_store[key].items() 
-            if v > window_start
-        }
-        
-        # Check limit
-        if len(rate_limit_store[key]) >= limit:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded"
-            )
-        
-        # Add current request
-        rate_limit_store[key][str(now)] = now
+async def check_rate_limit(key: str, limit: int = 5, window_minutes: int = 15) -> None:
+    """Check rate limit for given key (shared across workers unless the memory backend is configured)"""
+    await rate_limiter.hit(key, limit, window_minutes * 60)
 
 @router.post("/register", response_model=dict, status_code=201)
 async def register_user(
@@ -89,7 +61,7 @@ async def login(
     """Authenticate user and return tokens."""
     # Rate limit by IP address
     client_ip = request.client.host if request.client else "unknown"
-    check_rate_limit(f"login:{client_ip}", limit=5, window_minutes=15)
+    await check_rate_limit(f"login:{client_ip}", limit=5, window_minutes=15)
     
     user = await auth_service.authenticate_user(
         email=credentials.email,
@@ -212,18 +184,36 @@ async def list_users(
     return list_response(user_responses, len(user_responses))
 
 @router.patch("/users/{user_id}", response_model=dict)
-async def update_user_role(
+async def update_user(
     user_id: str,
-    role_data: dict,
+    user_data: dict,
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(require_role(UserRole.ADMIN))
 ) -> dict:
-    """Update user role (admin only)."""
+    """Update a user's role and/or active flag (admin only).
+
+    A deactivated user is rejected on their next request, by every worker.
+    """
     try:
         user_uuid = UUID(user_id)
-        role = UserRole(role_data["role"])
-        
-        user = await user_service.update_user_role(user_uuid, role, db)
+        if "role" not in user_data and "is_active" not in user_data:
+            raise ValueError("Nothing to update")
+        role = UserRole(user_data["role"]) if "role" in user_data else None
+        is_active = user_data.get("is_active")
+        if "is_active" in user_data and not isinstance(is_active, bool):
+            raise ValueError("is_active must be a boolean")
+
+        # Prevent self-lockout
+        if is_active is False and user_uuid == current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Cannot deactivate own account"
+            )
+
+        if role is not None:
+            user = await user_service.update_user_role(user_uuid, role, db)
+        if is_active is not None:
+            user = await user_service.set_user_active(user_uuid, is_active, db)
         user_response = UserResponse(
             id=user.id,
             email=user.email,
@@ -240,7 +230,7 @@ async def update_user_role(
             )
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Invalid user ID or role"
+            detail="Invalid user ID, role or active flag"
         )
 
 @router.delete("/users/{user_id}", status_code=204)
@@ -280,12 +270,18 @@ async def reset_password(
     db: AsyncSession = Depends(get_db_session)
 ) -> dict:
     """Reset password for current user. If must_reset_password is true, current_password is optional."""
-    if not current_user.must_reset_password:
-        if not body.current_password or not auth_service._verify_password(body.current_password, current_user.password_hash):
+    # current_user may be a detached cache entry; write through a session-bound row
+    user = await auth_service.get_user_by_id(current_user.id, db)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if not user.must_reset_password:
+        if not body.current_password or not await auth_service.verify_password(body.current_password, user.password_hash):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect")
-    current_user.password_hash = auth_service._hash_password(body.new_password)
-    current_user.must_reset_password = False
+    user.password_hash = await auth_service.hash_password(body.new_password)
+    user.must_reset_password = False
+    await announce_invalidation(db, user.id)
     await db.commit()
+    principal_cache.invalidate(user.id)
     return success_response({"message": "Password updated"})
 
 
@@ -307,9 +303,11 @@ async def admin_reset_password(
     if user.role == UserRole.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot reset admin password")
     temp_password = secrets.token_urlsafe(9)  # ~12 chars
-    user.password_hash = auth_service._hash_password(temp_password)
+    user.password_hash = await auth_service.hash_password(temp_password)
     user.must_reset_password = True
     user.failed_login_attempts = 0
     user.locked_until = None
+    await announce_invalidation(db, uid)
     await db.commit()
+    principal_cache.invalidate(uid)
     return success_response({"temporary_password": temp_password})
@@ -7,12 +7,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from canvas.models.user import User, UserRole
 from canvas.config import Settings
+from canvas.auth.hashing import PasswordHasher, password_hasher
 
 class AuthService:
     """Authentication service handling user registration, login, and JWT tokens."""
     
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(self, settings: Optional[Settings] = None, hasher: Optional[PasswordHasher] = None):
         self.settings = settings or Settings()
+        self.hasher = hasher or password_hasher
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
         self.secret_key = self.settings.secret_key
         self.algorithm = "HS256"
@@ -21,7 +23,7 @@ class AuthService:
     
     async def register_user(self, email: str, password: str, name: str, role: str, db: AsyncSession) -> User:
         """Register a new user with hashed password."""
-        password_hash = self._hash_password(password)
+        password_hash = await self.hash_password(password)
         user = User(
             email=email.lower(),
             password_hash=password_hash,
@@ -39,7 +41,7 @@ class AuthService:
         result = await db.execute(stmt)
         user = result.scalar_one_or_none()
         
-        if not user or not self._verify_password(password, user.password_hash):
+        if not user or not await self.verify_password(password, user.password_hash):
             return None
         
         if self.is_account_locked(user):
@@ -76,6 +78,14 @@ class AuthService:
         except JWTError:
             return None
     
+    async def hash_password(self, password: str) -> str:
+        """Hash password on the bounded hashing pool, off the event loop."""
+        return await self.hasher.run(self._hash_password, password)
+    
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify password on the bounded hashing pool, off the event loop."""
+        return await self.hasher.run(self._verify_password, plain_password, hashed_password)
+    
     def _hash_password(self, password: str) -> str:
         """Hash password using bcrypt with cost factor 12."""
         return self.pwd_context.hash(password)
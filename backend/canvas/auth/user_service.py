@@ -3,6 +3,7 @@ from uuid import UUID
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from canvas.models.user import User, UserRole
+from canvas.auth.principal_cache import announce_invalidation, principal_cache
 
 class UserService:
     """User management service for admin operations."""
@@ -20,7 +21,23 @@ class UserService:
             raise ValueError(f"User {user_id} not found")
         
         user.role = role
+        await announce_invalidation(db, user_id)
         await db.commit()
+        principal_cache.invalidate(user_id)
+        await db.refresh(user)
+        return user
+    
+    async def set_user_active(self, user_id: UUID, is_active: bool, db: AsyncSession) -> User:
+        """Activate or deactivate a user. Raises ValueError if user not found."""
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if not user:
+            raise ValueError(f"User {user_id} not found")
+        
+        user.is_active = is_active
+        await announce_invalidation(db, user_id)
+        await db.commit()
+        principal_cache.invalidate(user_id)
         await db.refresh(user)
         return user
     
@@ -32,7 +49,9 @@ class UserService:
             raise ValueError(f"User {user_id} not found")
         
         await db.delete(user)
+        await announce_invalidation(db, user_id)
         await db.commit()
+        principal_cache.invalidate(user_id)
     
     async def get_user_by_email(self, email: str, db: AsyncSession) -> Optional[User]:
         """Find user by email address (case-insensitive)."""
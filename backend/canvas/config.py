@@ -8,9 +8,22 @@ class Settings(BaseSettings):
     database_url: str
     cors_origins: list[str]
     log_level: str = "INFO"
+    access_log_sample_rate: float = 0.05  # fraction of requests logged; errors and slow requests always are
+    slow_request_ms: float = 1000.0
+    log_queue_size: int = 10000  # records buffered for the log writer thread; beyond this they are dropped
     secret_key: str
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     upload_dir: str = "/uploads"
     max_upload_size_mb: int = 10
-    environment: str = "development"  # development, production
\ No newline at end of file
+    attachment_accel_redirect_prefix: str = ""  # internal nginx location mapped to upload_dir; empty streams from Python
+    environment: str = "development"  # development, production
+    principal_cache_size: int = 1024  # 0 disables the authenticated-user cache
+    principal_cache_ttl_seconds: float = 30.0  # bounds staleness only while a worker misses invalidation notifications
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 32  # pending bcrypt operations beyond this get 503
+    rate_limit_backend: str = "memory"  # memory (single worker), postgres, redis
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    pdf_render_workers: int = 2
+    pdf_render_max_queue: int = 8
+    pdf_render_timeout_seconds: float = 30.0
\ No newline at end of file
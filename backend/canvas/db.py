@@ -1,6 +1,7 @@
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from canvas.config import Settings
+from canvas.metrics import InstrumentedQueuePool, instrument_engine
 
 # Re-export for testing
 __all__ = ['get_db_session', 'create_async_engine']
@@ -10,10 +11,16 @@ engine = create_async_engine(
     settings.database_url,
     pool_size=20,
     max_overflow=30,
-    pool_pre_ping=True
+    pool_pre_ping=True,
+    poolclass=InstrumentedQueuePool
 )
+instrument_engine(engine)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Register flush hooks that keep portfolio_summaries in step with ORM writes
+import canvas.portfolio.summary  # noqa: E402,F401
+import canvas.ordering  # noqa: E402,F401
+
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session for dependency injection."""
@@ -0,0 +1,37 @@
+"""Strong ETag validators for conditional GETs.
+
+Routes compute a cheap version string (counts and latest timestamps of the rows
+that make up a payload), turn it into an ETag with make_etag, and answer
+If-None-Match hits with not_modified_response before loading the payload.
+"""
+import hashlib
+from fastapi import Request
+from fastapi.responses import Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a quoted strong ETag from version parts."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match header matches etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+def not_modified_response(etag: str) -> Response:
+    """Return an empty 304 carrying the current validator."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach the validator headers to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,143 @@
+"""Non-blocking structured logging.
+
+structlog runs only the cheap, call-time processors (level filter, logger name,
+level, timestamp, exception capture) on the caller's thread and hands the event
+dict to stdlib logging, whose root handler just puts the record on a bounded
+queue. A listener thread renders records to JSON and writes them to stderr, so
+a slow or blocked stream never stalls the event loop. When the queue is full
+records are dropped and counted instead of blocking; the count is logged once
+the listener catches up and exported on /metrics.
+"""
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+import structlog
+from canvas.config import Settings
+
+
+def _capture_exc_info(logger, method_name, event_dict):
+    # exc_info=True means "the exception being handled now"; resolve it before
+    # the record leaves this thread
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that enqueues records unformatted and drops them when the queue is full."""
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stdlib version formats here, on the caller's thread; the listener does it instead
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _Listener(QueueListener):
+    """Writes queued records and reports drops as they are noticed."""
+
+    def __init__(self, q: queue.Queue, source: DroppingQueueHandler, *handlers: logging.Handler):
+        super().__init__(q, *handlers)
+        self.source = source
+        self.reported = 0
+
+    def handle(self, record: logging.LogRecord) -> None:
+        dropped = self.source.dropped
+        if dropped > self.reported:
+            super().handle(logging.makeLogRecord({
+                "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"Dropped {dropped - self.reported} log records: log queue full",
+            }))
+            self.reported = dropped
+        super().handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        # Block rather than put_nowait: the queue may be full when stopping
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """Owns the log queue, its root handler and the listener thread."""
+
+    def __init__(self, max_queue: int = 10000):
+        self.max_queue = max_queue
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._handler = DroppingQueueHandler(self._queue)
+        self._output = logging.StreamHandler(sys.stderr)
+        self._listener = _Listener(self._queue, self._handler, self._output)
+        self._lock = threading.Lock()
+        self._running = False
+
+    def install(self, level: str = "INFO") -> None:
+        """Route structlog and stdlib logging through the queue and start the listener."""
+        shared = [
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ]
+        structlog.configure(
+            processors=[
+                structlog.stdlib.filter_by_level,
+                *shared,
+                structlog.processors.StackInfoRenderer(),
+                _capture_exc_info,
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            ],
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.stdlib.BoundLogger,
+            cache_logger_on_first_use=True,
+        )
+        self._output.setFormatter(structlog.stdlib.ProcessorFormatter(
+            foreign_pre_chain=shared,
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.stdlib.PositionalArgumentsFormatter(),
+                structlog.processors.format_exc_info,
+                structlog.processors.UnicodeDecoder(),
+                structlog.processors.JSONRenderer(),
+            ],
+        ))
+        root = logging.getLogger()
+        if self._handler not in root.handlers:
+            root.addHandler(self._handler)
+        root.setLevel(level.upper())
+        self.start()
+
+    def start(self) -> None:
+        with self._lock:
+            if not self._running:
+                self._listener.start()
+                self._running = True
+
+    def stop(self) -> None:
+        """Flush everything queued so far and stop the listener thread."""
+        with self._lock:
+            if self._running:
+                self._listener.stop()
+                self._running = False
+
+    def metrics(self) -> dict:
+        return {
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize(),
+            "dropped": self._handler.dropped,
+        }
+
+
+_settings = Settings()
+log_pipeline = LogPipeline(_settings.log_queue_size)
+atexit.register(log_pipeline.stop)
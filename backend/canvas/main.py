@@ -1,39 +1,23 @@
 import uuid
-import logging
-import traceback
 import structlog
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy import text
 from canvas.config import Settings
 from canvas import success_response
 from canvas.db import engine
+from canvas.auth.hashing import password_hasher
+from canvas.auth.principal_cache import invalidation_listener
+from canvas.pdf.renderer import pdf_renderer
+from canvas.ratelimit import rate_limiter
+from canvas.logs import log_pipeline
+from canvas.metrics import CONTENT_TYPE, render_metrics
+from canvas.middleware import RequestContextMiddleware
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
-
-logging.basicConfig(
-    format="%(message)s",
-    level=logging.INFO,
-)
+# Structured logging, rendered and written off the event loop
+log_pipeline.install(Settings().log_level)
 
 logger = structlog.get_logger(__name__)
 
@@ -42,11 +26,19 @@ logger = structlog.get_logger(__name__)
 async def lifespan(app: FastAPI):
     """Manage application lifespan - startup and shutdown."""
     # Startup
+    log_pipeline.start()
     logger.info("Application starting up")
+    await pdf_renderer.start()
+    invalidation_listener.start(engine.url)
     yield
     # Shutdown
     logger.info("Application shutting down")
+    password_hasher.shutdown()
+    pdf_renderer.shutdown()
+    await rate_limiter.close()
+    await invalidation_listener.stop()
     await engine.dispose()
+    log_pipeline.stop()
 
 
 def create_app() -> FastAPI:
@@ -68,14 +60,12 @@ def create_app() -> FastAPI:
         expose_headers=["*"],
     )
     
-    # Add request ID middleware
-    @app.middleware("http")
-    async def add_request_id(request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+    # Request id, Server-Timing, per-route histograms and sampled access log
+    app.add_middleware(
+        RequestContextMiddleware,
+        sample_rate=settings.access_log_sample_rate,
+        slow_request_ms=settings.slow_request_ms,
+    )
     
     # Exception handler for HTTPException
     @app.exception_handler(HTTPException)
@@ -96,7 +86,7 @@ def create_app() -> FastAPI:
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
-        logger.error(f"Unhandled exception: {traceback.format_exc()}")
+        logger.error("Unhandled exception", exc_info=exc)
         return JSONResponse(
             status_code=500,
             content={
@@ -118,6 +108,12 @@ def create_app() -> FastAPI:
         """
         return {"status": "ok"}
     
+    # Prometheus scrape endpoint; nginx only proxies /api/, so it stays internal
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        body = render_metrics(engine.pool, password_hasher.metrics(), log_pipeline.metrics())
+        return Response(body, media_type=CONTENT_TYPE)
+    
     # Register feature routers
     from canvas.auth.routes import router as auth_router
     from canvas.routes.vbu import router as vbu_router
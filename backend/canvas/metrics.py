@@ -0,0 +1,221 @@
+"""Per-request database instrumentation and Prometheus metrics.
+
+SQLAlchemy cursor events count the statements each request runs and the time
+they spend in the database, and the engine's pool class times how long a
+request waits to check out a connection. The request middleware reports those
+totals in a Server-Timing header and folds them, with the request latency,
+into per-route histograms that /metrics serves in the Prometheus text format.
+Only the few metric types needed are implemented here, so there is no client
+library to depend on.
+"""
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+_QUERY_START_KEY = "canvas.query_start"
+
+
+class RequestStats:
+    """Database work done on behalf of one request."""
+
+    __slots__ = ("queries", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Format the totals as a Server-Timing header value."""
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries", '
+            f"pool;dur={self.pool_wait_seconds * 1000:.2f}, "
+            f"total;dur={total_seconds * 1000:.2f}"
+        )
+
+
+# SQLAlchemy runs async statements in a greenlet sharing the caller's context,
+# so cursor events see the stats of the request that issued them
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("canvas_request_stats", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float], labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(self.labels, label_values, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-2]}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {series[-2]}")
+        return lines
+
+
+def _sample(name: str, kind: str, help: str, value: float) -> List[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {value}"]
+
+
+REQUEST_DURATION = Histogram(
+    "canvas_http_request_duration_seconds", "Request latency by route.",
+    LATENCY_BUCKETS, ("method", "route", "status"),
+)
+REQUEST_QUERIES = Histogram(
+    "canvas_http_request_db_queries", "SQL statements executed per request.",
+    QUERY_COUNT_BUCKETS, ("method", "route"),
+)
+REQUEST_DB_DURATION = Histogram(
+    "canvas_http_request_db_duration_seconds", "Time spent executing SQL per request.",
+    LATENCY_BUCKETS, ("method", "route"),
+)
+POOL_WAIT = Histogram(
+    "canvas_db_pool_checkout_seconds", "Time to check a connection out of the pool, including connecting.",
+    POOL_WAIT_BUCKETS,
+)
+
+_totals = {"queries": 0, "db_seconds": 0.0}
+
+
+def observe_request(method: str, route: str, status_code: int, elapsed: float, stats: RequestStats) -> None:
+    """Fold a finished request into the per-route histograms."""
+    REQUEST_DURATION.observe(elapsed, method, route, str(status_code))
+    REQUEST_QUERIES.observe(stats.queries, method, route)
+    REQUEST_DB_DURATION.observe(stats.db_seconds, method, route)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times each checkout, waiting included."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            POOL_WAIT.observe(waited)
+            stats = request_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += waited
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query(conn)
+
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None and exception_context.execution_context is not None:
+        _record_query(exception_context.connection)
+
+
+def _record_query(conn) -> None:
+    starts = conn.info.get(_QUERY_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    _totals["queries"] += 1
+    _totals["db_seconds"] += elapsed
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count and time every statement the engine executes."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def render_metrics(pool: Pool, hasher_metrics: Optional[dict] = None, log_metrics: Optional[dict] = None) -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for histogram in (REQUEST_DURATION, REQUEST_QUERIES, REQUEST_DB_DURATION, POOL_WAIT):
+        lines.extend(histogram.render())
+    lines.extend(_sample("canvas_db_queries_total", "counter", "SQL statements executed.", _totals["queries"]))
+    lines.extend(_sample(
+        "canvas_db_query_seconds_total", "counter", "Time spent executing SQL.", _totals["db_seconds"]
+    ))
+    if hasattr(pool, "checkedout"):
+        lines.extend(_sample(
+            "canvas_db_pool_connections_in_use", "gauge", "Connections checked out of the pool.", pool.checkedout()
+        ))
+        lines.extend(_sample("canvas_db_pool_size", "gauge", "Configured pool size.", pool.size()))
+        lines.extend(_sample(
+            "canvas_db_pool_overflow", "gauge", "Connections open beyond the pool size.", max(pool.overflow(), 0)
+        ))
+    if hasher_metrics is not None:
+        lines.extend(_sample(
+            "canvas_password_hasher_in_flight", "gauge", "Hashing operations queued or running.",
+            hasher_metrics["in_flight"],
+        ))
+        lines.extend(_sample(
+            "canvas_password_hasher_submitted_total", "counter", "Hashing operations accepted.",
+            hasher_metrics["submitted"],
+        ))
+        lines.extend(_sample(
+            "canvas_password_hasher_rejected_total", "counter", "Hashing operations rejected with 503.",
+            hasher_metrics["rejected"],
+        ))
+        lines.extend(_sample(
+            "canvas_password_hasher_queue_wait_seconds_total", "counter", "Time hashing operations spent queued.",
+            hasher_metrics["queue_wait_seconds_total"],
+        ))
+    if log_metrics is not None:
+        lines.extend(_sample(
+            "canvas_log_queue_records", "gauge", "Log records waiting for the writer thread.", log_metrics["queued"],
+        ))
+        lines.extend(_sample(
+            "canvas_log_records_dropped_total", "counter", "Log records dropped because the queue was full.",
+            log_metrics["dropped"],
+        ))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,82 @@
+"""Request context middleware: request id, timing headers, metrics and access log.
+
+A plain ASGI middleware rather than @app.middleware("http"), which wraps every
+request in Starlette's BaseHTTPMiddleware (an extra task plus a memory stream
+per response body). Headers are added to the http.response.start message as it
+passes, so streamed responses are never buffered.
+"""
+import random
+import time
+import uuid
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from canvas.metrics import RequestStats, observe_request, request_stats
+
+logger = structlog.get_logger("canvas.access")
+
+
+class RequestContextMiddleware:
+    """Tag, time and account for every HTTP request.
+
+    Each request gets an id (request.state.request_id and X-Request-ID), a
+    Server-Timing header with its database totals and perf_counter duration up
+    to the response headers, a sample in the per-route histograms, and an
+    access log line. Only a sample_rate fraction of requests is logged, except
+    that server errors and requests slower than slow_request_ms always are.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0, slow_request_ms: float = 1000.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        stats = RequestStats()
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["Server-Timing"] = stats.server_timing(time.perf_counter() - started)
+            await send(message)
+
+        token = request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            request_stats.reset(token)
+            elapsed = time.perf_counter() - started
+            route = getattr(scope.get("route"), "path", "unmatched")
+            observe_request(scope["method"], route, status_code, elapsed, stats)
+            self._log(scope, route, status_code, elapsed, stats, request_id)
+
+    def _log(self, scope: Scope, route: str, status_code: int, elapsed: float,
+             stats: RequestStats, request_id: str) -> None:
+        duration_ms = elapsed * 1000
+        slow = duration_ms >= self.slow_request_ms
+        if not (slow or status_code >= 500 or random.random() < self.sample_rate):
+            return
+        log = logger.warning if slow or status_code >= 500 else logger.info
+        log(
+            "request",
+            request_id=request_id,
+            method=scope["method"],
+            path=scope["path"],
+            route=route,
+            status=status_code,
+            duration_ms=round(duration_ms, 2),
+            queries=stats.queries,
+            db_ms=round(stats.db_seconds * 1000, 2),
+            slow=slow,
+        )
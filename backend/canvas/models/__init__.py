@@ -22,6 +22,9 @@ from canvas.models.proof_point import ProofPoint, ProofPointStatus
 from canvas.models.attachment import Attachment
 from canvas.models.monthly_review import MonthlyReview
 from canvas.models.commitment import Commitment
+from canvas.models.portfolio_summary import PortfolioSummary
+from canvas.models.portfolio_note import PortfolioNote
+from canvas.models.rate_limit_counter import RateLimitCounter
 
 __all__ = [
     "Base",
@@ -35,4 +38,7 @@ __all__ = [
     "Attachment",
     "MonthlyReview",
     "Commitment",
+    "PortfolioSummary",
+    "PortfolioNote",
+    "RateLimitCounter",
 ]
\ No newline at end of file
@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy import Column, String, Integer, ForeignKey, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped
@@ -9,9 +10,10 @@ class Attachment(Base, TimestampMixin):
     proof_point_id = Column(UUID(as_uuid=True), ForeignKey("proof_points.id", ondelete="CASCADE"), nullable=True, index=True)
     monthly_review_id = Column(UUID(as_uuid=True), ForeignKey("monthly_reviews.id", ondelete="CASCADE"), nullable=True, index=True)
     filename = Column(String(255), nullable=False)
-    storage_path = Column(String(1024), nullable=False, unique=True)
+    storage_path = Column(String(1024), nullable=False, index=True)
     content_type = Column(String(128), nullable=False)
     size_bytes = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=True)
     label = Column(String(255), nullable=True)
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
     
@@ -19,6 +21,11 @@ class Attachment(Base, TimestampMixin):
     proof_point = relationship("ProofPoint", back_populates="attachments")
     monthly_review = relationship("MonthlyReview", back_populates="attachments")
     
+    @property
+    def download_url(self) -> Optional[str]:
+        """Immutable, content-addressed download URL (None for pre-hash uploads)."""
+        return f"/api/attachments/{self.id}/blob/{self.sha256}" if self.sha256 else None
+    
     __table_args__ = (
         CheckConstraint("LENGTH(TRIM(filename)) > 0", name="ck_attachment_filename_not_empty"),
         CheckConstraint("LENGTH(TRIM(storage_path)) > 0", name="ck_attachment_storage_path_not_empty"),
@@ -35,8 +35,8 @@ class Canvas(Base, TimestampMixin):
     
     # Relationships
     vbu = relationship("VBU", back_populates="canvas")
-    theses = relationship("Thesis", back_populates="canvas", cascade="all, delete-orphan", order_by="Thesis.order")
-    monthly_reviews = relationship("MonthlyReview", back_populates="canvas", cascade="all, delete-orphan")
+    theses = relationship("Thesis", back_populates="canvas", cascade="all, delete-orphan", passive_deletes=True, order_by="Thesis.rank")
+    monthly_reviews = relationship("MonthlyReview", back_populates="canvas", cascade="all, delete-orphan", passive_deletes=True)
     
     __table_args__ = (
         CheckConstraint("product_name IS NULL OR LENGTH(TRIM(product_name)) > 0", name="ck_canvas_product_name_not_empty"),
@@ -18,8 +18,8 @@ class MonthlyReview(Base, TimestampMixin):
     
     # Relationships
     canvas = relationship("Canvas", back_populates="monthly_reviews")
-    commitments = relationship("Commitment", back_populates="monthly_review", cascade="all, delete-orphan")
-    attachments = relationship("Attachment", back_populates="monthly_review", cascade="all, delete-orphan")
+    commitments = relationship("Commitment", back_populates="monthly_review", cascade="all, delete-orphan", passive_deletes=True, order_by="Commitment.order")
+    attachments = relationship("Attachment", back_populates="monthly_review", cascade="all, delete-orphan", passive_deletes=True)
     created_by_user = relationship("User")
     
     # Constraints
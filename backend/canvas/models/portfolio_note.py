@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, func, select
+from sqlalchemy.dialects.postgresql import UUID
+from canvas.models import Base
+
+class PortfolioNote(Base):
+    """One version of the portfolio-wide admin notes; the highest version is current.
+
+    Edits append a row instead of rewriting every canvas, and readers pick up the
+    current text with latest_portfolio_notes().
+    """
+    __tablename__ = "portfolio_notes"
+    
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    notes = Column(Text, nullable=True)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+def latest_portfolio_notes(column=PortfolioNote.notes):
+    """Scalar subquery for a column of the current notes version (NULL when none exist)."""
+    return select(column).order_by(PortfolioNote.version.desc()).limit(1).scalar_subquery()
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Text, Date, DateTime, ForeignKey, Enum as SQLEnum, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from canvas.models import Base
+from canvas.models.canvas import LifecycleLane
+
+class PortfolioSummary(Base):
+    """Denormalized dashboard row per VBU, maintained by canvas.portfolio.summary."""
+    __tablename__ = "portfolio_summaries"
+    
+    vbu_id = Column(UUID(as_uuid=True), ForeignKey("vbus.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String(255), nullable=False)
+    gm_id = Column(UUID(as_uuid=True), nullable=False)
+    group_leader_id = Column(UUID(as_uuid=True), nullable=True)
+    gm_name = Column(String(255), nullable=False)
+    lifecycle_lane = Column(SQLEnum(LifecycleLane, values_callable=lambda e: [x.value for x in e]), nullable=False)
+    success_description = Column(Text, nullable=True)
+    primary_constraint = Column(Text, nullable=True)
+    health_indicator = Column(String(20), nullable=False)
+    currently_testing = Column(Text, nullable=True)
+    next_review_date = Column(Date, nullable=True)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_portfolio_summaries_name", "name"),
+        Index("ix_portfolio_summaries_gm_id", "gm_id"),
+        Index("ix_portfolio_summaries_group_leader_id", "group_leader_id"),
+    )
@@ -1,5 +1,5 @@
 from enum import Enum
-from sqlalchemy import Column, Text, Date, ForeignKey, CheckConstraint, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Date, ForeignKey, CheckConstraint, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped
 from canvas.models import TimestampMixin, Base
@@ -25,7 +25,12 @@ class ProofPoint(Base, TimestampMixin):
     status = Column(SQLEnum(ProofPointStatus, values_callable=lambda e: [x.value for x in e]), nullable=False, default=ProofPointStatus.NOT_STARTED, index=True)
     evidence_note = Column(Text, nullable=True)
     target_review_month = Column(Date, nullable=True)
+    rank = Column(String(255, collation="C"), nullable=False)
     
     # Relationships
     thesis = relationship("Thesis", back_populates="proof_points")
-    attachments = relationship("Attachment", back_populates="proof_point", cascade="all, delete-orphan")
\ No newline at end of file
+    attachments = relationship("Attachment", back_populates="proof_point", cascade="all, delete-orphan", passive_deletes=True)
+    
+    __table_args__ = (
+        UniqueConstraint("thesis_id", "rank", name="uq_proof_points_thesis_rank"),
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index
+from canvas.models import Base
+
+class RateLimitCounter(Base):
+    """Hit count for one rate-limit key in one fixed window, used by canvas.ratelimit.
+
+    The table is UNLOGGED: counters are disposable, so skipping the WAL keeps
+    the per-login upsert cheap, and a crash simply resets every limit.
+    """
+    __tablename__ = "rate_limit_counters"
+    
+    key = Column(String(255), primary_key=True)
+    window_start = Column(BigInteger, primary_key=True)
+    count = Column(Integer, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_rate_limit_counters_expires_at", "expires_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
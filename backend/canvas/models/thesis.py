@@ -1,23 +1,39 @@
-from sqlalchemy import Column, Text, Integer, ForeignKey, CheckConstraint, UniqueConstraint
+from sqlalchemy import Column, String, Text, ForeignKey, UniqueConstraint, select, func
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship, Mapped
+from sqlalchemy.orm import relationship, column_property, Mapped
 from canvas.models import TimestampMixin, Base
+from canvas.ranking import rank_for_position
 
 class Thesis(Base, TimestampMixin):
     __tablename__ = "theses"
     
     canvas_id = Column(UUID(as_uuid=True), ForeignKey("canvases.id", ondelete="CASCADE"), nullable=False, index=True)
-    order = Column(Integer, nullable=False)
+    rank = Column(String(255, collation="C"), nullable=False)
     text = Column(Text, nullable=False)
     description = Column(Text, nullable=True)
     category_id = Column(UUID(as_uuid=True), ForeignKey("thesis_categories.id", ondelete="SET NULL"), nullable=True, index=True)
     
     # Relationships
     canvas = relationship("Canvas", back_populates="theses")
-    proof_points = relationship("ProofPoint", back_populates="thesis", cascade="all, delete-orphan")
+    proof_points = relationship("ProofPoint", back_populates="thesis", cascade="all, delete-orphan", passive_deletes=True, order_by="ProofPoint.rank")
     category = relationship("ThesisCategory", lazy="joined")
     
     __table_args__ = (
-        CheckConstraint('"order" BETWEEN 1 AND 5', name="ck_thesis_order_range"),
-        UniqueConstraint("canvas_id", "order", name="uq_theses_canvas_order"),
+        UniqueConstraint("canvas_id", "rank", name="uq_theses_canvas_rank"),
     )
+    
+    def __init__(self, order: int | None = None, **kwargs):
+        # Accept a 1-based position for freshly numbered lists; rank is the stored key
+        if order is not None and "rank" not in kwargs:
+            kwargs["rank"] = rank_for_position(order)
+        super().__init__(**kwargs)
+
+
+# 1-based display position, derived from rank so moves never renumber siblings
+_sibling = Thesis.__table__.alias("sibling")
+Thesis.order = column_property(
+    select(func.count())
+    .where(_sibling.c.canvas_id == Thesis.canvas_id, _sibling.c.rank <= Thesis.rank)
+    .correlate_except(_sibling)
+    .scalar_subquery()
+)
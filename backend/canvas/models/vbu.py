@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped
 from canvas.models import TimestampMixin, Base
@@ -14,8 +14,9 @@ class VBU(Base, TimestampMixin):
     # Relationships
     gm = relationship("User", foreign_keys=[gm_id])
     group_leader = relationship("User", foreign_keys=[group_leader_id])
-    canvas = relationship("Canvas", back_populates="vbu", uselist=False, cascade="all, delete-orphan")
+    canvas = relationship("Canvas", back_populates="vbu", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
     
     __table_args__ = (
         CheckConstraint("LENGTH(TRIM(name)) > 0", name="ck_vbu_name_not_empty"),
+        Index("ix_vbus_name_id", "name", "id"),
     )
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""Append ranks for new ordered rows.
+
+Theses and proof points added through the ORM without an explicit rank go to
+the end of their parent's list. Ranks are assigned in before_flush, one MAX
+query per parent, so several rows added in one flush get consecutive keys.
+
+(parent, rank) is unique, so anything that reads sibling ranks to compute a
+new one first locks the parent row with lock_parent. Concurrent writers to
+the same list then queue up instead of picking the same key.
+
+When a new key would be longer than MAX_RANK_LENGTH, the writer rewrites the
+whole list with the renumber statements instead, in the same transaction.
+"""
+from typing import Dict
+from uuid import UUID
+from sqlalchemy import event, select, func, update, column, values
+from sqlalchemy.orm import Session
+from canvas.models.canvas import Canvas
+from canvas.models.thesis import Thesis
+from canvas.models.proof_point import ProofPoint
+from canvas.ranking import MAX_RANK_LENGTH, rank_between, rank_for_position
+
+_PARENT_KEY = {Thesis: "canvas_id", ProofPoint: "thesis_id"}
+_PARENT_MODEL = {Thesis: Canvas, ProofPoint: Thesis}
+
+
+def lock_parent(model, parent_id: UUID):
+    """SELECT ... FOR UPDATE on the row that owns model's ordered list"""
+    parent = _PARENT_MODEL[model]
+    return select(parent.id).where(parent.id == parent_id).with_for_update()
+
+
+def renumber(model, ranks: Dict[UUID, str]) -> list:
+    """Statements that give every row of one list its key from ranks ({id: key}).
+
+    The unique constraint is checked row by row, so the rows first move to
+    placeholder keys starting with '~', which rank_between never produces,
+    and only then to their final keys. ranks must cover the whole list.
+    Loaded objects are not synchronized; refresh or expire them afterwards.
+    """
+    placeholders = {row_id: f"~{i}" for i, row_id in enumerate(ranks)}
+    return [_set_ranks(model, placeholders), _set_ranks(model, ranks)]
+
+
+def _set_ranks(model, ranks: Dict[UUID, str]):
+    data = values(
+        column("id", model.id.type), column("rank", model.rank.type), name="ranks"
+    ).data(list(ranks.items()))
+    return (
+        update(model)
+        .where(model.id == data.c.id)
+        .values(rank=data.c.rank)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_append_ranks(session: Session, flush_context, instances) -> None:
+    groups: dict[tuple, list] = {}
+    for obj in session.new:
+        model = type(obj)
+        if model in _PARENT_KEY and obj.rank is None:
+            groups.setdefault((model, getattr(obj, _PARENT_KEY[model])), []).append(obj)
+    if not groups:
+        return
+    with session.no_autoflush:
+        for (model, parent_id), objs in groups.items():
+            parent_col = getattr(model, _PARENT_KEY[model])
+            session.execute(lock_parent(model, parent_id))
+            stored = session.execute(select(func.max(model.rank)).where(parent_col == parent_id)).scalar()
+            pending = [o for o in session.new if type(o) is model and o.rank is not None
+                       and getattr(o, _PARENT_KEY[model]) == parent_id]
+            rank = max([r for r in [stored, *(o.rank for o in pending)] if r is not None], default=None)
+            ranks = []
+            for _ in objs:
+                rank = rank_between(rank, None)
+                ranks.append(rank)
+            if len(rank) > MAX_RANK_LENGTH:
+                ranks = _renumber_for_append(session, model, parent_col, parent_id, pending, len(objs))
+            for obj, rank in zip(objs, ranks):
+                obj.rank = rank
+
+
+def _renumber_for_append(session: Session, model, parent_col, parent_id, pending: list, count: int) -> list:
+    """Renumber stored and pending rows in order; return keys for count rows after them"""
+    stored = session.execute(select(model.id, model.rank).where(parent_col == parent_id)).all()
+    listed = sorted([(row.rank, row.id) for row in stored] + [(o.rank, o) for o in pending], key=lambda item: item[0])
+    ranks: Dict[UUID, str] = {}
+    for position, (_, item) in enumerate(listed, 1):
+        if isinstance(item, model):
+            item.rank = rank_for_position(position)
+        else:
+            ranks[item] = rank_for_position(position)
+    if ranks:
+        for stmt in renumber(model, ranks):
+            session.execute(stmt)
+    return [rank_for_position(len(listed) + i) for i in range(1, count + 1)]
@@ -1,3 +1,7 @@
 from .service import PDFService, CanvasNotFoundError, PDFGenerationError
+from .renderer import PDFRenderer, PDFRenderBusyError, PDFRenderTimeoutError, pdf_renderer
 
-__all__ = ["PDFService", "CanvasNotFoundError", "PDFGenerationError"]
\ No newline at end of file
+__all__ = [
+    "PDFService", "CanvasNotFoundError", "PDFGenerationError",
+    "PDFRenderer", "PDFRenderBusyError", "PDFRenderTimeoutError", "pdf_renderer",
+]
\ No newline at end of file
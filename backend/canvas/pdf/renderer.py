@@ -0,0 +1,142 @@
+"""Out-of-process PDF rendering.
+
+WeasyPrint layout is CPU-bound and holds the GIL for seconds on a large
+canvas, so renders run in a small pool of worker processes. Each worker loads
+WeasyPrint, the compiled canvas.html template and its fonts once, in the pool
+initializer, and then only receives plain template context dicts.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+from jinja2 import Environment, FileSystemLoader, Template
+from canvas.config import Settings
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+_template: Optional[Template] = None
+_font_config = None
+
+
+class PDFRenderBusyError(Exception):
+    """Raised when the render queue is full"""
+    pass
+
+
+class PDFRenderTimeoutError(Exception):
+    """Raised when a render does not finish within the configured timeout"""
+    pass
+
+
+def _init_worker() -> None:
+    """Pool initializer: compile the template and warm WeasyPrint's font stack."""
+    global _template, _font_config
+    from weasyprint import HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    _template = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True).get_template("canvas.html")
+    _font_config = FontConfiguration()
+    HTML(string="<p>warm-up</p>").write_pdf(font_config=_font_config)
+
+
+def _ready() -> bool:
+    return _template is not None
+
+
+def _render(context: dict) -> bytes:
+    from weasyprint import HTML
+
+    return HTML(string=_template.render(**context)).write_pdf(font_config=_font_config)
+
+
+class PDFRenderer:
+    """Async front end to a warm process pool with a bounded queue.
+
+    At most ``workers + max_queue`` renders may be pending; further requests
+    fail fast with PDFRenderBusyError. A render that is still queued when its
+    caller times out or disconnects is cancelled. One that has already started
+    runs to completion and keeps its slot until it does. If a worker dies the
+    pool is broken for good, so it is dropped and rebuilt on the next render.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, timeout_seconds: float = 30.0):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """Spawn and warm every worker so the first export doesn't pay for it."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(executor, _ready) for _ in range(self.workers)])
+
+    async def render(self, context: dict) -> bytes:
+        """Render canvas.html with context to PDF bytes in a worker process.
+
+        Raises:
+            PDFRenderBusyError: If the queue is full
+            PDFRenderTimeoutError: If the render exceeds timeout_seconds
+        """
+        if self._pending >= self.workers + self.max_queue:
+            raise PDFRenderBusyError("PDF render queue is full")
+        executor = self._get_executor()
+        try:
+            future: Future = executor.submit(_render, context)
+        except BrokenProcessPool:
+            # A worker died since the last render; start over on a fresh pool
+            self._discard(executor)
+            executor = self._get_executor()
+            future = executor.submit(_render, context)
+        self._pending += 1
+        loop = asyncio.get_running_loop()
+
+        def on_done(_):
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:  # loop already closed at shutdown
+                pass
+
+        future.add_done_callback(on_done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            raise PDFRenderTimeoutError(f"PDF render exceeded {self.timeout_seconds}s")
+        except BrokenProcessPool:
+            # A worker crashed (OOM, segfault) mid-render: this render fails,
+            # the next one gets a new pool
+            self._discard(executor)
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._discard(self._executor)
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Shut an executor down and forget it, unless it was already replaced."""
+        executor.shutdown(wait=False, cancel_futures=True)
+        if self._executor is executor:
+            self._executor = None
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+
+_settings = Settings()
+pdf_renderer = PDFRenderer(
+    _settings.pdf_render_workers,
+    _settings.pdf_render_max_queue,
+    _settings.pdf_render_timeout_seconds,
+)
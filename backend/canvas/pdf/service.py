@@ -1,11 +1,11 @@
+from concurrent.futures.process import BrokenProcessPool
 from uuid import UUID
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 from canvas.models.canvas import Canvas
 from canvas.models.thesis import Thesis
+from canvas.pdf.renderer import PDFRenderer, pdf_renderer
 
 
 class CanvasNotFoundError(Exception):
@@ -19,11 +19,9 @@ class PDFGenerationError(Exception):
 
 
 class PDFService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, renderer: PDFRenderer = None):
         self.db = db
-        self.jinja_env = Environment(
-            loader=FileSystemLoader('canvas/pdf/templates')
-        )
+        self.renderer = renderer or pdf_renderer
 
     async def export_canvas(self, canvas_id: UUID) -> bytes:
         """Export canvas as PDF with proper styling.
@@ -37,28 +35,40 @@ class PDFService:
         Raises:
             CanvasNotFoundError: If canvas doesn't exist
             PDFGenerationError: If PDF creation fails
+            PDFRenderBusyError: If the render queue is full
+            PDFRenderTimeoutError: If rendering takes too long
         """
+        canvas = await self._get_canvas_with_relations(self.db, canvas_id)
         try:
-            canvas = await self._get_canvas_with_relations(self.db, canvas_id)
-
-            template = self.jinja_env.get_template("canvas.html")
-            html_content = template.render(
-                vbu_name=canvas.vbu.name,
-                lifecycle_lane=canvas.lifecycle_lane.value,
-                success_description=canvas.success_description or "",
-                future_state_intent=canvas.future_state_intent or "",
-                theses=canvas.theses,
-                primary_constraint=canvas.primary_constraint or ""
-            )
-
-            pdf_bytes = HTML(string=html_content).write_pdf()
-            return pdf_bytes
-
-        except CanvasNotFoundError:
-            raise
-        except (OSError, IOError) as e:
+            return await self.renderer.render(self._template_context(canvas))
+        except (OSError, IOError, BrokenProcessPool) as e:
             raise PDFGenerationError(f"Failed to generate PDF: {str(e)}")
 
+    def _template_context(self, canvas: Canvas) -> dict:
+        """Flatten the canvas into plain values that can be sent to a render worker."""
+        return {
+            "vbu_name": canvas.vbu.name,
+            "lifecycle_lane": canvas.lifecycle_lane.value,
+            "success_description": canvas.success_description or "",
+            "future_state_intent": canvas.future_state_intent or "",
+            "theses": [
+                {
+                    "order": thesis.order,
+                    "text": thesis.text,
+                    "proof_points": [
+                        {
+                            "status": pp.status.value,
+                            "description": pp.description,
+                            "evidence_note": pp.evidence_note,
+                        }
+                        for pp in thesis.proof_points
+                    ],
+                }
+                for thesis in canvas.theses
+            ],
+            "primary_constraint": canvas.primary_constraint or "",
+        }
+
     async def _get_canvas_with_relations(self, db: AsyncSession, canvas_id: UUID) -> Canvas:
         """Get canvas with VBU and theses relations."""
         stmt = select(Canvas).options(
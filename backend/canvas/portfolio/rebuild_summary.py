@@ -0,0 +1,24 @@
+"""
+Rebuild the portfolio_summaries table from scratch.
+
+Usage: python -m canvas.portfolio.rebuild_summary
+"""
+import asyncio
+import json
+import sys
+from canvas.db import AsyncSessionLocal
+from canvas.portfolio.summary import refresh_all_summaries
+
+async def main():
+    """Recompute every summary row in one transaction."""
+    try:
+        async with AsyncSessionLocal() as db:
+            rows = await refresh_all_summaries(db)
+            await db.commit()
+        print(json.dumps({"status": "success", "rows": rows}))
+    except Exception as e:
+        print(json.dumps({"status": "error", "message": str(e)}))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
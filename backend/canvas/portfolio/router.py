@@ -1,19 +1,56 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
 from uuid import UUID
-from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from canvas.auth.dependencies import get_current_user, require_role, verify_csrf
 from canvas.models.user import User
 from canvas.db import get_db_session
-from canvas import success_response, list_response
-from .schemas import PortfolioFilters, PortfolioNotesRequest, LifecycleLane
+from canvas import success_response, list_response, json_response
+from canvas.etag import make_etag, etag_matches, not_modified_response, set_etag
+from .schemas import PortfolioFilters, PortfolioNotesRequest, LifecycleLane, ThesisHealthFilters
 from .service import PortfolioService
 
 router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def _parse_summary_filters(lane: Optional[str], gm_id: Optional[str], health_status: Optional[str]) -> PortfolioFilters:
+    """Parse and validate the comma-separated summary filters"""
+    filters = PortfolioFilters()
+    
+    if lane:
+        try:
+            filters.lane = [LifecycleLane(l.strip()) for l in lane.split(",")]
+        except ValueError as e:
+            raise HTTPException(
+                status_code=422, 
+                detail=f"Invalid lifecycle lane. Valid values: {[e.value for e in LifecycleLane]}"
+            )
+    
+    if gm_id:
+        try:
+            filters.gm_id = [UUID(id.strip()) for id in gm_id.split(",")]
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid GM ID format")
+    
+    if health_status:
+        valid_statuses = ["Not Started", "In Progress", "On Track", "At Risk"]
+        statuses = [s.strip() for s in health_status.split(",")]
+        for status in statuses:
+            if status not in valid_statuses:
+                raise HTTPException(
+                    status_code=422, 
+                    detail=f"Invalid health status: {status}. Valid values: {valid_statuses}"
+                )
+        filters.health_status = statuses
+    
+    return filters
+
 @router.get("/summary")
 async def get_portfolio_summary(
+    request: Request,
+    response: Response,
     lane: Optional[str] = Query(None, description="Comma-separated lifecycle lanes"),
     gm_id: Optional[str] = Query(None, description="Comma-separated GM UUIDs"),
     health_status: Optional[str] = Query(None, description="Comma-separated health statuses"),
@@ -22,49 +59,52 @@ async def get_portfolio_summary(
 ) -> dict:
     """Get portfolio summary with filtering"""
     try:
-        # Parse and validate filters
-        filters = PortfolioFilters()
-        
-        if lane:
-            try:
-                filters.lane = [LifecycleLane(l.strip()) for l in lane.split(",")]
-            except ValueError as e:
-                raise HTTPException(
-                    status_code=422, 
-                    detail=f"Invalid lifecycle lane. Valid values: {[e.value for e in LifecycleLane]}"
-                )
-        
-        if gm_id:
-            try:
-                filters.gm_id = [UUID(id.strip()) for id in gm_id.split(",")]
-            except ValueError:
-                raise HTTPException(status_code=422, detail="Invalid GM ID format")
+        filters = _parse_summary_filters(lane, gm_id, health_status)
         
-        if health_status:
-            valid_statuses = ["Not Started", "In Progress", "On Track", "At Risk"]
-            statuses = [s.strip() for s in health_status.split(",")]
-            for status in statuses:
-                if status not in valid_statuses:
-                    raise HTTPException(
-                        status_code=422, 
-                        detail=f"Invalid health status: {status}. Valid values: {valid_statuses}"
-                    )
-            filters.health_status = statuses
+        # Answer unchanged summaries from a cheap version probe
+        portfolio_service = PortfolioService(db)
+        etag = make_etag(await portfolio_service.get_summary_version(current_user, filters), current_user.id)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        set_etag(response, etag)
         
         # Get portfolio summary
-        portfolio_service = PortfolioService(db)
         summary = await portfolio_service.get_summary(current_user, filters)
         
-        return list_response(
-            data=[s.model_dump() for s in summary], 
+        return json_response(list_response(
+            data=summary,
             total=len(summary),
             page=1,
             per_page=25
-        )
+        ), response=response)
         
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
+@router.get("/export")
+async def export_portfolio(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+    lane: Optional[str] = Query(None, description="Comma-separated lifecycle lanes"),
+    gm_id: Optional[str] = Query(None, description="Comma-separated GM UUIDs"),
+    health_status: Optional[str] = Query(None, description="Comma-separated health statuses"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session)
+) -> StreamingResponse:
+    """Stream every visible portfolio summary row as NDJSON or CSV.
+
+    Rows come off a server-side cursor in fixed-size batches, so memory use
+    doesn't grow with the portfolio. The session dependency is only closed
+    after the response has been sent, which keeps the cursor open while the
+    body streams.
+    """
+    filters = _parse_summary_filters(lane, gm_id, health_status)
+    portfolio_service = PortfolioService(db)
+    return StreamingResponse(
+        portfolio_service.export_summary(current_user, filters, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="portfolio.{format}"'}
+    )
+
 @router.patch("/notes")
 async def update_portfolio_notes(
     request: PortfolioNotesRequest,
@@ -74,19 +114,56 @@ async def update_portfolio_notes(
 ) -> dict:
     """Update portfolio notes (admin only)"""
     portfolio_service = PortfolioService(db)
-    await portfolio_service.update_portfolio_notes(request.notes, current_user)
+    version, updated_at = await portfolio_service.update_portfolio_notes(request.notes, current_user)
     
     return success_response({
         "notes": request.notes,
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "version": version,
+        "updated_at": updated_at.isoformat()
     })
 
 @router.get("/thesis-health")
 async def get_thesis_health(
+    request: Request,
+    response: Response,
+    vbu_id: Optional[str] = Query(None, description="Comma-separated VBU UUIDs"),
+    category_id: Optional[str] = Query(None, description="Comma-separated thesis category UUIDs"),
+    signal: Optional[str] = Query(None, description="Comma-separated signals"),
+    include_proof_points: bool = Query(False, description="Include each thesis's proof points"),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(100, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ) -> dict:
     """Get thesis-level observation health across all visible VBUs"""
+    filters = ThesisHealthFilters()
+    try:
+        if vbu_id:
+            filters.vbu_id = [UUID(id.strip()) for id in vbu_id.split(",")]
+        if category_id:
+            filters.category_id = [UUID(id.strip()) for id in category_id.split(",")]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid UUID format")
+    if signal:
+        valid_signals = ["strengthening", "weakening", "neutral"]
+        signals = [s.strip() for s in signal.split(",")]
+        for value in signals:
+            if value not in valid_signals:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Invalid signal: {value}. Valid values: {valid_signals}"
+                )
+        filters.signal = signals
+    
     portfolio_service = PortfolioService(db)
-    data = await portfolio_service.get_thesis_health(current_user)
-    return list_response(data=data, total=len(data), page=1, per_page=len(data))
\ No newline at end of file
+    etag = make_etag(
+        await portfolio_service.get_thesis_health_version(current_user),
+        current_user.id, request.url.query
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    data, total = await portfolio_service.get_thesis_health(
+        current_user, filters, page, per_page, include_proof_points
+    )
+    return json_response(list_response(data=data, total=total, page=page, per_page=per_page), response=response)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Literal, Optional, List
 from uuid import UUID
 from datetime import date
 from canvas.models.canvas import LifecycleLane
@@ -21,5 +21,10 @@ class PortfolioFilters(BaseModel):
     gm_id: Optional[List[UUID]] = None
     health_status: Optional[List[str]] = None
 
+class ThesisHealthFilters(BaseModel):
+    vbu_id: Optional[List[UUID]] = None
+    category_id: Optional[List[UUID]] = None
+    signal: Optional[List[Literal["strengthening", "weakening", "neutral"]]] = None
+
 class PortfolioNotesRequest(BaseModel):
     notes: Optional[str] = Field(None, max_length=10000)
\ No newline at end of file
@@ -1,18 +1,45 @@
-from typing import List
+from typing import AsyncIterator, List
+from datetime import date
+from enum import Enum
+from uuid import UUID
+import csv
 import html
-from datetime import timedelta
+import io
+import json
 from fastapi import HTTPException
-from sqlalchemy import select, update, func, case, and_, or_
+from sqlalchemy import select, insert, func, and_, case
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, joinedload
 from canvas.models.user import User
 from canvas.models.vbu import VBU
 from canvas.models.canvas import Canvas
 from canvas.models.thesis import Thesis
-from canvas.models.proof_point import ProofPoint
-from canvas.models.monthly_review import MonthlyReview
+from canvas.models.proof_point import ProofPoint, ProofPointStatus
+from canvas.models.thesis_category import ThesisCategory
+from canvas.models.portfolio_summary import PortfolioSummary
+from canvas.models.portfolio_note import PortfolioNote, latest_portfolio_notes
 from canvas.db import get_db_session
-from .schemas import VBUSummary, PortfolioFilters
+from .schemas import VBUSummary, PortfolioFilters, ThesisHealthFilters
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_FIELDS = (
+    "vbu_id", "name", "gm_name", "lifecycle_lane", "health_indicator", "success_description",
+    "currently_testing", "next_review_date", "primary_constraint", "portfolio_notes",
+)
+
+
+def _export_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (UUID, date)):
+        return str(value)
+    return value
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
 
 class PortfolioService:
     def __init__(self, db: AsyncSession = None):
@@ -25,85 +52,71 @@ class PortfolioService:
                 return await self._get_summary_impl(db, user, filters)
         return await self._get_summary_impl(self.db, user, filters)
     
-    async def _get_summary_impl(self, db: AsyncSession, user: User, filters: PortfolioFilters) -> List[VBUSummary]:
-        # Build query using SQLAlchemy ORM
-        # Create lateral subqueries for better performance
-        currently_testing_subq = (
-            select(
-                case(
-                    (Canvas.currently_testing_type == 'thesis', Thesis.text),
-                    (Canvas.currently_testing_type == 'proof_point', ProofPoint.description),
-                    else_=None
-                ).label('currently_testing_text'),
-                Canvas.id.label('canvas_id')
-            )
-            .select_from(Canvas)
-            .outerjoin(Thesis, and_(Canvas.currently_testing_type == 'thesis', Canvas.currently_testing_id == Thesis.id))
-            .outerjoin(ProofPoint, and_(Canvas.currently_testing_type == 'proof_point', Canvas.currently_testing_id == ProofPoint.id))
-        ).lateral('ct')
-        
-        next_review_subq = (
-            select(
-                func.min(MonthlyReview.review_date + timedelta(days=30)).label('next_review_date'),
-                MonthlyReview.canvas_id
-            )
-            .group_by(MonthlyReview.canvas_id)
-        ).lateral('nr')
-        
-        query = (
-            select(
-                VBU.id,
-                VBU.name,
-                User.name.label('gm_name'),
-                Canvas.lifecycle_lane,
-                Canvas.success_description,
-                Canvas.primary_constraint,
-                Canvas.portfolio_notes,
-                func.coalesce(Canvas.health_indicator_cache, 'Not Started').label('health_indicator'),
-                currently_testing_subq.c.currently_testing_text.label('currently_testing'),
-                next_review_subq.c.next_review_date
-            )
-            .select_from(VBU)
-            .join(User, VBU.gm_id == User.id)
-            .join(Canvas, Canvas.vbu_id == VBU.id)
-            .outerjoin(currently_testing_subq, Canvas.id == currently_testing_subq.c.canvas_id)
-            .outerjoin(next_review_subq, Canvas.id == next_review_subq.c.canvas_id)
-        )
-        
+    def _summary_conditions(self, user: User, filters: PortfolioFilters) -> list:
         # Apply filters using parameterized conditions
         conditions = []
         
         # Role-based filtering
         if user.role == "gm":
-            conditions.append(VBU.gm_id == user.id)
+            conditions.append(PortfolioSummary.gm_id == user.id)
         elif user.role == "group_leader":
-            conditions.append(VBU.group_leader_id == user.id)
+            conditions.append(PortfolioSummary.group_leader_id == user.id)
         elif user.role == "viewer" and user.vbu_id:
-            conditions.append(VBU.id == user.vbu_id)
+            conditions.append(PortfolioSummary.vbu_id == user.vbu_id)
         
         # Lane filtering
         if filters.lane:
-            conditions.append(Canvas.lifecycle_lane.in_([lane.value for lane in filters.lane]))
+            conditions.append(PortfolioSummary.lifecycle_lane.in_([lane.value for lane in filters.lane]))
         
         # GM filtering
         if filters.gm_id:
-            conditions.append(VBU.gm_id.in_(filters.gm_id))
+            conditions.append(PortfolioSummary.gm_id.in_(filters.gm_id))
         
         # Health status filtering
         if filters.health_status:
-            conditions.append(
-                func.coalesce(Canvas.health_indicator_cache, 'Not Started').in_(filters.health_status)
-            )
+            conditions.append(PortfolioSummary.health_indicator.in_(filters.health_status))
         
+        return conditions
+    
+    def _visible_vbu_conditions(self, user: User) -> list:
+        if user.role == "gm":
+            return [VBU.gm_id == user.id]
+        if user.role == "group_leader":
+            return [VBU.group_leader_id == user.id]
+        if user.role == "viewer" and user.vbu_id:
+            return [VBU.id == user.vbu_id]
+        return []
+    
+    async def get_summary_version(self, user: User, filters: PortfolioFilters) -> str:
+        """Get a version string for the filtered summary without loading its rows"""
+        if not self.db:
+            async with get_db_session() as db:
+                return await self._get_summary_version_impl(db, user, filters)
+        return await self._get_summary_version_impl(self.db, user, filters)
+    
+    async def _get_summary_version_impl(self, db: AsyncSession, user: User, filters: PortfolioFilters) -> str:
+        result = await db.execute(
+            select(
+                func.count(PortfolioSummary.vbu_id),
+                func.max(PortfolioSummary.refreshed_at),
+                latest_portfolio_notes(PortfolioNote.version),
+            )
+            .where(*self._summary_conditions(user, filters))
+        )
+        count, latest, notes_version = result.one()
+        return f"{count}:{latest}:{notes_version}"
+    
+    async def _get_summary_impl(self, db: AsyncSession, user: User, filters: PortfolioFilters) -> List[VBUSummary]:
+        # Read the maintained summary table (see canvas.portfolio.summary);
+        # the portfolio-wide notes are one uncorrelated subquery, evaluated once
+        query = select(PortfolioSummary, latest_portfolio_notes())
+        conditions = self._summary_conditions(user, filters)
         if conditions:
             query = query.where(and_(*conditions))
         
-        # Add pagination limit
-        query = query.order_by(VBU.name).limit(1000)
-        
-        result = await db.execute(query)
+        result = await db.execute(query.order_by(PortfolioSummary.name))
         return [VBUSummary(
-            id=row.id,
+            id=row.vbu_id,
             name=row.name,
             gm_name=row.gm_name,
             lifecycle_lane=row.lifecycle_lane,
@@ -112,11 +125,34 @@ class PortfolioService:
             next_review_date=row.next_review_date,
             primary_constraint=row.primary_constraint,
             health_indicator=row.health_indicator,
-            portfolio_notes=row.portfolio_notes
-        ) for row in result]
+            portfolio_notes=notes
+        ) for row, notes in result]
     
-    async def update_portfolio_notes(self, notes: str, user: User) -> None:
-        """Update portfolio notes (admin only)"""
+    async def export_summary(self, user: User, filters: PortfolioFilters, format: str) -> AsyncIterator[str]:
+        """Yield the filtered summary as NDJSON lines or CSV, one chunk per cursor batch"""
+        query = (
+            select(*[
+                latest_portfolio_notes().label(field) if field == "portfolio_notes"
+                else PortfolioSummary.__table__.c[field]
+                for field in EXPORT_FIELDS
+            ])
+            .where(*self._summary_conditions(user, filters))
+            .order_by(PortfolioSummary.name, PortfolioSummary.vbu_id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        # AsyncSession.stream runs the query on an asyncpg server-side cursor
+        result = await self.db.stream(query)
+        if format == "csv":
+            yield _csv_chunk([EXPORT_FIELDS])
+        async for rows in result.partitions():
+            values = [[_export_value(value) for value in row] for row in rows]
+            if format == "csv":
+                yield _csv_chunk(values)
+            else:
+                yield "".join(json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in values)
+    
+    async def update_portfolio_notes(self, notes: str, user: User):
+        """Update portfolio notes (admin only); returns the new (version, created_at)"""
         if user.role != "admin":
             raise HTTPException(status_code=403, detail="Admin role required")
         
@@ -125,84 +161,175 @@ class PortfolioService:
         
         if not self.db:
             async with get_db_session() as db:
-                await self._update_notes_impl(db, sanitized_notes, user)
-        else:
-            await self._update_notes_impl(self.db, sanitized_notes, user)
+                return await self._update_notes_impl(db, sanitized_notes, user)
+        return await self._update_notes_impl(self.db, sanitized_notes, user)
     
-    async def _update_notes_impl(self, db: AsyncSession, sanitized_notes: str, user: User) -> None:
-        # Update all canvases with new portfolio notes
-        await db.execute(
-            update(Canvas).values(
-                portfolio_notes=sanitized_notes,
-                updated_at=func.now(),
-                updated_by=user.id
-            )
+    async def _update_notes_impl(self, db: AsyncSession, sanitized_notes: str, user: User):
+        # Append a new version: one row, no canvas or summary rewrites
+        result = await db.execute(
+            insert(PortfolioNote)
+            .values(notes=sanitized_notes, created_by=user.id)
+            .returning(PortfolioNote.version, PortfolioNote.created_at)
         )
+        version = result.one()
         await db.commit()
+        return version
 
-    async def get_thesis_health(self, user: User) -> list[dict]:
-        """Get thesis-level health across all VBUs the user can see.
+    async def get_thesis_health(
+        self, user: User, filters: ThesisHealthFilters, page: int = 1, per_page: int = 100,
+        include_proof_points: bool = False
+    ) -> tuple[list[dict], int]:
+        """Get one page of thesis-level health across all VBUs the user can see.
+        
+        For each thesis, compares observed against not_observed proof points.
+        A thesis is 'strengthening' if more than half of its scored points are
+        observed, 'weakening' if fewer than half, 'neutral' if exactly half or
+        none are scored. Counts per status and the signal are computed in
+        Postgres; proof point detail is only loaded when include_proof_points
+        is set.
         
-        For each thesis, computes an observation ratio from scored proof points
-        (observed=1, not_observed=0). A thesis is 'strengthening' if ratio > 0.5,
-        'weakening' if ratio < 0.5, 'neutral' if exactly 0.5 or no scored points.
+        Returns (items, total matching theses).
         """
         if not self.db:
             async with get_db_session() as db:
-                return await self._get_thesis_health_impl(db, user)
-        return await self._get_thesis_health_impl(self.db, user)
+                return await self._get_thesis_health_impl(db, user, filters, page, per_page, include_proof_points)
+        return await self._get_thesis_health_impl(self.db, user, filters, page, per_page, include_proof_points)
 
-    async def _get_thesis_health_impl(self, db: AsyncSession, user: User) -> list[dict]:
-        query = (
-            select(VBU, Canvas, Thesis)
+    async def get_thesis_health_version(self, user: User) -> str:
+        """Get a version string for the thesis-health payload without loading it"""
+        if not self.db:
+            async with get_db_session() as db:
+                return await self._get_thesis_health_version_impl(db, user)
+        return await self._get_thesis_health_version_impl(self.db, user)
+
+    async def _get_thesis_health_version_impl(self, db: AsyncSession, user: User) -> str:
+        result = await db.execute(
+            select(
+                func.count(func.distinct(Thesis.id)),
+                func.count(ProofPoint.id),
+                func.max(VBU.updated_at),
+                func.max(Thesis.updated_at),
+                func.max(ProofPoint.updated_at),
+                func.max(ThesisCategory.updated_at),
+            )
+            .select_from(VBU)
             .join(Canvas, Canvas.vbu_id == VBU.id)
             .join(Thesis, Thesis.canvas_id == Canvas.id)
-            .options(selectinload(Thesis.proof_points), selectinload(Thesis.category))
-            .order_by(VBU.name, Thesis.order)
+            .outerjoin(ProofPoint, ProofPoint.thesis_id == Thesis.id)
+            .outerjoin(ThesisCategory, ThesisCategory.id == Thesis.category_id)
+            .where(*self._visible_vbu_conditions(user))
         )
+        return ":".join(str(part) for part in result.one())
 
-        if user.role == "gm":
-            query = query.where(VBU.gm_id == user.id)
-        elif user.role == "group_leader":
-            query = query.where(VBU.group_leader_id == user.id)
-        elif user.role == "viewer" and user.vbu_id:
-            query = query.where(VBU.id == user.vbu_id)
+    def _thesis_health_query(self, user: User, filters: ThesisHealthFilters):
+        # Number theses within their canvas before the category filter drops any
+        theses = (
+            select(
+                Thesis.id,
+                Thesis.text,
+                Thesis.rank,
+                Thesis.category_id,
+                VBU.id.label("vbu_id"),
+                VBU.name.label("vbu_name"),
+                func.row_number().over(partition_by=Thesis.canvas_id, order_by=Thesis.rank).label("position"),
+            )
+            .join(Canvas, Thesis.canvas_id == Canvas.id)
+            .join(VBU, Canvas.vbu_id == VBU.id)
+            .where(*self._visible_vbu_conditions(user))
+        )
+        if filters.vbu_id:
+            theses = theses.where(VBU.id.in_(filters.vbu_id))
+        theses = theses.subquery("t")
+
+        by_status = {
+            pp_status: func.count(ProofPoint.id).filter(ProofPoint.status == pp_status)
+            for pp_status in ProofPointStatus
+        }
+        observed = by_status[ProofPointStatus.OBSERVED]
+        not_observed = by_status[ProofPointStatus.NOT_OBSERVED]
+        signal = case(
+            (observed * 2 > observed + not_observed, "strengthening"),
+            (observed * 2 < observed + not_observed, "weakening"),
+            else_="neutral",
+        )
+        health = (
+            select(
+                theses.c.vbu_id,
+                theses.c.vbu_name,
+                theses.c.id.label("thesis_id"),
+                theses.c.position.label("thesis_order"),
+                theses.c.text.label("thesis_text"),
+                theses.c.rank,
+                ThesisCategory.name.label("category_name"),
+                ThesisCategory.color.label("category_color"),
+                observed.label("observed"),
+                not_observed.label("not_observed"),
+                func.count(ProofPoint.id).label("total_proof_points"),
+                signal.label("signal"),
+                *[count.label(f"status_{pp_status.value}") for pp_status, count in by_status.items()],
+            )
+            .select_from(theses)
+            .outerjoin(ThesisCategory, ThesisCategory.id == theses.c.category_id)
+            .outerjoin(ProofPoint, ProofPoint.thesis_id == theses.c.id)
+            .group_by(
+                theses.c.id, theses.c.vbu_id, theses.c.vbu_name, theses.c.position,
+                theses.c.text, theses.c.rank, ThesisCategory.id,
+            )
+        )
+        if filters.category_id:
+            health = health.where(theses.c.category_id.in_(filters.category_id))
+        health = health.subquery("h")
 
-        result = await db.execute(query)
-        rows = result.unique().all()
+        query = select(health, func.count().over().label("total_count"))
+        if filters.signal:
+            query = query.where(health.c.signal.in_(filters.signal))
+        return query.order_by(health.c.vbu_name, health.c.vbu_id, health.c.rank)
 
-        out = []
-        for vbu, canvas, thesis in rows:
-            scores = [pp.status.score for pp in thesis.proof_points if pp.status.score is not None]
-            total = len(scores)
-            observed = sum(scores) if scores else 0
-            ratio = observed / total if total else None
-
-            if ratio is None:
-                signal = "neutral"
-            elif ratio > 0.5:
-                signal = "strengthening"
-            elif ratio < 0.5:
-                signal = "weakening"
-            else:
-                signal = "neutral"
-
-            out.append({
-                "vbu_id": str(vbu.id),
-                "vbu_name": vbu.name,
-                "thesis_id": str(thesis.id),
-                "thesis_order": thesis.order,
-                "thesis_text": thesis.text,
-                "category_name": thesis.category.name if thesis.category else None,
-                "category_color": thesis.category.color if thesis.category else None,
-                "observed": observed,
-                "not_observed": total - observed,
-                "total_scored": total,
-                "total_proof_points": len(thesis.proof_points),
-                "signal": signal,
-                "proof_points": [
+    async def _get_thesis_health_impl(
+        self, db: AsyncSession, user: User, filters: ThesisHealthFilters, page: int, per_page: int,
+        include_proof_points: bool
+    ) -> tuple[list[dict], int]:
+        query = self._thesis_health_query(user, filters)
+        rows = (await db.execute(query.offset((page - 1) * per_page).limit(per_page))).all()
+        if rows:
+            total = rows[0].total_count
+        elif page > 1:
+            total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        else:
+            total = 0
+
+        proof_points = {}
+        if include_proof_points and rows:
+            result = await db.execute(
+                select(ProofPoint.id, ProofPoint.thesis_id, ProofPoint.status, ProofPoint.description)
+                .where(ProofPoint.thesis_id.in_([row.thesis_id for row in rows]))
+                .order_by(ProofPoint.thesis_id, ProofPoint.rank)
+            )
+            for pp in result:
+                proof_points.setdefault(pp.thesis_id, []).append(
                     {"id": str(pp.id), "status": pp.status.value, "description": pp.description}
-                    for pp in thesis.proof_points
-                ],
-            })
-        return out
\ No newline at end of file
+                )
+
+        out = []
+        for row in rows:
+            item = {
+                "vbu_id": str(row.vbu_id),
+                "vbu_name": row.vbu_name,
+                "thesis_id": str(row.thesis_id),
+                "thesis_order": row.thesis_order,
+                "thesis_text": row.thesis_text,
+                "category_name": row.category_name,
+                "category_color": row.category_color,
+                "observed": row.observed,
+                "not_observed": row.not_observed,
+                "total_scored": row.observed + row.not_observed,
+                "total_proof_points": row.total_proof_points,
+                "status_counts": {
+                    pp_status.value: row._mapping[f"status_{pp_status.value}"] for pp_status in ProofPointStatus
+                },
+                "signal": row.signal,
+            }
+            if include_proof_points:
+                item["proof_points"] = proof_points.get(row.thesis_id, [])
+            out.append(item)
+        return out, total
@@ -0,0 +1,120 @@
+"""Maintenance of the portfolio_summaries table.
+
+Every ORM flush that touches a VBU, canvas, thesis, proof point, monthly review
+or a GM's name re-derives the affected summary rows inside the same
+transaction. Bulk statements that bypass the flush (and the rebuild command)
+call refresh_all_summaries directly.
+"""
+from sqlalchemy import event, text, bindparam, inspect
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from canvas.models.user import User
+from canvas.models.vbu import VBU
+from canvas.models.canvas import Canvas
+from canvas.models.thesis import Thesis
+from canvas.models.proof_point import ProofPoint
+from canvas.models.monthly_review import MonthlyReview
+
+_UPSERT_SQL = """
+    INSERT INTO portfolio_summaries (
+        vbu_id, name, gm_id, group_leader_id, gm_name, lifecycle_lane,
+        success_description, primary_constraint,
+        health_indicator, currently_testing, next_review_date, refreshed_at
+    )
+    SELECT
+        v.id, v.name, v.gm_id, v.group_leader_id, u.name, c.lifecycle_lane,
+        c.success_description, c.primary_constraint,
+        COALESCE(c.health_indicator_cache, 'Not Started'),
+        CASE c.currently_testing_type
+            WHEN 'thesis' THEN t.text
+            WHEN 'proof_point' THEN pp.description
+        END,
+        (SELECT MIN(mr.review_date) + 30 FROM monthly_reviews mr WHERE mr.canvas_id = c.id),
+        now()
+    FROM vbus v
+    JOIN users u ON u.id = v.gm_id
+    JOIN canvases c ON c.vbu_id = v.id
+    LEFT JOIN theses t ON c.currently_testing_type = 'thesis' AND t.id = c.currently_testing_id
+    LEFT JOIN proof_points pp ON c.currently_testing_type = 'proof_point' AND pp.id = c.currently_testing_id
+    WHERE {scope}
+    ON CONFLICT (vbu_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        gm_id = EXCLUDED.gm_id,
+        group_leader_id = EXCLUDED.group_leader_id,
+        gm_name = EXCLUDED.gm_name,
+        lifecycle_lane = EXCLUDED.lifecycle_lane,
+        success_description = EXCLUDED.success_description,
+        primary_constraint = EXCLUDED.primary_constraint,
+        health_indicator = EXCLUDED.health_indicator,
+        currently_testing = EXCLUDED.currently_testing,
+        next_review_date = EXCLUDED.next_review_date,
+        refreshed_at = EXCLUDED.refreshed_at
+"""
+
+_SCOPE_PARAMS = ("vbu_ids", "canvas_ids", "thesis_ids", "user_ids")
+
+REFRESH_SCOPED_SQL = text(_UPSERT_SQL.format(scope="""
+    v.id = ANY(:vbu_ids)
+    OR c.id = ANY(:canvas_ids)
+    OR c.id IN (SELECT th.canvas_id FROM theses th WHERE th.id = ANY(:thesis_ids))
+    OR v.gm_id = ANY(:user_ids)
+""")).bindparams(*[bindparam(name, type_=ARRAY(UUID(as_uuid=True))) for name in _SCOPE_PARAMS])
+
+REFRESH_ALL_SQL = text(_UPSERT_SQL.format(scope="true"))
+
+PRUNE_SQL = text("""
+    DELETE FROM portfolio_summaries s
+    WHERE NOT EXISTS (SELECT 1 FROM canvases c WHERE c.vbu_id = s.vbu_id)
+""")
+
+
+def _collect_scope(session: Session) -> dict[str, set]:
+    """Map the objects in the current flush to the summary rows they affect."""
+    scope = {name: set() for name in _SCOPE_PARAMS}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, VBU):
+            scope["vbu_ids"].add(obj.id)
+        elif isinstance(obj, Canvas):
+            scope["vbu_ids"].add(obj.vbu_id)
+        elif isinstance(obj, (Thesis, MonthlyReview)):
+            scope["canvas_ids"].add(obj.canvas_id)
+        elif isinstance(obj, ProofPoint):
+            scope["thesis_ids"].add(obj.thesis_id)
+        elif isinstance(obj, User) and obj not in session.new and inspect(obj).attrs.name.history.has_changes():
+            scope["user_ids"].add(obj.id)
+    for ids in scope.values():
+        ids.discard(None)
+    return scope
+
+
+@event.listens_for(Session, "after_flush")
+def _remember_summary_scope(session: Session, flush_context) -> None:
+    pending = session.info.setdefault("portfolio_summary_scope", {name: set() for name in _SCOPE_PARAMS})
+    for name, ids in _collect_scope(session).items():
+        pending[name] |= ids
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _refresh_summary_scope(session: Session, flush_context) -> None:
+    pending = session.info.pop("portfolio_summary_scope", None)
+    if not pending or not any(pending.values()):
+        return
+    session.connection().execute(REFRESH_SCOPED_SQL, {name: list(ids) for name, ids in pending.items()})
+
+
+async def refresh_scoped_summaries(db: AsyncSession, **scope) -> None:
+    """Re-derive the summary rows touched by a bulk statement that bypassed the flush.
+
+    Keyword arguments are any of vbu_ids, canvas_ids, thesis_ids, user_ids.
+    """
+    await db.execute(REFRESH_SCOPED_SQL, {name: list(scope.get(name, ())) for name in _SCOPE_PARAMS})
+
+
+async def refresh_all_summaries(db: AsyncSession) -> int:
+    """Re-derive every portfolio summary row. Returns the number of rows written."""
+    result = await db.execute(REFRESH_ALL_SQL)
+    await db.execute(PRUNE_SQL)
+    return result.rowcount
@@ -0,0 +1,102 @@
+"""Lexicographic rank keys for user-ordered rows.
+
+Rows sort by a base-62 string compared bytewise (the columns use COLLATE "C").
+A key can always be generated between two neighbours, so moving a row
+usually rewrites only that row's key. Keys get longer as neighbours converge
+(repeatedly moving to the front, or appending to a long list). Once a new key
+would pass MAX_RANK_LENGTH, the caller renumbers the whole list instead.
+"""
+from bisect import bisect_left
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(ALPHABET)
+_DIGIT = {ch: i for i, ch in enumerate(ALPHABET)}
+
+# Well inside the String(255) columns: about 160 moves to the front of a list, or
+# 190 appends, before a renumber
+MAX_RANK_LENGTH = 32
+
+
+def rank_for_position(position: int) -> str:
+    """Fixed-width key for the 1-based position of a freshly numbered list.
+
+    Matches the keys the migration backfilled: 'a' + 6 digits + 'V'. The
+    trailing 'V' keeps every key from ending in '0', so there is always room
+    before and after it.
+    """
+    return f"a{position:06d}V"
+
+
+def renumbered(ids: Sequence[Hashable]) -> Dict[Hashable, str]:
+    """rank_for_position keys for ids in the given order"""
+    return {row_id: rank_for_position(position) for position, row_id in enumerate(ids, 1)}
+
+
+def rank_between(lo: Optional[str], hi: Optional[str]) -> str:
+    """Return a key strictly between lo and hi (None means open-ended)."""
+    if lo is not None and hi is not None and lo >= hi:
+        raise ValueError(f"rank_between: {lo!r} is not below {hi!r}")
+    lo = lo or ""
+    result = []
+    i = 0
+    while True:
+        a = _DIGIT[lo[i]] if i < len(lo) else 0
+        b = _DIGIT[hi[i]] if hi is not None and i < len(hi) else BASE
+        if b - a > 1:
+            result.append(ALPHABET[(a + b) // 2])
+            return "".join(result)
+        result.append(ALPHABET[a])
+        if b - a == 1:
+            # Prefix is now strictly below hi; later digits only need to beat lo
+            hi = None
+        i += 1
+
+
+def rerank(current: Sequence[Tuple[Hashable, str]], desired: Sequence[Hashable]) -> Dict[Hashable, str]:
+    """New keys for the fewest rows that turn the current order into desired.
+
+    current is every (id, rank) in the group; desired is every id in its new
+    order. The longest run of rows already in relative order keeps its keys;
+    each other row gets a fresh key between its new neighbours that collides
+    with no existing key, so the updates can run one at a time under a plain
+    unique constraint.
+    """
+    ranks = dict(current)
+    kept = set(_longest_increasing(desired, ranks))
+    occupied = set(ranks.values())
+    changes: Dict[Hashable, str] = {}
+    prev: Optional[str] = None
+    for index, row_id in enumerate(desired):
+        if row_id in kept:
+            prev = ranks[row_id]
+            continue
+        hi = next((ranks[later] for later in desired[index + 1:] if later in kept), None)
+        candidate = rank_between(prev, hi)
+        while candidate in occupied:
+            candidate = rank_between(prev, candidate)
+        occupied.add(candidate)
+        changes[row_id] = prev = candidate
+    return changes
+
+
+def _longest_increasing(ids: Sequence[Hashable], ranks: Dict[Hashable, str]) -> List[Hashable]:
+    """Longest subsequence of ids whose current ranks are increasing (O(n log n))."""
+    tails: List[str] = []
+    tail_index: List[int] = []
+    parent: List[Optional[int]] = [None] * len(ids)
+    for i, row_id in enumerate(ids):
+        pos = bisect_left(tails, ranks[row_id])
+        if pos == len(tails):
+            tails.append(ranks[row_id])
+            tail_index.append(i)
+        else:
+            tails[pos] = ranks[row_id]
+            tail_index[pos] = i
+        parent[i] = tail_index[pos - 1] if pos else None
+    out: List[Hashable] = []
+    i = tail_index[-1] if tail_index else None
+    while i is not None:
+        out.append(ids[i])
+        i = parent[i]
+    return out[::-1]
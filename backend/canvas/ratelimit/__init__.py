@@ -0,0 +1,7 @@
+from .backends import RateLimitBackend, RateLimitBackendError, MemoryBackend, PostgresBackend, RedisBackend
+from .limiter import RateLimiter, create_backend, rate_limiter
+
+__all__ = [
+    "RateLimitBackend", "RateLimitBackendError", "MemoryBackend", "PostgresBackend", "RedisBackend",
+    "RateLimiter", "create_backend", "rate_limiter",
+]
@@ -0,0 +1,199 @@
+"""Counter stores for the sliding-window rate limiter.
+
+Every backend keeps one integer counter per (key, fixed window) and answers a
+hit with the counts of the current and the previous window. Counters expire
+two windows after they start, so storage is bounded by the number of keys
+active in the last two windows.
+"""
+import abc
+import asyncio
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class RateLimitBackendError(Exception):
+    """Raised when a counter store returns an error or can't be reached"""
+    pass
+
+
+class RateLimitBackend(abc.ABC):
+    """A counter store; subclasses implement hit and may override purge and close."""
+
+    @abc.abstractmethod
+    async def hit(self, key: str, window_start: int, window_seconds: int) -> Tuple[int, int]:
+        """Count one hit in the window starting at window_start.
+
+        Returns (current window count including this hit, previous window count).
+        """
+
+    async def purge(self) -> None:
+        """Drop expired counters (for stores that don't expire them on their own)."""
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryBackend(RateLimitBackend):
+    """Process-local counters in an LRU-ordered dict.
+
+    Only suitable for a single worker. Each key holds one entry, so a hit is
+    O(1). Entries are dropped from the stale end once they expire or when
+    max_keys is exceeded.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [window_start, current, previous, expires_at]
+        self._counters: "OrderedDict[str, list]" = OrderedDict()
+
+    async def hit(self, key: str, window_start: int, window_seconds: int) -> Tuple[int, int]:
+        entry = self._counters.get(key)
+        if entry is None or entry[0] < window_start - window_seconds:
+            entry = [window_start, 0, 0, 0.0]
+            self._counters[key] = entry
+        elif entry[0] < window_start:
+            entry[0], entry[1], entry[2] = window_start, 0, entry[1]
+        entry[1] += 1
+        entry[3] = window_start + 2 * window_seconds
+        self._counters.move_to_end(key)
+        self._evict()
+        return entry[1], entry[2]
+
+    def _evict(self) -> None:
+        now = time.time()
+        while self._counters:
+            entry = next(iter(self._counters.values()))
+            if entry[3] > now and len(self._counters) <= self.max_keys:
+                break
+            self._counters.popitem(last=False)
+
+
+class PostgresBackend(RateLimitBackend):
+    """Counters in the UNLOGGED rate_limit_counters table, shared by every worker.
+
+    Each hit is one upsert-and-read statement on its own short transaction, so
+    it never joins (or waits on) the request's session.
+    """
+
+    _HIT = text("""
+        WITH hit AS (
+            INSERT INTO rate_limit_counters AS c (key, window_start, count, expires_at)
+            VALUES (:key, :window_start, 1, now() + make_interval(secs => :ttl))
+            ON CONFLICT (key, window_start) DO UPDATE SET count = c.count + 1
+            RETURNING c.count
+        )
+        SELECT
+            (SELECT count FROM hit) AS current,
+            COALESCE((
+                SELECT count FROM rate_limit_counters
+                WHERE key = :key AND window_start = :previous_start
+            ), 0) AS previous
+    """)
+    _PURGE = text("DELETE FROM rate_limit_counters WHERE expires_at < now()")
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    async def hit(self, key: str, window_start: int, window_seconds: int) -> Tuple[int, int]:
+        async with self.engine.begin() as conn:
+            row = (await conn.execute(self._HIT, {
+                "key": key,
+                "window_start": window_start,
+                "previous_start": window_start - window_seconds,
+                "ttl": float(2 * window_seconds),
+            })).one()
+        return row.current, row.previous
+
+    async def purge(self) -> None:
+        async with self.engine.begin() as conn:
+            await conn.execute(self._PURGE)
+
+
+class RedisBackend(RateLimitBackend):
+    """Counters in any server speaking the Redis protocol (Redis, Valkey, KeyDB, ...).
+
+    Uses one pipelined INCR/EXPIRE/GET per hit over a single connection, with
+    no client library: the handful of RESP commands needed are encoded here.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def hit(self, key: str, window_start: int, window_seconds: int) -> Tuple[int, int]:
+        current_key = f"ratelimit:{key}:{window_start}"
+        previous_key = f"ratelimit:{key}:{window_start - window_seconds}"
+        current, _, previous = await self._pipeline(
+            ("INCR", current_key),
+            ("EXPIRE", current_key, 2 * window_seconds),
+            ("GET", previous_key),
+        )
+        return int(current), int(previous or 0)
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._disconnect()
+
+    async def _pipeline(self, *commands) -> List:
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._send(commands), self.timeout)
+            except BaseException:
+                # A half-read reply would desynchronize the connection
+                self._disconnect()
+                raise
+
+    async def _send(self, commands) -> List:
+        setup = []
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            if self.password:
+                setup.append(("AUTH", self.password))
+            if self.db:
+                setup.append(("SELECT", self.db))
+        batch = [*setup, *commands]
+        self._writer.write(b"".join(_encode_command(command) for command in batch))
+        await self._writer.drain()
+        replies = [await self._read_reply() for _ in batch]
+        return replies[len(setup):]
+
+    async def _read_reply(self):
+        line = await self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise RateLimitBackendError("Connection closed by rate limit store")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RateLimitBackendError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2].decode()
+        if kind == b"*":
+            return [await self._read_reply() for _ in range(int(body))]
+        raise RateLimitBackendError(f"Unexpected reply from rate limit store: {line!r}")
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+def _encode_command(command) -> bytes:
+    parts = [str(arg).encode() for arg in command]
+    return b"*%d\r\n" % len(parts) + b"".join(b"$%d\r\n%s\r\n" % (len(part), part) for part in parts)
@@ -0,0 +1,64 @@
+import math
+import time
+import structlog
+from fastapi import HTTPException, status
+from canvas.config import Settings
+from canvas.ratelimit.backends import MemoryBackend, PostgresBackend, RateLimitBackend, RedisBackend
+
+logger = structlog.get_logger(__name__)
+
+
+class RateLimiter:
+    """Sliding-window counter limiter over a pluggable counter store.
+
+    A hit's weight is the current fixed window's count plus the previous
+    window's count scaled by how much of it still overlaps the sliding window.
+    That needs two integers per key, however many requests arrive. If the store
+    is unreachable the limiter fails open and logs, so an outage of the store
+    never locks everyone out of login.
+    """
+
+    def __init__(self, backend: RateLimitBackend, purge_every: int = 1000):
+        self.backend = backend
+        self.purge_every = purge_every
+        self._hits = 0
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> None:
+        """Record a request for key, or raise 429 if it exceeds limit per window_seconds."""
+        now = time.time()
+        window_start = int(now // window_seconds) * window_seconds
+        try:
+            current, previous = await self.backend.hit(key, window_start, window_seconds)
+            self._hits += 1
+            if self._hits % self.purge_every == 0:
+                await self.backend.purge()
+        except Exception:
+            logger.warning("rate_limit_backend_unavailable", backend=type(self.backend).__name__, exc_info=True)
+            return
+
+        elapsed = now - window_start
+        estimate = previous * (window_seconds - elapsed) / window_seconds + current
+        if estimate > limit:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(max(1, math.ceil(window_seconds - elapsed)))},
+            )
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def create_backend(settings: Settings) -> RateLimitBackend:
+    """Build the counter store selected by settings.rate_limit_backend."""
+    if settings.rate_limit_backend == "memory":
+        return MemoryBackend()
+    if settings.rate_limit_backend == "postgres":
+        from canvas.db import engine
+        return PostgresBackend(engine)
+    if settings.rate_limit_backend == "redis":
+        return RedisBackend(settings.rate_limit_redis_url)
+    raise ValueError(f"Unknown rate limit backend: {settings.rate_limit_backend}")
+
+
+rate_limiter = RateLimiter(create_backend(Settings()))
@@ -0,0 +1,50 @@
+"""
+Recompute canvases.health_indicator_cache for every canvas in batches.
+
+Usage: python -m canvas.recompute_health [--batch-size N]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from sqlalchemy import select, text, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from canvas.db import AsyncSessionLocal
+from canvas.models.canvas import Canvas
+from canvas.portfolio.summary import refresh_scoped_summaries
+
+RECOMPUTE_SQL = text("SELECT recompute_canvas_health(:canvas_ids)").bindparams(
+    bindparam("canvas_ids", type_=ARRAY(UUID(as_uuid=True)))
+)
+
+async def main(batch_size: int):
+    """Walk canvases by id, recomputing health and summaries one committed batch at a time."""
+    try:
+        canvases = 0
+        batches = 0
+        after = None
+        while True:
+            async with AsyncSessionLocal() as db:
+                stmt = select(Canvas.id).order_by(Canvas.id).limit(batch_size)
+                if after is not None:
+                    stmt = stmt.where(Canvas.id > after)
+                ids = list((await db.execute(stmt)).scalars())
+                if not ids:
+                    break
+                await db.execute(RECOMPUTE_SQL, {"canvas_ids": ids})
+                # Health is written by SQL, not the ORM, so refresh summaries explicitly
+                await refresh_scoped_summaries(db, canvas_ids=ids)
+                await db.commit()
+            canvases += len(ids)
+            batches += 1
+            after = ids[-1]
+        print(json.dumps({"status": "success", "canvases": canvases, "batches": batches}))
+    except Exception as e:
+        print(json.dumps({"status": "error", "message": str(e)}))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
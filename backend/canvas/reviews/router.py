@@ -1,16 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from uuid import UUID
 from typing import List
 from canvas.auth.dependencies import get_current_user, require_role
+from canvas.auth.ownership import authorize
 from canvas.db import get_db_session
-from canvas import success_response, list_response
+from canvas import success_response, list_response, json_response
+from canvas.etag import make_etag, etag_matches, not_modified_response, set_etag
 from canvas.reviews.service import ReviewService
 from canvas.reviews.schemas import ReviewCreateSchema, ReviewResponse
-from canvas.models.canvas import Canvas
-from canvas.models.vbu import VBU
 
 router = APIRouter(prefix="/api", tags=["reviews"])
 
@@ -23,40 +21,30 @@ def check_csrf_token(request: Request) -> None:
             detail="CSRF token required"
         )
 
-async def verify_canvas_access(canvas_id: UUID, current_user, db: AsyncSession):
+async def verify_canvas_access(canvas_id: UUID, current_user, db: AsyncSession) -> None:
     """Verify user has access to canvas based on role"""
-    result = await db.execute(
-        select(Canvas).options(selectinload(Canvas.vbu)).where(Canvas.id == canvas_id)
-    )
-    canvas = result.scalar_one_or_none()
-    if not canvas:
-        raise HTTPException(status_code=404, detail="Canvas not found")
-    
-    if current_user.role == "admin":
-        return canvas
-    
-    if current_user.role == "viewer" and current_user.vbu_id != canvas.vbu_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
-    if current_user.role == "gm" and canvas.vbu.gm_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
-    if current_user.role == "group_leader" and canvas.vbu.group_leader_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
-    return canvas
+    await authorize(db, current_user, "canvas", canvas_id)
 
 @router.get("/canvases/{canvas_id}/reviews", response_model=dict)
 async def list_reviews(
     canvas_id: UUID, 
+    request: Request,
+    response: Response,
     current_user=Depends(get_current_user), 
     db: AsyncSession = Depends(get_db_session)
 ):
     """List reviews for a canvas"""
     await verify_canvas_access(canvas_id, current_user, db)
     service = ReviewService(db)
+    etag = make_etag(await service.get_reviews_version(canvas_id))
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
     reviews = await service.list_reviews(canvas_id)
-    return list_response([ReviewResponse.model_validate(review) for review in reviews], len(reviews))
+    return json_response(
+        list_response([ReviewResponse.model_validate(review) for review in reviews], len(reviews)),
+        response=response,
+    )
 
 @router.post("/canvases/{canvas_id}/reviews", response_model=dict, status_code=201)
 async def create_review(
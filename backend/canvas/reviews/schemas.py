@@ -44,6 +44,7 @@ class AttachmentResponse(BaseModel):
     filename: str
     label: Optional[str] = None
     size_bytes: int
+    download_url: Optional[str] = None
     model_config = {"from_attributes": True}
 
 class ReviewResponse(BaseModel):
@@ -1,7 +1,7 @@
 from typing import List, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, func
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
@@ -26,6 +26,24 @@ class ReviewService:
         )
         return result.scalars().all()
     
+    async def get_reviews_version(self, canvas_id: UUID) -> str:
+        """Version string for a canvas's review list: counts and latest timestamps"""
+        result = await self.db.execute(
+            select(
+                func.count(func.distinct(MonthlyReview.id)),
+                func.max(MonthlyReview.updated_at),
+                func.count(func.distinct(Commitment.id)),
+                func.max(Commitment.updated_at),
+                func.count(func.distinct(Attachment.id)),
+                func.max(Attachment.updated_at),
+            )
+            .select_from(MonthlyReview)
+            .outerjoin(Commitment, Commitment.monthly_review_id == MonthlyReview.id)
+            .outerjoin(Attachment, Attachment.monthly_review_id == MonthlyReview.id)
+            .where(MonthlyReview.canvas_id == canvas_id)
+        )
+        return ":".join(str(part) for part in result.one())
+    
     async def create_review(self, canvas_id: UUID, review_data: Dict[str, Any], created_by: UUID) -> MonthlyReview:
         """Create review with commitments, update canvas currently_testing atomically"""
         try:
@@ -99,7 +117,7 @@ class ReviewService:
         result = await self.db.execute(
             select(Thesis)
             .where(Thesis.canvas_id == canvas_id)
-            .order_by(Thesis.order)
+            .order_by(Thesis.rank)
             .options(selectinload(Thesis.proof_points))
         )
         theses = result.scalars().all()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -25,6 +25,17 @@ class ProofPointUpdate(BaseModel):
     evidence_note: Optional[str] = None
     target_review_month: Optional[str] = Field(None, pattern=r"^\d{4}-\d{2}$", description="YYYY-MM format")
 
+class ProofPointBatchUpdate(ProofPointUpdate):
+    id: UUID
+
+class ProofPointBatch(BaseModel):
+    create: List[ProofPointCreate] = Field(default_factory=list, max_length=100)
+    update: List[ProofPointBatchUpdate] = Field(default_factory=list, max_length=100)
+    delete: List[UUID] = Field(default_factory=list, max_length=100)
+
+class ProofPointMove(BaseModel):
+    after_id: Optional[UUID] = Field(None, description="Sibling to place the proof point after; null moves it first")
+
 router = APIRouter(prefix="/api", tags=["proof_point"])
 canvas_service = CanvasService()
 
@@ -61,6 +72,25 @@ async def create_proof_point(
     )
     return success_response(proof_point, status_code=201)
 
+@router.patch("/theses/{thesis_id}/proof-points")
+async def batch_proof_points(
+    thesis_id: UUID,
+    batch: ProofPointBatch,
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.GM, UserRole.GROUP_LEADER])),
+    db: AsyncSession = Depends(get_db_session),
+    _: None = Depends(verify_csrf)
+):
+    """Create, update and delete a thesis' proof points in one transaction"""
+    await canvas_service.verify_thesis_ownership(thesis_id, current_user, db)
+    result = await canvas_service.apply_proof_point_batch(
+        thesis_id,
+        [item.model_dump() for item in batch.create],
+        [item.model_dump(exclude_unset=True) | {"id": item.id} for item in batch.update],
+        batch.delete,
+        db
+    )
+    return success_response(result)
+
 @router.patch("/proof-points/{proof_point_id}")
 async def update_proof_point(
     proof_point_id: UUID,
@@ -79,6 +109,19 @@ async def update_proof_point(
     )
     return success_response(proof_point)
 
+@router.post("/proof-points/{proof_point_id}/move")
+async def move_proof_point(
+    proof_point_id: UUID,
+    move_data: ProofPointMove,
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.GM, UserRole.GROUP_LEADER])),
+    db: AsyncSession = Depends(get_db_session),
+    _: None = Depends(verify_csrf)
+):
+    """Move one proof point within its thesis, rewriting only its rank"""
+    await canvas_service.verify_proof_point_ownership(proof_point_id, current_user, db)
+    proof_point = await canvas_service.move_proof_point(proof_point_id, move_data.after_id, db)
+    return success_response(proof_point)
+
 @router.delete("/proof-points/{proof_point_id}", status_code=204)
 async def delete_proof_point(
     proof_point_id: UUID,
@@ -1,6 +1,6 @@
 from typing import List, Dict, Any
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
@@ -26,6 +26,9 @@ class ThesisUpdate(BaseModel):
 class ThesesReorder(BaseModel):
     thesis_orders: List[Dict[str, Any]] = Field(..., description="List of {id, order} pairs")
 
+class ThesisMove(BaseModel):
+    after_id: UUID | None = Field(None, description="Sibling to place the thesis after; null moves it first")
+
 router = APIRouter(prefix="/api", tags=["thesis"])
 canvas_service = CanvasService()
 
@@ -98,12 +101,20 @@ async def reorder_theses(
     db: AsyncSession = Depends(get_db_session),
     _: None = Depends(verify_csrf)
 ):
-    """Reorder theses with order constraint validation"""
+    """Reorder theses; the service rejects unknown ids and out-of-range or repeated orders"""
     await canvas_service.verify_canvas_ownership(canvas_id, current_user, db)
-    try:
-        theses = await canvas_service.reorder_theses(canvas_id, reorder_data.thesis_orders, db)
-    except Exception as e:
-        if "IntegrityError" in type(e).__name__ or "CheckViolation" in str(e):
-            raise HTTPException(status_code=422, detail="Order values must be between 1 and 5")
-        raise
-    return success_response(theses)
\ No newline at end of file
+    theses = await canvas_service.reorder_theses(canvas_id, reorder_data.thesis_orders, db)
+    return success_response(theses)
+
+@router.post("/theses/{thesis_id}/move")
+async def move_thesis(
+    thesis_id: UUID,
+    move_data: ThesisMove,
+    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.GM, UserRole.GROUP_LEADER])),
+    db: AsyncSession = Depends(get_db_session),
+    _: None = Depends(verify_csrf)
+):
+    """Move one thesis within its canvas, rewriting only that thesis' rank"""
+    await canvas_service.verify_thesis_ownership(thesis_id, current_user, db)
+    thesis = await canvas_service.move_thesis(thesis_id, move_data.after_id, db)
+    return success_response(thesis)
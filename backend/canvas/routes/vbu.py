@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy import select
@@ -6,12 +6,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from canvas.db import get_db_session
 from canvas.auth.dependencies import get_current_user, require_role, verify_csrf
+from canvas.auth.ownership import Owner, authorize, can_access, resolve_owner
 from canvas.models.user import User, UserRole
 from canvas.models.vbu import VBU
 from canvas.services.canvas_service import CanvasService
-from canvas.pdf.service import PDFService
+from canvas.pdf.service import CanvasNotFoundError, PDFGenerationError, PDFService
+from canvas.pdf.renderer import PDFRenderBusyError, PDFRenderTimeoutError
 from canvas.schemas import VBUCreate, VBUUpdate, VBUResponse
-from canvas import success_response, list_response
+from canvas import success_response, list_response, cursor_response, json_response
 
 router = APIRouter(prefix="/api/vbus", tags=["vbu"])
 
@@ -19,12 +21,21 @@ router = APIRouter(prefix="/api/vbus", tags=["vbu"])
 async def list_vbus(
     page: int = Query(1, ge=1),
     per_page: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value to start cursor pagination"),
+    count: Literal["none", "exact", "estimate"] = Query("none", description="Total count mode for cursor pagination"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ):
-    """List VBUs filtered by user role"""
+    """List VBUs filtered by user role.
+
+    Page-based by default. When `cursor` is supplied the list is paginated by
+    (name, id) seek key and `meta.next_cursor` points at the following page.
+    """
     service = CanvasService()
-    vbus, total = await service.list_vbus_paginated(current_user, page, per_page, db)
+    if cursor is not None:
+        vbus, next_cursor, total = await service.list_vbus_keyset(current_user, cursor, per_page, count, db)
+    else:
+        vbus, total = await service.list_vbus_paginated(current_user, page, per_page, db)
     
     vbu_responses = [
         VBUResponse(
@@ -38,7 +49,9 @@ async def list_vbus(
         ) for vbu in vbus
     ]
     
-    return list_response(vbu_responses, total, page, per_page)
+    if cursor is not None:
+        return json_response(cursor_response(vbu_responses, next_cursor, per_page, total))
+    return json_response(list_response(vbu_responses, total, page, per_page))
 
 @router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_vbu(
@@ -86,16 +99,8 @@ async def get_vbu(
     if not vbu:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="VBU not found")
     
-    # Check GM ownership
-    if current_user.role == UserRole.GM and vbu.gm_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    
-    # Check group leader ownership
-    if current_user.role == UserRole.GROUP_LEADER and vbu.group_leader_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    
-    # Check viewer scoping
-    if current_user.role == UserRole.VIEWER and current_user.vbu_id != vbu_id:
+    # Ownership and viewer scoping, checked against the row we already have
+    if not can_access(Owner.of_vbu(vbu), current_user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
     
     vbu_response = VBUResponse(
@@ -120,20 +125,7 @@ async def update_vbu(
 ):
     """Update VBU (admin or GM owner)"""
     # Check VBU exists and authorization
-    result = await db.execute(
-        select(VBU).options(selectinload(VBU.gm)).where(VBU.id == vbu_id)
-    )
-    vbu = result.scalar_one_or_none()
-    if not vbu:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="VBU not found")
-    
-    # Check authorization
-    if current_user.role == UserRole.GM and vbu.gm_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    if current_user.role == UserRole.GROUP_LEADER and vbu.group_leader_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    if current_user.role == UserRole.VIEWER:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    await authorize(db, current_user, "vbu", vbu_id, write=True)
     
     # Admin can update all fields, GM can only update name
     service = CanvasService()
@@ -186,26 +178,20 @@ async def export_canvas_pdf(
         404: VBU not found or access denied
         500: PDF generation failed
     """
-    # Get VBU and check authorization
-    result = await db.execute(
-        select(VBU).options(selectinload(VBU.canvas)).where(VBU.id == vbu_id)
-    )
-    vbu = result.scalar_one_or_none()
-    if not vbu:
+    # Resolve VBU and its canvas; viewers may export any canvas
+    owner = await resolve_owner(db, "vbu", vbu_id)
+    if not owner:
         raise HTTPException(status_code=404, detail="VBU not found")
-    
-    # Check GM ownership
-    if current_user.role == UserRole.GM and vbu.gm_id != current_user.id:
-        raise HTTPException(status_code=404, detail="VBU not found")
-    if current_user.role == UserRole.GROUP_LEADER and vbu.group_leader_id != current_user.id:
+    if current_user.role in (UserRole.GM, UserRole.GROUP_LEADER) and not can_access(owner, current_user):
         raise HTTPException(status_code=404, detail="VBU not found")
     
-    if not vbu.canvas:
+    if not owner.canvas_id:
         raise HTTPException(status_code=404, detail="Canvas not found")
     
+    vbu = await db.get(VBU, vbu_id)
     try:
         pdf_service = PDFService(db)
-        pdf_bytes = await pdf_service.export_canvas(vbu.canvas.id)
+        pdf_bytes = await pdf_service.export_canvas(owner.canvas_id)
         
         return Response(
             content=pdf_bytes,
@@ -215,5 +201,11 @@ async def export_canvas_pdf(
                 "Content-Length": str(len(pdf_bytes))
             }
         )
-    except Exception as e:
+    except PDFRenderBusyError:
+        raise HTTPException(status_code=503, detail="PDF export busy, retry shortly", headers={"Retry-After": "5"})
+    except PDFRenderTimeoutError:
+        raise HTTPException(status_code=504, detail="PDF generation timed out")
+    except CanvasNotFoundError:
+        raise HTTPException(status_code=404, detail="Canvas not found")
+    except PDFGenerationError:
         raise HTTPException(status_code=500, detail="PDF generation failed")
\ No newline at end of file
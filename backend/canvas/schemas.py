@@ -68,6 +68,7 @@ class AttachmentResponse(BaseModel):
     label: Optional[str]
     uploaded_by: UUID
     created_at: datetime
+    download_url: Optional[str] = None
 
 
 class ProofPointResponse(BaseModel):
@@ -1,61 +1,263 @@
 """
-Seed script for Canvas application.
+Generate a synthetic portfolio for development and performance work.
 
-This script creates development users and sample data.
+Usage: python -m canvas.seed [--vbus N] [--theses N] [--proof-points N] [--reviews N]
+                             [--attachments N] [--blobs N] [--seed N] [--as-of YYYY-MM-DD]
+
+Defaults give the small dev dataset. Something like `--vbus 5000 --theses 5
+--proof-points 20 --reviews 24 --attachments 10` reproduces production scale.
+Rows are derived deterministically from --seed and --as-of and bulk-loaded
+with COPY, --batch-size VBUs at a time, in a single transaction. Every user
+shares one password, hashed once. Idempotent: skips if any VBU or the admin
+user already exists.
 """
+import argparse
 import asyncio
+import hashlib
 import json
-import sys
+import math
 import os
+import random
+import sys
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+from sqlalchemy import func, select
+from canvas.auth.service import AuthService
+from canvas.config import Settings
 from canvas.db import AsyncSessionLocal
+from canvas.models.thesis_category import ThesisCategory
+from canvas.models.user import User
+from canvas.models.vbu import VBU
+from canvas.portfolio.summary import refresh_all_summaries
+from canvas.ranking import rank_for_position
 
-# Configuration from environment variables
-SEED_ADMIN_EMAIL = os.getenv("SEED_ADMIN_EMAIL", "admin@example.com")
+SEED_ADMIN_EMAIL = os.getenv("SEED_ADMIN_EMAIL", "admin@canvas.local")
 SEED_ADMIN_NAME = os.getenv("SEED_ADMIN_NAME", "Admin User")
-SEED_GM_EMAIL = os.getenv("SEED_GM_EMAIL", "gm@example.com")
-SEED_GM_NAME = os.getenv("SEED_GM_NAME", "General Manager")
-SEED_VBU_NAME = os.getenv("SEED_VBU_NAME", "Sample VBU")
-SEED_PRODUCT_NAME = os.getenv("SEED_PRODUCT_NAME", "Sample Product")
-
-# BLOCKED: awaiting 001-auth/T-011 for User model
-# BLOCKED: awaiting 002-canvas-management/T-003 for VBU, Canvas models
-
-async def seed_users():
-    """Create dev users if they don't exist."""
-    # BLOCKED: awaiting User model from 001-auth/T-011
-    print(json.dumps({"error": "BLOCKED: awaiting User model from 001-auth/T-011"}))
-    return False
-
-async def seed_sample_data():
-    """Create sample VBUs and canvases if they don't exist."""
-    # BLOCKED: awaiting VBU, Canvas models from 002-canvas-management/T-003
-    print(json.dumps({"error": "BLOCKED: awaiting VBU, Canvas models from 002-canvas-management/T-003"}))
-    return False
-
-async def main():
-    """Main seed function - idempotent."""
+
+COLUMNS = {
+    "users": ("id", "email", "password_hash", "name", "role", "is_active",
+              "failed_login_attempts", "must_reset_password", "vbu_id"),
+    "vbus": ("id", "name", "gm_id", "group_leader_id"),
+    "canvases": ("id", "vbu_id", "product_name", "lifecycle_lane", "success_description",
+                 "primary_focus", "primary_constraint", "currently_testing_type", "currently_testing_id"),
+    "theses": ("id", "canvas_id", "rank", "text", "description", "category_id"),
+    "proof_points": ("id", "thesis_id", "rank", "description", "status", "evidence_note", "target_review_month"),
+    "monthly_reviews": ("id", "canvas_id", "review_date", "what_moved", "what_learned", "what_threatens",
+                        "currently_testing_type", "currently_testing_id", "created_by"),
+    "commitments": ("id", "monthly_review_id", "text", "order"),
+    "attachments": ("id", "proof_point_id", "monthly_review_id", "filename", "storage_path",
+                    "content_type", "size_bytes", "sha256", "uploaded_by"),
+}
+
+LANES = ("build", "sell", "milk", "reframe")
+STATUSES = ("not_started", "in_progress", "observed", "not_observed", "stalled")
+STATUS_WEIGHTS = (30, 30, 20, 10, 10)
+# One entry per percentage point, so a status is a single random index
+STATUS_TABLE = tuple(status for status, weight in zip(STATUSES, STATUS_WEIGHTS) for _ in range(weight))
+ADJECTIVES = ("Agile", "Bright", "Core", "Delta", "Echo", "Forge", "Granite", "Harbor", "Insight", "Juniper",
+              "Keystone", "Lumen", "Meridian", "North", "Orbit", "Pioneer", "Quartz", "Ridge", "Summit", "Vector")
+NOUNS = ("Analytics", "Billing", "Cloud", "Commerce", "Dispatch", "Field", "Health", "Inventory", "Learning",
+         "Logistics", "Payments", "Payroll", "Portal", "Reservations", "Scheduling", "Service", "Studio", "Works")
+WORDS = ("customers", "renewals", "pricing", "onboarding", "churn", "pipeline", "adoption", "partners",
+         "margin", "retention", "usage", "referrals", "support", "upsell", "integrations", "activation")
+
+
+def _month_start(day: date, months_back: int) -> date:
+    index = day.year * 12 + day.month - 1 - months_back
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class PortfolioGenerator:
+    """Deterministic row factory. All ids and content come from one seeded RNG."""
+
+    def __init__(self, args, category_ids, uploader_id):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.category_ids = category_ids
+        self.uploader_id = uploader_id
+        self.blobs = []
+        self._sentences = {}
+        self._target_months = [_month_start(args.as_of, back) for back in range(-6, 12)]
+
+    def new_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def pick(self, seq):
+        # random() indexing is several times cheaper than Random.choice
+        return seq[int(self.rng.random() * len(seq))]
+
+    def sentence(self, words: int) -> str:
+        # Drawn from a small pool per length; composing each one is most of the CPU
+        pool = self._sentences.get(words)
+        if pool is None:
+            pool = self._sentences[words] = [
+                " ".join(self.rng.choice(WORDS) for _ in range(words)).capitalize() for _ in range(64)
+            ]
+        return self.pick(pool)
+
+    def users(self, role: str, count: int, password_hash: str):
+        return [
+            (self.new_id(), f"{role.replace('_', '')}{n}@canvas.local", password_hash,
+             f"{role.replace('_', ' ').title()} {n}", role, True, 0, False, None)
+            for n in range(1, count + 1)
+        ]
+
+    def make_blobs(self, upload_dir: Path):
+        """Write --blobs distinct content-addressed files; attachments share them."""
+        for _ in range(self.args.blobs if self.args.attachments else 0):
+            payload = b"%PDF-1.4\n" + self.rng.randbytes(self.args.blob_kb * 1024)
+            sha256 = hashlib.sha256(payload).hexdigest()
+            path = upload_dir / "blobs" / sha256[:2] / sha256[2:4] / sha256
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(payload)
+            self.blobs.append((str(path), len(payload), sha256))
+
+    def batch(self, first: int, count: int, gm_ids, group_leader_ids) -> dict:
+        """Rows for VBUs first .. first+count-1, keyed by table."""
+        rows = {table: [] for table in COLUMNS if table != "users"}
+        for n in range(first, first + count):
+            self._vbu(n, rows, gm_ids, group_leader_ids)
+        return rows
+
+    def _vbu(self, n, rows, gm_ids, group_leader_ids):
+        args, rng = self.args, self.rng
+        vbu_id, canvas_id = self.new_id(), self.new_id()
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {n:05d}"
+        leader = group_leader_ids[n % len(group_leader_ids)] if group_leader_ids else None
+        rows["vbus"].append((vbu_id, name, gm_ids[n % len(gm_ids)], leader))
+
+        thesis_ids, proof_point_ids = [], []
+        for t in range(1, args.theses + 1):
+            thesis_id = self.new_id()
+            thesis_ids.append(thesis_id)
+            category = self.pick(self.category_ids) if self.category_ids else None
+            rows["theses"].append((
+                thesis_id, canvas_id, rank_for_position(t), f"If we improve {self.sentence(3).lower()}",
+                self.sentence(12), category,
+            ))
+            for p in range(1, args.proof_points + 1):
+                proof_point_id = self.new_id()
+                proof_point_ids.append(proof_point_id)
+                status = self.pick(STATUS_TABLE)
+                rows["proof_points"].append((
+                    proof_point_id, thesis_id, rank_for_position(p), self.sentence(8), status,
+                    self.sentence(10) if status != "not_started" else None,
+                    self.pick(self._target_months),
+                ))
+
+        testing_id = rng.choice(thesis_ids) if thesis_ids else None
+        testing_type = "thesis" if testing_id else None
+        rows["canvases"].append((
+            canvas_id, vbu_id, name.rsplit(" ", 1)[0], rng.choice(LANES), self.sentence(15),
+            self.sentence(4), self.sentence(10), testing_type, testing_id,
+        ))
+
+        review_ids = []
+        for months_back in range(args.reviews - 1, -1, -1):
+            review_id = self.new_id()
+            review_ids.append(review_id)
+            # Only the latest review names what is being tested, matching the canvas
+            latest = months_back == 0
+            rows["monthly_reviews"].append((
+                review_id, canvas_id, _month_start(args.as_of, months_back),
+                self.sentence(20), self.sentence(20), self.sentence(12),
+                testing_type if latest else None, testing_id if latest else None, self.uploader_id,
+            ))
+            for order in range(1, rng.randint(1, 3) + 1):
+                rows["commitments"].append((self.new_id(), review_id, self.sentence(8), order))
+
+        for a in range(args.attachments if self.blobs else 0):
+            storage_path, size, sha256 = self.pick(self.blobs)
+            on_review = review_ids and a % 4 == 3
+            rows["attachments"].append((
+                self.new_id(),
+                None if on_review else self.pick(proof_point_ids) if proof_point_ids else None,
+                self.pick(review_ids) if on_review else None,
+                f"evidence-{n:05d}-{a + 1}.pdf", storage_path, "application/pdf", size, sha256, self.uploader_id,
+            ))
+
+
+async def _copy(conn, table: str, records) -> int:
+    if records:
+        await conn.copy_records_to_table(table, records=records, columns=COLUMNS[table])
+    return len(records)
+
+
+async def main(args):
+    """Load the portfolio in one transaction and rebuild the summaries."""
     try:
-        users_created = await seed_users()
-        sample_data_created = await seed_sample_data()
-        
-        if not users_created and not sample_data_created:
-            print(json.dumps({
-                "status": "blocked",
-                "message": "Seed script blocked on missing models from other features"
-            }))
-            return
-            
+        started = time.perf_counter()
+        settings = Settings()
+        async with AsyncSessionLocal() as db:
+            existing = await db.scalar(select(func.count()).select_from(VBU))
+            admin_exists = await db.scalar(select(func.count()).select_from(User).where(User.email == SEED_ADMIN_EMAIL))
+            if existing or admin_exists:
+                print(json.dumps({"status": "skipped", "message": "Data already exists"}))
+                return
+
+            category_ids = list((await db.execute(select(ThesisCategory.id).order_by(ThesisCategory.name))).scalars())
+            password_hash = AuthService()._hash_password(args.password)
+            admin_id = uuid.UUID(int=random.Random(f"admin:{args.seed}").getrandbits(128), version=4)
+            generator = PortfolioGenerator(args, category_ids, admin_id)
+            await asyncio.to_thread(generator.make_blobs, Path(args.upload_dir or settings.upload_dir))
+
+            gm_count = args.gms or max(2, math.ceil(args.vbus / 10))
+            leader_count = args.group_leaders if args.group_leaders is not None else math.ceil(gm_count / 5)
+            gms = generator.users("gm", gm_count, password_hash)
+            leaders = generator.users("group_leader", leader_count, password_hash)
+            admin = (admin_id, SEED_ADMIN_EMAIL, password_hash, SEED_ADMIN_NAME, "admin", True, 0, False, None)
+
+            conn = (await (await db.connection()).get_raw_connection()).driver_connection
+            counts = {table: 0 for table in COLUMNS}
+            counts["users"] += await _copy(conn, "users", [admin, *gms, *leaders])
+            for first in range(1, args.vbus + 1, args.batch_size):
+                rows = generator.batch(
+                    first, min(args.batch_size, args.vbus - first + 1),
+                    [gm[0] for gm in gms], [leader[0] for leader in leaders],
+                )
+                for table, records in rows.items():
+                    counts[table] += await _copy(conn, table, records)
+                if first == 1 and rows["vbus"]:
+                    viewer = generator.users("viewer", 1, password_hash)[0][:-1] + (rows["vbus"][0][0],)
+                    counts["users"] += await _copy(conn, "users", [viewer])
+
+            # COPY bypasses the ORM flush hooks, so rebuild every summary row
+            await refresh_all_summaries(db)
+            await db.commit()
+
         print(json.dumps({
             "status": "success",
-            "users_created": users_created,
-            "sample_data_created": sample_data_created
+            "seed": args.seed,
+            "rows": counts,
+            "blobs": len(generator.blobs),
+            "seconds": round(time.perf_counter() - started, 2),
         }))
     except Exception as e:
-        print(json.dumps({
-            "status": "error",
-            "message": str(e)
-        }))
+        print(json.dumps({"status": "error", "message": str(e)}))
         sys.exit(1)
 
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vbus", type=int, default=2)
+    parser.add_argument("--theses", type=int, default=3, choices=range(0, 6), metavar="0-5")
+    parser.add_argument("--proof-points", type=int, default=2, help="per thesis")
+    parser.add_argument("--reviews", type=int, default=1, help="monthly reviews per canvas, ending at --as-of")
+    parser.add_argument("--attachments", type=int, default=0, help="per VBU")
+    parser.add_argument("--blobs", type=int, default=32, help="distinct files the attachments share")
+    parser.add_argument("--blob-kb", type=int, default=64)
+    parser.add_argument("--gms", type=int, default=None, help="default: one per 10 VBUs, at least 2")
+    parser.add_argument("--group-leaders", type=int, default=None, help="default: one per 5 GMs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today().replace(day=1))
+    parser.add_argument("--password", default="canvas", help="password for every generated user")
+    parser.add_argument("--upload-dir", default=None, help="default: settings.upload_dir")
+    parser.add_argument("--batch-size", type=int, default=500, help="VBUs per COPY batch")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
@@ -1,16 +1,40 @@
+import asyncio
+import hashlib
 import os
 import uuid
 import re
+import time
 from pathlib import Path
 from typing import Optional
+from urllib.parse import quote
 from uuid import UUID
 from fastapi import UploadFile, HTTPException
-from fastapi.responses import FileResponse
-from sqlalchemy import select
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from canvas.models.attachment import Attachment
 from canvas.config import Settings
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+SWEEP_BATCH_SIZE = 500
+BLOB_NAME = re.compile(r"[0-9a-f]{64}")
+
+
+def _content_disposition(filename: str) -> str:
+    """Same attachment header FileResponse builds, for responses nginx completes"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _modified_before(path: Path, cutoff: float) -> bool:
+    try:
+        return path.is_file() and path.stat().st_mtime < cutoff
+    except FileNotFoundError:
+        return False
+
 
 class AttachmentService:
     """File attachment service with validation and storage"""
@@ -18,6 +42,8 @@ class AttachmentService:
     def __init__(self, settings: Settings):
         self.upload_dir = Path(settings.upload_dir)
         self.max_size_bytes = settings.max_upload_size_mb * 1024 * 1024
+        accel_prefix = settings.attachment_accel_redirect_prefix
+        self.accel_redirect_prefix = accel_prefix.rstrip("/") + "/" if accel_prefix else ""
         self.allowed_types = {
             "image/png", "image/jpeg", "image/gif",
             "application/pdf", "text/csv",
@@ -27,26 +53,37 @@ class AttachmentService:
         }
     
     async def upload(self, file: UploadFile, vbu_id: Optional[UUID], entity_type: str, entity_id: Optional[UUID], uploaded_by: UUID, db: AsyncSession, label: Optional[str] = None) -> Attachment:
-        """Upload file with validation and storage"""
+        """Upload file with validation and content-addressed storage.
+        
+        Bytes are stored once per SHA-256 under blobs/; every Attachment row with
+        that digest references the same blob.
+        """
         self._validate_file(file)
         
         # Sanitize filename to prevent path traversal
         safe_filename = self._sanitize_filename(file.filename)
-        storage_subdir = str(vbu_id) if vbu_id else "standalone"
-        storage_path = self._generate_storage_path(storage_subdir, entity_type, safe_filename)
-        await self._save_file(file, storage_path)
+        staging_path = self.upload_dir / "incoming" / str(uuid.uuid4())
+        await asyncio.to_thread(staging_path.parent.mkdir, parents=True, exist_ok=True)
+        size_bytes, sha256 = await self._save_file(file, staging_path)
         
         # Determine which field to set based on entity_type
         proof_point_id = entity_id if entity_type == "proof_point" else None
         monthly_review_id = entity_id if entity_type == "monthly_review" else None
         
+        try:
+            await self._lock_blob(sha256, db)
+            blob_path = await asyncio.to_thread(self._store_blob, staging_path, sha256)
+        finally:
+            await asyncio.to_thread(staging_path.unlink, missing_ok=True)
+        
         attachment = Attachment(
             proof_point_id=proof_point_id,
             monthly_review_id=monthly_review_id,
             filename=safe_filename,
-            storage_path=str(storage_path),
+            storage_path=str(blob_path),
             content_type=file.content_type,
-            size_bytes=file.size,
+            size_bytes=size_bytes,
+            sha256=sha256,
             label=label,
             uploaded_by=uploaded_by
         )
@@ -57,48 +94,121 @@ class AttachmentService:
         
         return attachment
     
-    async def download(self, attachment_id: UUID, db: AsyncSession) -> FileResponse:
-        """Download file with authorization check"""
+    async def download(self, attachment_id: UUID, db: AsyncSession, sha256: Optional[str] = None) -> Response:
+        """Download file with authorization check.
+        
+        When sha256 is given (the immutable blob URL) it must match the
+        attachment's digest, and the response is cacheable indefinitely.
+        """
         result = await db.execute(select(Attachment).where(Attachment.id == attachment_id))
-        attachment = result.scalar_one_or_none()
+        return self.file_response(result.scalar_one_or_none(), sha256)
+    
+    def file_response(self, attachment, sha256: Optional[str] = None) -> Response:
+        """Response serving an attachment's bytes.
         
-        if not attachment:
+        attachment is an Attachment or any row with filename, storage_path,
+        content_type and sha256. With accel_redirect_prefix configured the body
+        is left to nginx (sendfile, Range requests), and only headers are sent.
+        """
+        if not attachment or (sha256 is not None and attachment.sha256 != sha256):
             raise HTTPException(status_code=404, detail="Attachment not found")
         
+        headers = {}
+        if sha256 is not None:
+            headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{sha256}"'}
+        
         storage_path = Path(attachment.storage_path)
+        if self.accel_redirect_prefix and storage_path.is_relative_to(self.upload_dir):
+            relative = storage_path.relative_to(self.upload_dir).as_posix()
+            headers["X-Accel-Redirect"] = self.accel_redirect_prefix + quote(relative)
+            headers["Content-Disposition"] = _content_disposition(attachment.filename)
+            return Response(media_type=attachment.content_type, headers=headers)
+        
         if not storage_path.exists():
             raise HTTPException(status_code=404, detail="File not found on disk")
         
         return FileResponse(
             path=str(storage_path),
             media_type=attachment.content_type,
-            filename=attachment.filename
+            filename=attachment.filename,
+            headers=headers or None
         )
     
     async def delete(self, attachment_id: UUID, db: AsyncSession) -> None:
-        """Delete file from storage and database"""
+        """Delete attachment record, and its blob once no other attachment references it"""
         result = await db.execute(select(Attachment).where(Attachment.id == attachment_id))
         attachment = result.scalar_one_or_none()
         
         if not attachment:
             raise HTTPException(status_code=404, detail="Attachment not found")
         
-        # Delete file from filesystem
         storage_path = Path(attachment.storage_path)
-        if storage_path.exists():
-            storage_path.unlink()
+        orphaned = True
+        if attachment.sha256:
+            await self._lock_blob(attachment.sha256, db)
+            remaining = await db.scalar(
+                select(func.count()).select_from(Attachment).where(
+                    Attachment.storage_path == attachment.storage_path,
+                    Attachment.id != attachment.id
+                )
+            )
+            orphaned = remaining == 0
         
-        # Delete database record
-        await db.delete(attachment)
-        await db.commit()
+        # Park the orphaned blob until the row delete commits, so a failed
+        # commit can put it back
+        parked_path = storage_path.with_name(storage_path.name + ".deleting")
+        parked = orphaned and await asyncio.to_thread(self._park, storage_path, parked_path)
+        
+        try:
+            await db.delete(attachment)
+            await db.commit()
+        except BaseException:
+            if parked:
+                await asyncio.to_thread(os.replace, parked_path, storage_path)
+            raise
+        
+        if parked:
+            await asyncio.to_thread(parked_path.unlink, missing_ok=True)
+    
+    async def sweep_orphaned_blobs(self, db: AsyncSession, grace_seconds: float = 3600, dry_run: bool = False) -> dict:
+        """Remove blobs no attachment references, and stale staging or parked files.
+        
+        Database cascades (deleting a proof point, thesis, review or VBU, or a
+        batch delete) remove attachment rows without visiting their blobs, so
+        this runs periodically via python -m canvas.sweep_blobs. Each candidate
+        is rechecked under its digest's advisory lock, so an upload of the same
+        bytes that is placing the blob right now keeps it.
+        """
+        cutoff = time.time() - grace_seconds
+        digests, stale = await asyncio.to_thread(self._scan_blob_store, cutoff)
+        removed = 0
+        for start in range(0, len(digests), SWEEP_BATCH_SIZE):
+            batch = digests[start:start + SWEEP_BATCH_SIZE]
+            referenced = set((await db.execute(
+                select(Attachment.sha256).where(Attachment.sha256.in_(batch)).distinct()
+            )).scalars())
+            await db.commit()
+            for sha256 in batch:
+                if sha256 in referenced:
+                    continue
+                await self._lock_blob(sha256, db)
+                references = await db.scalar(
+                    select(func.count()).select_from(Attachment).where(Attachment.sha256 == sha256)
+                )
+                if references == 0:
+                    if not dry_run:
+                        await asyncio.to_thread(self._blob_path(sha256).unlink, missing_ok=True)
+                    removed += 1
+                await db.commit()
+        if not dry_run:
+            for path in stale:
+                await asyncio.to_thread(path.unlink, missing_ok=True)
+        return {"blobs_removed": removed, "blobs_kept": len(digests) - removed, "stale_files_removed": len(stale)}
     
     def _validate_file(self, file: UploadFile) -> None:
-        """Validate file size and content type"""
-        if file.size > self.max_size_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail={"code": "FILE_TOO_LARGE", "message": f"File size exceeds {self.max_size_bytes // (1024*1024)}MB limit"}
-            )
+        """Validate declared file size and content type (size is re-checked while streaming)"""
+        if file.size is not None and file.size > self.max_size_bytes:
+            raise self._too_large()
         
         if file.content_type not in self.allowed_types:
             raise HTTPException(
@@ -106,6 +216,12 @@ class AttachmentService:
                 detail={"code": "UNSUPPORTED_TYPE", "message": f"Content type {file.content_type} not allowed"}
             )
     
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail={"code": "FILE_TOO_LARGE", "message": f"File size exceeds {self.max_size_bytes // (1024*1024)}MB limit"}
+        )
+    
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename to prevent path traversal attacks"""
         if not filename:
@@ -122,28 +238,76 @@ class AttachmentService:
         
         return safe_name
     
-    def _generate_storage_path(self, vbu_id: str, entity_type: str, filename: str) -> Path:
-        """Generate storage path: /uploads/{vbu_id}/{entity_type}/{uuid}.{ext}"""
-        file_uuid = uuid.uuid4()
-        file_ext = Path(filename).suffix
-        storage_filename = f"{file_uuid}{file_ext}"
-        
-        storage_path = self.upload_dir / str(vbu_id) / entity_type / storage_filename
-        storage_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        return storage_path
+    def _blob_path(self, sha256: str) -> Path:
+        """Content-addressed path: /uploads/blobs/{sha[:2]}/{sha[2:4]}/{sha}"""
+        return self.upload_dir / "blobs" / sha256[:2] / sha256[2:4] / sha256
     
-    async def _save_file(self, file: UploadFile, storage_path: Path) -> None:
-        """Save uploaded file to disk atomically"""
+    def _store_blob(self, staging_path: Path, sha256: str) -> Path:
+        """Move staged bytes into the blob store unless an identical blob already exists"""
+        blob_path = self._blob_path(sha256)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staging_path, blob_path)
+        return blob_path
+    
+    @staticmethod
+    def _park(storage_path: Path, parked_path: Path) -> bool:
+        if not storage_path.exists():
+            return False
+        os.replace(storage_path, parked_path)
+        return True
+    
+    def _scan_blob_store(self, cutoff: float) -> tuple[list[str], list[Path]]:
+        """Digests of stored blobs, and parked or staged files last modified before cutoff"""
+        digests, stale = [], []
+        blob_root = self.upload_dir / "blobs"
+        for path in blob_root.glob("*/*/*") if blob_root.is_dir() else ():
+            if BLOB_NAME.fullmatch(path.name):
+                digests.append(path.name)
+            elif path.name.endswith(".deleting") and _modified_before(path, cutoff):
+                stale.append(path)
+        incoming = self.upload_dir / "incoming"
+        for path in incoming.iterdir() if incoming.is_dir() else ():
+            if _modified_before(path, cutoff):
+                stale.append(path)
+        return digests, stale
+    
+    async def _lock_blob(self, sha256: str, db: AsyncSession) -> None:
+        """Serialize blob placement and removal for one digest until the transaction ends"""
+        await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(sha256))))
+    
+    async def _save_file(self, file: UploadFile, storage_path: Path) -> tuple[int, str]:
+        """Stream upload to disk atomically in fixed-size chunks.
+        
+        Enforces the size limit on the bytes actually received and returns
+        (size_bytes, sha256 hex digest), both computed in the same pass.
+        File I/O runs in worker threads so the event loop never blocks on disk.
+        """
         temp_path = storage_path.with_suffix(storage_path.suffix + ".tmp")
+        digest = hashlib.sha256()
+        size_bytes = 0
         
         try:
-            with open(temp_path, "wb") as temp_file:
-                content = await file.read()
-                temp_file.write(content)
+            temp_file = await asyncio.to_thread(open, temp_path, "wb")
+            try:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    size_bytes += len(chunk)
+                    if size_bytes > self.max_size_bytes:
+                        raise self._too_large()
+                    await asyncio.to_thread(self._write_chunk, temp_file, digest, chunk)
+            finally:
+                await asyncio.to_thread(temp_file.close)
             
-            temp_path.rename(storage_path)
-        except Exception:
+            await asyncio.to_thread(os.replace, temp_path, storage_path)
+        except BaseException:
             if temp_path.exists():
                 temp_path.unlink()
-            raise
\ No newline at end of file
+            raise
+        
+        return size_bytes, digest.hexdigest()
+    
+    @staticmethod
+    def _write_chunk(temp_file, digest, chunk: bytes) -> None:
+        # hashlib releases the GIL on large buffers, so hash alongside the write
+        digest.update(chunk)
+        temp_file.write(chunk)
\ No newline at end of file
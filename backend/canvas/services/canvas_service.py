@@ -3,19 +3,171 @@
 # Each service should handle only its domain entity and related operations
 # This is functional code that works correctly but should be refactored for maintainability
 
+import base64
+import binascii
+import json
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import select, update, delete, text
+from sqlalchemy import select, update, delete, insert, text, func, tuple_, cast, column, values
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from canvas.models.user import User, UserRole
+from canvas.auth.ownership import authorize
 from canvas.models.vbu import VBU
 from canvas.models.canvas import Canvas, LifecycleLane
 from canvas.models.thesis import Thesis
 from canvas.models.proof_point import ProofPoint, ProofPointStatus
+from canvas.portfolio.summary import refresh_scoped_summaries
+from canvas.ordering import lock_parent, renumber
+from canvas.ranking import MAX_RANK_LENGTH, rank_between, rank_for_position, renumbered, rerank
+
+# Read access to VBU v for the bound user, evaluated inside the statement
+_VBU_ACL_SQL = """
+    CROSS JOIN LATERAL (
+        SELECT COALESCE(CASE CAST(:role AS text)
+            WHEN 'admin' THEN true
+            WHEN 'gm' THEN v.gm_id = :user_id
+            WHEN 'group_leader' THEN v.group_leader_id = :user_id
+            WHEN 'viewer' THEN v.id = :user_vbu_id
+        END, false) AS allowed
+    ) acl
+"""
+
+# Builds the full nested canvas document (theses -> proof points -> attachments)
+# in a single round trip. The access check is evaluated in the same statement
+# and the document is only built when it passes.
+CANVAS_DOCUMENT_SQL = text("""
+    SELECT acl.allowed, c.id IS NOT NULL AS has_canvas, doc.body
+    FROM vbus v
+    LEFT JOIN canvases c ON c.vbu_id = v.id
+    {acl}
+    LEFT JOIN LATERAL (
+        SELECT json_build_object(
+            'id', c.id,
+            'vbu_id', c.vbu_id,
+            'product_name', c.product_name,
+            'lifecycle_lane', c.lifecycle_lane,
+            'success_description', c.success_description,
+            'future_state_intent', c.future_state_intent,
+            'primary_focus', c.primary_focus,
+            'resist_doing', c.resist_doing,
+            'good_discipline', c.good_discipline,
+            'primary_constraint', c.primary_constraint,
+            'currently_testing_type', c.currently_testing_type,
+            'currently_testing_id', c.currently_testing_id,
+            'portfolio_notes', CASE WHEN CAST(:include_notes AS boolean) THEN c.portfolio_notes END,
+            'health_indicator', c.health_indicator_cache,
+            'theses', COALESCE((
+                SELECT json_agg(json_build_object(
+                    'id', t.id,
+                    'order', t.position,
+                    'text', t.text,
+                    'description', t.description,
+                    'category_id', t.category_id,
+                    'category_name', tc.name,
+                    'category_color', tc.color,
+                    'proof_points', COALESCE((
+                        SELECT json_agg(json_build_object(
+                            'id', pp.id,
+                            'description', pp.description,
+                            'notes', pp.notes,
+                            'status', pp.status,
+                            'evidence_note', pp.evidence_note,
+                            'target_review_month', pp.target_review_month,
+                            'attachments', COALESCE((
+                                SELECT json_agg(json_build_object(
+                                    'id', a.id,
+                                    'filename', a.filename,
+                                    'content_type', a.content_type,
+                                    'size_bytes', a.size_bytes,
+                                    'label', a.label,
+                                    'uploaded_by', a.uploaded_by,
+                                    'created_at', a.created_at,
+                                    'download_url', CASE WHEN a.sha256 IS NOT NULL
+                                        THEN '/api/attachments/' || a.id || '/blob/' || a.sha256 END
+                                ) ORDER BY a.created_at)
+                                FROM attachments a
+                                WHERE a.proof_point_id = pp.id
+                            ), '[]'::json),
+                            'created_at', pp.created_at,
+                            'updated_at', pp.updated_at
+                        ) ORDER BY pp.rank)
+                        FROM proof_points pp
+                        WHERE pp.thesis_id = t.id
+                    ), '[]'::json),
+                    'created_at', t.created_at,
+                    'updated_at', t.updated_at
+                ) ORDER BY t.rank)
+                FROM (
+                    SELECT th.*, row_number() OVER (ORDER BY th.rank) AS position
+                    FROM theses th WHERE th.canvas_id = c.id
+                ) t
+                LEFT JOIN thesis_categories tc ON tc.id = t.category_id
+            ), '[]'::json),
+            'created_at', c.created_at,
+            'updated_at', c.updated_at,
+            'updated_by', c.updated_by
+        )::text AS body
+        WHERE acl.allowed AND c.id IS NOT NULL
+    ) doc ON true
+    WHERE v.id = :vbu_id
+""".format(acl=_VBU_ACL_SQL))
+
+# Cheap change probe for the canvas tree: counts and latest timestamps of every
+# table the document is built from. Deletes change a count, edits a timestamp.
+CANVAS_VERSION_SQL = text("""
+    SELECT acl.allowed, c.id IS NOT NULL AS has_canvas, ver.version
+    FROM vbus v
+    LEFT JOIN canvases c ON c.vbu_id = v.id
+    {acl}
+    LEFT JOIN LATERAL (
+        SELECT concat_ws(':', c.updated_at, c.health_computed_at,
+                         th.n, th.latest, pp.n, pp.latest, att.n, att.latest, cat.latest) AS version
+        FROM (SELECT count(*) AS n, max(t.updated_at) AS latest
+              FROM theses t WHERE t.canvas_id = c.id) th,
+             (SELECT count(*) AS n, max(p.updated_at) AS latest
+              FROM proof_points p JOIN theses t ON t.id = p.thesis_id
+              WHERE t.canvas_id = c.id) pp,
+             (SELECT count(*) AS n, max(a.updated_at) AS latest
+              FROM attachments a JOIN proof_points p ON p.id = a.proof_point_id
+              JOIN theses t ON t.id = p.thesis_id
+              WHERE t.canvas_id = c.id) att,
+             (SELECT max(tc.updated_at) AS latest
+              FROM thesis_categories tc JOIN theses t ON t.category_id = tc.id
+              WHERE t.canvas_id = c.id) cat
+        WHERE acl.allowed AND c.id IS NOT NULL
+    ) ver ON true
+    WHERE v.id = :vbu_id
+""".format(acl=_VBU_ACL_SQL))
+
+
+
+def _parse_review_month(value: Optional[str]):
+    """Convert a 'YYYY-MM' review month to the first day of that month"""
+    if not value:
+        return None
+    year, month = value.split('-')
+    return datetime(int(year), int(month), 1).date()
+
+
+def encode_vbu_cursor(vbu: VBU) -> str:
+    """Encode the (name, id) seek key of a VBU as an opaque cursor"""
+    raw = json.dumps([vbu.name, str(vbu.id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_vbu_cursor(cursor: str) -> tuple[str, UUID]:
+    """Decode an opaque VBU cursor back into its (name, id) seek key"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, vbu_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(name), UUID(vbu_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor")
+
 
 class CanvasService:
     async def create_vbu(self, name: str, gm_id: UUID, created_by: UUID, db: AsyncSession) -> VBU:
@@ -79,8 +231,6 @@ class CanvasService:
 
     async def list_vbus_paginated(self, current_user: User, page: int, per_page: int, db: AsyncSession) -> tuple[List[VBU], int]:
         """List VBUs with pagination and role-based filtering"""
-        from sqlalchemy import func
-        
         # Build query with role-based filtering
         query = select(VBU).options(selectinload(VBU.gm))
         count_query = select(func.count(VBU.id))
@@ -108,6 +258,44 @@ class CanvasService:
         
         return vbus, total
 
+    async def list_vbus_keyset(self, current_user: User, cursor: Optional[str], per_page: int, count: str, db: AsyncSession) -> tuple[List[VBU], Optional[str], Optional[int]]:
+        """List VBUs by (name, id) seek key without an OFFSET scan.
+
+        count is "none" (skip counting), "exact" (COUNT query) or "estimate"
+        (planner row estimate for the unfiltered admin view, exact otherwise).
+        """
+        query = select(VBU).options(selectinload(VBU.gm))
+        conditions = []
+        if current_user.role == UserRole.GM:
+            conditions.append(VBU.gm_id == current_user.id)
+        elif current_user.role == UserRole.GROUP_LEADER:
+            conditions.append(VBU.group_leader_id == current_user.id)
+        elif current_user.role == UserRole.VIEWER and current_user.vbu_id:
+            conditions.append(VBU.id == current_user.vbu_id)
+
+        total = None
+        if count == "estimate" and not conditions:
+            result = await db.execute(text("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = 'vbus'::regclass"))
+            total = result.scalar()
+        elif count in ("exact", "estimate"):
+            result = await db.execute(select(func.count(VBU.id)).where(*conditions))
+            total = result.scalar()
+
+        if cursor:
+            name, vbu_id = decode_vbu_cursor(cursor)
+            conditions.append(tuple_(VBU.name, VBU.id) > tuple_(name, vbu_id))
+
+        result = await db.execute(
+            query.where(*conditions).order_by(VBU.name, VBU.id).limit(per_page + 1)
+        )
+        vbus = list(result.scalars().all())
+
+        next_cursor = None
+        if len(vbus) > per_page:
+            vbus = vbus[:per_page]
+            next_cursor = encode_vbu_cursor(vbus[-1])
+        return vbus, next_cursor, total
+
     async def get_canvas_by_vbu(self, vbu_id: UUID, db: AsyncSession) -> Canvas:
         """Get canvas with nested theses and proof points"""
         result = await db.execute(
@@ -122,6 +310,38 @@ class CanvasService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Canvas not found")
         return canvas
 
+    def _canvas_read_params(self, vbu_id: UUID, current_user: User) -> Dict[str, Any]:
+        return {
+            "vbu_id": vbu_id,
+            "role": current_user.role.value,
+            "user_id": current_user.id,
+            "user_vbu_id": current_user.vbu_id,
+        }
+
+    def _check_canvas_read_row(self, row) -> None:
+        if not row:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="VBU not found")
+        if not row.allowed:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+        if not row.has_canvas:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Canvas not found")
+
+    async def get_canvas_document(self, vbu_id: UUID, current_user: User, db: AsyncSession) -> str:
+        """Get the nested canvas document as a JSON string, built and authorized in one query"""
+        params = self._canvas_read_params(vbu_id, current_user)
+        params["include_notes"] = current_user.role in (UserRole.ADMIN, UserRole.GROUP_LEADER)
+        result = await db.execute(CANVAS_DOCUMENT_SQL, params)
+        row = result.one_or_none()
+        self._check_canvas_read_row(row)
+        return row.body
+
+    async def get_canvas_version(self, vbu_id: UUID, current_user: User, db: AsyncSession) -> str:
+        """Get a version string that changes whenever the canvas document would"""
+        result = await db.execute(CANVAS_VERSION_SQL, self._canvas_read_params(vbu_id, current_user))
+        row = result.one_or_none()
+        self._check_canvas_read_row(row)
+        return row.version
+
     async def update_canvas(self, vbu_id: UUID, canvas_data: Dict[str, Any], updated_by: UUID, db: AsyncSession) -> Canvas:
         """Update canvas fields"""
         result = await db.execute(select(Canvas).where(Canvas.vbu_id == vbu_id))
@@ -142,20 +362,22 @@ class CanvasService:
         return canvas
 
     async def create_thesis(self, canvas_id: UUID, text: str, order: int | None, db: AsyncSession, description: str | None = None, category_id: UUID | None = None) -> Thesis:
-        """Create thesis with order validation"""
-        result = await db.execute(select(Thesis).where(Thesis.canvas_id == canvas_id))
-        existing = list(result.scalars().all())
-        if len(existing) >= 5:
+        """Create thesis at the end of the canvas' list.
+
+        Positions are dense, so a requested order is either the next slot or
+        already taken; either way the thesis is appended, as before. The
+        canvas row is locked before counting, so concurrent creates queue up
+        behind each other instead of both passing the 5-thesis check.
+        """
+        await db.execute(lock_parent(Thesis, canvas_id))
+        result = await db.execute(select(func.count()).select_from(Thesis).where(Thesis.canvas_id == canvas_id))
+        if result.scalar_one() >= 5:
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Maximum 5 theses per canvas")
         
-        # Auto-assign next order if not provided or conflicts
-        if order is None or any(t.order == order for t in existing):
-            order = max((t.order for t in existing), default=0) + 1
-        
-        thesis = Thesis(canvas_id=canvas_id, text=text.strip(), order=order, description=description, category_id=category_id)
+        thesis = Thesis(canvas_id=canvas_id, text=text.strip(), description=description, category_id=category_id)
         db.add(thesis)
         await db.commit()
-        await db.refresh(thesis, attribute_names=["category"])
+        await db.refresh(thesis, attribute_names=["category", "order"])
         return thesis
 
     async def update_thesis(self, thesis_id: UUID, updates: dict, db: AsyncSession) -> Thesis:
@@ -186,50 +408,107 @@ class CanvasService:
         await db.commit()
 
     async def reorder_theses(self, canvas_id: UUID, thesis_orders: List[Dict[str, Any]], db: AsyncSession) -> List[Thesis]:
-        """Reorder theses — drop and recreate constraint to allow reorder"""
-        if not thesis_orders:
-            result = await db.execute(
-                select(Thesis).where(Thesis.canvas_id == canvas_id)
-                .options(joinedload(Thesis.category))
-                .order_by(Thesis.order)
-            )
-            return list(result.scalars().unique().all())
+        """Reorder theses from {id, order} pairs.
 
-        await db.execute(text("ALTER TABLE theses DROP CONSTRAINT IF EXISTS uq_theses_canvas_order"))
-        for item in thesis_orders:
-            await db.execute(
-                update(Thesis)
-                .where(Thesis.id == item["id"])
-                .values(order=item["order"])
-            )
-        await db.execute(text(
-            'ALTER TABLE theses ADD CONSTRAINT uq_theses_canvas_order UNIQUE (canvas_id, "order") DEFERRABLE INITIALLY IMMEDIATE'
-        ))
-        await db.commit()
-        db.expire_all()
+        Unlisted theses keep their relative order in the remaining slots. Only
+        theses outside the longest already-ordered run get a new rank, so a
+        single drag rewrites one row.
+        """
+        if thesis_orders:
+            await db.execute(lock_parent(Thesis, canvas_id))
+            current = (await db.execute(
+                select(Thesis.id, Thesis.rank).where(Thesis.canvas_id == canvas_id).order_by(Thesis.rank)
+            )).all()
+            desired = self._desired_order([row.id for row in current], thesis_orders)
+            changes = rerank(current, desired)
+            if any(len(rank) > MAX_RANK_LENGTH for rank in changes.values()):
+                for stmt in renumber(Thesis, renumbered(desired)):
+                    await db.execute(stmt)
+            else:
+                for thesis_id, rank in changes.items():
+                    await db.execute(update(Thesis).where(Thesis.id == thesis_id).values(rank=rank))
+            await db.commit()
+            db.expire_all()
 
         result = await db.execute(
             select(Thesis)
             .where(Thesis.canvas_id == canvas_id)
             .options(joinedload(Thesis.category))
-            .order_by(Thesis.order)
+            .order_by(Thesis.rank)
         )
         return list(result.scalars().unique().all())
 
+    def _desired_order(self, current_ids: List[UUID], thesis_orders: List[Dict[str, Any]]) -> List[UUID]:
+        """Resolve {id, order} pairs against the current list into a full new order"""
+        slots: List[Optional[UUID]] = [None] * len(current_ids)
+        for item in thesis_orders:
+            try:
+                thesis_id, order = UUID(str(item["id"])), int(item["order"])
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Each entry needs an id and an integer order")
+            if thesis_id not in current_ids:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thesis not found")
+            if not 1 <= order <= len(current_ids) or slots[order - 1] is not None or thesis_id in slots:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Order values must be distinct and between 1 and {len(current_ids)}")
+            slots[order - 1] = thesis_id
+        rest = iter(thesis_id for thesis_id in current_ids if thesis_id not in slots)
+        return [slot if slot is not None else next(rest) for slot in slots]
+
+    async def move_thesis(self, thesis_id: UUID, after_id: Optional[UUID], db: AsyncSession) -> Thesis:
+        """Move thesis directly after after_id (None = first) by rewriting its rank only"""
+        thesis = await self._move_ranked(Thesis, Thesis.canvas_id, thesis_id, after_id, "Thesis not found", db)
+        await db.refresh(thesis, attribute_names=["category", "order"])
+        return thesis
+
+    async def move_proof_point(self, proof_point_id: UUID, after_id: Optional[UUID], db: AsyncSession) -> ProofPoint:
+        """Move proof point directly after after_id (None = first) within its thesis"""
+        return await self._move_ranked(ProofPoint, ProofPoint.thesis_id, proof_point_id, after_id, "Proof point not found", db)
+
+    async def _move_ranked(self, model, parent_col, row_id: UUID, after_id: Optional[UUID], not_found: str, db: AsyncSession):
+        """Give one row a rank between its new neighbours.
+
+        Siblings are untouched unless that key would pass MAX_RANK_LENGTH; then
+        the whole list is renumbered in the same transaction.
+        """
+        row = (await db.execute(select(model).where(model.id == row_id))).scalar_one_or_none()
+        if not row:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        if after_id == row_id:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Cannot move an item after itself")
+        
+        await db.execute(lock_parent(model, getattr(row, parent_col.key)))
+        siblings = (await db.execute(
+            select(model.id, model.rank)
+            .where(parent_col == getattr(row, parent_col.key), model.id != row_id)
+            .order_by(model.rank)
+        )).all()
+        ids = [s.id for s in siblings]
+        if after_id is not None and after_id not in ids:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="after_id must be a sibling")
+        index = ids.index(after_id) + 1 if after_id is not None else 0
+        lo = siblings[index - 1].rank if index > 0 else None
+        hi = siblings[index].rank if index < len(siblings) else None
+        
+        if not ((lo is None or lo < row.rank) and (hi is None or row.rank < hi)):
+            rank = rank_between(lo, hi)
+            if len(rank) > MAX_RANK_LENGTH:
+                for stmt in renumber(model, renumbered(ids[:index] + [row_id] + ids[index:])):
+                    await db.execute(stmt)
+            else:
+                row.rank = rank
+            await db.commit()
+            await db.refresh(row)
+        return row
+
     async def create_proof_point(self, thesis_id: UUID, description: str, status: str, evidence_note: Optional[str], target_review_month: Optional[str], db: AsyncSession, notes: Optional[str] = None) -> ProofPoint:
         """Create proof point"""
-        target_date = None
-        if target_review_month:
-            year, month = target_review_month.split('-')
-            target_date = datetime(int(year), int(month), 1).date()
-        
         proof_point = ProofPoint(
             thesis_id=thesis_id,
             description=description.strip(),
             notes=notes,
             status=ProofPointStatus(status),
             evidence_note=evidence_note,
-            target_review_month=target_date
+            target_review_month=_parse_review_month(target_review_month)
         )
         db.add(proof_point)
         await db.commit()
@@ -252,17 +531,106 @@ class CanvasService:
         if 'evidence_note' in updates:
             proof_point.evidence_note = updates['evidence_note']
         if 'target_review_month' in updates:
-            trm = updates['target_review_month']
-            if trm:
-                year, month = trm.split('-')
-                proof_point.target_review_month = datetime(int(year), int(month), 1).date()
-            else:
-                proof_point.target_review_month = None
+            proof_point.target_review_month = _parse_review_month(updates['target_review_month'])
         
         await db.commit()
         await db.refresh(proof_point)
         return proof_point
 
+    async def apply_proof_point_batch(self, thesis_id: UUID, creates: List[dict], updates: List[dict], deletes: List[UUID], db: AsyncSession) -> Dict[str, Any]:
+        """Apply creates, updates and deletes to a thesis' proof points in one transaction.
+
+        Each kind is a single statement: one DELETE, one UPDATE ... FROM (VALUES)
+        RETURNING per distinct set of updated fields, and one multi-row
+        INSERT ... RETURNING. Update and delete ids must belong to the thesis.
+        """
+        target_ids = [u['id'] for u in updates] + list(deletes)
+        if len(set(target_ids)) != len(target_ids):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Proof point listed more than once")
+        if target_ids:
+            found = set((await db.execute(
+                select(ProofPoint.id).where(ProofPoint.id.in_(target_ids), ProofPoint.thesis_id == thesis_id)
+            )).scalars())
+            if len(found) != len(target_ids):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof point not found")
+
+        if deletes:
+            await db.execute(delete(ProofPoint).where(ProofPoint.id.in_(deletes)))
+
+        updated: List[ProofPoint] = []
+        groups: Dict[tuple, List[dict]] = {}
+        for row in updates:
+            row = self._proof_point_update_values(row)
+            fields = tuple(sorted(k for k in row if k != 'id'))
+            if fields:
+                groups.setdefault(fields, []).append(row)
+        for fields, rows in groups.items():
+            columns = ProofPoint.__table__.c
+            data = values(
+                column('id', columns.id.type), *[column(f, columns[f].type) for f in fields], name='data'
+            ).data([(row['id'], *[row[f] for f in fields]) for row in rows])
+            # Cast in SET too: an all-NULL VALUES column would otherwise resolve to text
+            stmt = (
+                update(ProofPoint)
+                .where(ProofPoint.id == data.c.id)
+                .values({f: cast(data.c[f], columns[f].type) for f in fields})
+                .returning(ProofPoint)
+                .execution_options(synchronize_session=False)
+            )
+            updated.extend((await db.scalars(stmt)).all())
+
+        created: List[ProofPoint] = []
+        if creates:
+            # Core INSERT skips the flush hook that assigns append ranks (and locks the thesis)
+            await db.execute(lock_parent(ProofPoint, thesis_id))
+            rank = (await db.execute(
+                select(func.max(ProofPoint.rank)).where(ProofPoint.thesis_id == thesis_id)
+            )).scalar_one()
+            ranks = []
+            for _ in creates:
+                rank = rank_between(rank, None)
+                ranks.append(rank)
+            if len(rank) > MAX_RANK_LENGTH:
+                existing = (await db.execute(
+                    select(ProofPoint.id).where(ProofPoint.thesis_id == thesis_id).order_by(ProofPoint.rank)
+                )).scalars().all()
+                if existing:
+                    for stmt in renumber(ProofPoint, renumbered(existing)):
+                        await db.execute(stmt)
+                ranks = [rank_for_position(len(existing) + i) for i in range(1, len(creates) + 1)]
+            stmt = insert(ProofPoint).returning(ProofPoint, sort_by_parameter_order=True)
+            created = list((await db.scalars(stmt, [
+                {
+                    'thesis_id': thesis_id,
+                    'rank': rank,
+                    'description': c['description'].strip(),
+                    'notes': c.get('notes'),
+                    'status': ProofPointStatus(c.get('status', ProofPointStatus.NOT_STARTED)),
+                    'evidence_note': c.get('evidence_note'),
+                    'target_review_month': _parse_review_month(c.get('target_review_month')),
+                }
+                for c, rank in zip(creates, ranks)
+            ])).all())
+
+        # Core statements bypass the flush hook that maintains portfolio summaries
+        await refresh_scoped_summaries(db, thesis_ids=[thesis_id])
+        await db.commit()
+        return {"created": created, "updated": updated, "deleted": list(deletes)}
+
+    def _proof_point_update_values(self, row: dict) -> dict:
+        """Normalize one batch update to column values, mirroring update_proof_point"""
+        out = {'id': row['id']}
+        if row.get('description') and row['description'].strip():
+            out['description'] = row['description'].strip()
+        for key in ('notes', 'evidence_note'):
+            if key in row:
+                out[key] = row[key]
+        if row.get('status') is not None:
+            out['status'] = ProofPointStatus(row['status'])
+        if 'target_review_month' in row:
+            out['target_review_month'] = _parse_review_month(row['target_review_month'])
+        return out
+
     async def delete_proof_point(self, proof_point_id: UUID, db: AsyncSession) -> None:
         """Delete proof point and cascade to attachments"""
         result = await db.execute(select(ProofPoint).where(ProofPoint.id == proof_point_id))
@@ -275,30 +643,19 @@ class CanvasService:
 
     async def get_canvas_by_vbu_id_for_auth(self, canvas_id: UUID, current_user: User, db: AsyncSession) -> Canvas:
         """Get canvas with authorization check"""
+        if current_user.role in (UserRole.GM, UserRole.GROUP_LEADER):
+            await authorize(db, current_user, "canvas", canvas_id)
+
         result = await db.execute(
             select(Canvas)
             .options(
                 selectinload(Canvas.theses).selectinload(Thesis.proof_points)
             )
-            .join(VBU, Canvas.vbu_id == VBU.id)
             .where(Canvas.id == canvas_id)
         )
         canvas = result.scalar_one_or_none()
         if not canvas:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Canvas not found")
-        
-        # Authorization check
-        if current_user.role == UserRole.GM:
-            vbu_result = await db.execute(select(VBU).where(VBU.id == canvas.vbu_id))
-            vbu = vbu_result.scalar_one()
-            if vbu.gm_id != current_user.id:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        elif current_user.role == UserRole.GROUP_LEADER:
-            vbu_result = await db.execute(select(VBU).where(VBU.id == canvas.vbu_id))
-            vbu = vbu_result.scalar_one()
-            if vbu.group_leader_id != current_user.id:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        
         return canvas
 
     async def get_theses_by_canvas(self, canvas_id: UUID, db: AsyncSession) -> List[Thesis]:
@@ -306,82 +663,30 @@ class CanvasService:
         result = await db.execute(
             select(Thesis)
             .where(Thesis.canvas_id == canvas_id)
-            .order_by(Thesis.order)
+            .order_by(Thesis.rank)
         )
         return list(result.scalars().all())
 
     async def verify_canvas_ownership(self, canvas_id: UUID, current_user: User, db: AsyncSession) -> None:
         """Verify user can modify canvas"""
-        if current_user.role == UserRole.ADMIN:
-            return
-        
-        result = await db.execute(
-            select(Canvas)
-            .join(VBU, Canvas.vbu_id == VBU.id)
-            .where(Canvas.id == canvas_id)
-        )
-        canvas = result.scalar_one_or_none()
-        if not canvas:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Canvas not found")
-        
-        vbu_result = await db.execute(select(VBU).where(VBU.id == canvas.vbu_id))
-        vbu = vbu_result.scalar_one()
-        if current_user.role == UserRole.GROUP_LEADER:
-            if vbu.group_leader_id != current_user.id:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        elif vbu.gm_id != current_user.id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+        if current_user.role != UserRole.ADMIN:
+            await authorize(db, current_user, "canvas", canvas_id, write=True)
 
     async def verify_thesis_ownership(self, thesis_id: UUID, current_user: User, db: AsyncSession) -> None:
         """Verify user can modify thesis"""
-        if current_user.role == UserRole.ADMIN:
-            return
-        
-        result = await db.execute(
-            select(VBU.gm_id, VBU.group_leader_id)
-            .select_from(Thesis)
-            .join(Canvas, Thesis.canvas_id == Canvas.id)
-            .join(VBU, Canvas.vbu_id == VBU.id)
-            .where(Thesis.id == thesis_id)
-        )
-        row = result.one_or_none()
-        if not row:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thesis not found")
-        
-        if current_user.role == UserRole.GROUP_LEADER:
-            if row.group_leader_id != current_user.id:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        elif row.gm_id != current_user.id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+        if current_user.role != UserRole.ADMIN:
+            await authorize(db, current_user, "thesis", thesis_id, write=True)
 
     async def verify_proof_point_ownership(self, proof_point_id: UUID, current_user: User, db: AsyncSession) -> None:
         """Verify user can modify proof point via thesis→canvas→VBU ownership chain"""
-        if current_user.role == UserRole.ADMIN:
-            return
-
-        result = await db.execute(
-            select(VBU.gm_id, VBU.group_leader_id)
-            .select_from(ProofPoint)
-            .join(Thesis, ProofPoint.thesis_id == Thesis.id)
-            .join(Canvas, Thesis.canvas_id == Canvas.id)
-            .join(VBU, Canvas.vbu_id == VBU.id)
-            .where(ProofPoint.id == proof_point_id)
-        )
-        row = result.one_or_none()
-        if not row:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proof point not found")
-
-        if current_user.role == UserRole.GROUP_LEADER:
-            if row.group_leader_id != current_user.id:
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-        elif row.gm_id != current_user.id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+        if current_user.role != UserRole.ADMIN:
+            await authorize(db, current_user, "proof_point", proof_point_id, write=True)
 
     async def get_proof_points_by_thesis(self, thesis_id: UUID, db: AsyncSession) -> List[ProofPoint]:
-        """Get proof points for a thesis ordered by creation date"""
+        """Get proof points for a thesis in their user-controlled order"""
         result = await db.execute(
             select(ProofPoint)
             .where(ProofPoint.thesis_id == thesis_id)
-            .order_by(ProofPoint.created_at)
+            .order_by(ProofPoint.rank)
         )
         return list(result.scalars().all())
@@ -0,0 +1,35 @@
+"""
+Delete attachment blobs that no attachment row references any more.
+
+Usage: python -m canvas.sweep_blobs [--grace-seconds N] [--dry-run]
+
+Deleting a proof point, thesis, review or VBU cascades to its attachment rows
+in the database but leaves their blobs on disk; run this periodically (cron)
+to reclaim them. Stale upload staging files and blobs parked by an interrupted
+delete are removed once older than --grace-seconds.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from canvas.config import Settings
+from canvas.db import AsyncSessionLocal
+from canvas.services.attachment_service import AttachmentService
+
+async def main(grace_seconds: float, dry_run: bool):
+    """Sweep the blob store, printing what was removed."""
+    try:
+        service = AttachmentService(Settings())
+        async with AsyncSessionLocal() as db:
+            counts = await service.sweep_orphaned_blobs(db, grace_seconds=grace_seconds, dry_run=dry_run)
+        print(json.dumps({"status": "success", "dry_run": dry_run, **counts}))
+    except Exception as e:
+        print(json.dumps({"status": "error", "message": str(e)}))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grace-seconds", type=float, default=3600)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.grace_seconds, args.dry_run))
@@ -136,10 +136,10 @@ class TestAuthRoutesIntegration:
         assert response.status_code in (401, 403)
 
     @pytest.mark.asyncio
-    async def test_rate_limiting_login(self, client: AsyncClient, db: AsyncSession):
+    async def test_rate_limiting_login(self, client: AsyncClient, db: AsyncSession, monkeypatch):
         """Multiple failed login attempts trigger rate limiting."""
-        from canvas.auth.routes import rate_limit_store
-        rate_limit_store.clear()
+        from canvas.ratelimit import MemoryBackend, rate_limiter
+        monkeypatch.setattr(rate_limiter, "backend", MemoryBackend())
         auth_service = AuthService()
         await auth_service.register_user("ratelimit@example.com", "Password1!", "Rate", "viewer", db)
 
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from canvas.auth.hashing import PasswordHasher
+
+
+class TestPasswordHasher:
+    @pytest.mark.asyncio
+    async def test_runs_off_event_loop_thread(self):
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        thread_name = await hasher.run(lambda: threading.current_thread().name)
+        assert thread_name.startswith("bcrypt")
+        assert hasher.metrics()["submitted"] == 1
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_with_503_when_saturated(self):
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        release = threading.Event()
+        blocked = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher.run(lambda: None)
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+        release.set()
+        await asyncio.gather(*blocked)
+        metrics = hasher.metrics()
+        assert metrics["rejected"] == 1 and metrics["in_flight"] == 0
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runs_again_after_shutdown(self):
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        assert await hasher.run(lambda: 1) == 1
+        hasher.shutdown()
+        assert await hasher.run(lambda: 2) == 2
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_keeps_slot_until_hash_finishes(self):
+        hasher = PasswordHasher(workers=1, max_queue=0)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash():
+            started.set()
+            release.wait()
+
+        task = asyncio.ensure_future(hasher.run(slow_hash))
+        await asyncio.to_thread(started.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The thread is still hashing, so the pool is still full
+        assert hasher.metrics()["in_flight"] == 1
+        with pytest.raises(HTTPException):
+            await hasher.run(lambda: None)
+
+        release.set()
+        for _ in range(100):
+            if hasher.metrics()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert hasher.metrics()["in_flight"] == 0
+        hasher.shutdown()
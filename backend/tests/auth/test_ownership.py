@@ -0,0 +1,89 @@
+import uuid
+import pytest
+from fastapi import HTTPException
+from canvas.auth.ownership import Owner, authorize, can_access, resolve_owner
+from canvas.models.attachment import Attachment
+from canvas.models.user import User, UserRole
+
+
+def _user(role, vbu_id=None):
+    return User(id=uuid.uuid4(), email=f"{uuid.uuid4()}@example.com", name="U", role=role, vbu_id=vbu_id)
+
+
+class TestCanAccess:
+    def test_role_rules(self):
+        gm, leader = _user(UserRole.GM), _user(UserRole.GROUP_LEADER)
+        owner = Owner(uuid.uuid4(), uuid.uuid4(), gm.id, leader.id)
+        assert can_access(owner, _user(UserRole.ADMIN), write=True)
+        assert can_access(owner, gm, write=True)
+        assert can_access(owner, leader, write=True)
+        assert not can_access(owner, _user(UserRole.GM))
+        assert not can_access(owner, _user(UserRole.GROUP_LEADER))
+
+    def test_viewer_reads_only_scoped_vbu(self):
+        owner = Owner(uuid.uuid4(), None, uuid.uuid4(), None)
+        viewer = _user(UserRole.VIEWER, vbu_id=owner.vbu_id)
+        assert can_access(owner, viewer)
+        assert not can_access(owner, viewer, write=True)
+        assert not can_access(owner, _user(UserRole.VIEWER, vbu_id=uuid.uuid4()))
+
+
+class TestResolveOwner:
+    @pytest.mark.asyncio
+    async def test_resolves_every_kind_to_the_vbu(self, db_session, sample_vbu, sample_canvas, sample_thesis, sample_proof_point, gm_user):
+        attachment = Attachment(
+            proof_point_id=sample_proof_point.id, filename="a.pdf", storage_path="blobs/x",
+            content_type="application/pdf", size_bytes=1, uploaded_by=gm_user.id,
+        )
+        db_session.add(attachment)
+        await db_session.commit()
+
+        expected = Owner(sample_vbu.id, sample_canvas.id, gm_user.id, sample_vbu.group_leader_id)
+        for kind, entity_id in [
+            ("vbu", sample_vbu.id),
+            ("canvas", sample_canvas.id),
+            ("thesis", sample_thesis.id),
+            ("proof_point", sample_proof_point.id),
+            ("attachment", attachment.id),
+        ]:
+            db_session.info.clear()
+            assert await resolve_owner(db_session, kind, entity_id) == expected
+
+    @pytest.mark.asyncio
+    async def test_memoizes_entity_and_ancestors(self, db_session, sample_vbu, sample_canvas, sample_thesis, monkeypatch):
+        db_session.info.clear()
+        owner = await resolve_owner(db_session, "thesis", sample_thesis.id)
+
+        async def no_query(*args, **kwargs):
+            raise AssertionError("memoized lookup hit the database")
+
+        monkeypatch.setattr(db_session, "execute", no_query)
+        assert await resolve_owner(db_session, "thesis", sample_thesis.id) == owner
+        assert await resolve_owner(db_session, "canvas", sample_canvas.id) == owner
+        assert await resolve_owner(db_session, "vbu", sample_vbu.id) == owner
+
+    @pytest.mark.asyncio
+    async def test_standalone_attachment_has_no_vbu(self, db_session, gm_user):
+        attachment = Attachment(
+            filename="a.pdf", storage_path="blobs/y", content_type="application/pdf",
+            size_bytes=1, uploaded_by=gm_user.id,
+        )
+        db_session.add(attachment)
+        await db_session.commit()
+        owner = await resolve_owner(db_session, "attachment", attachment.id)
+        assert owner is not None and owner.vbu_id is None
+
+
+class TestAuthorize:
+    @pytest.mark.asyncio
+    async def test_missing_entity_is_404(self, db_session, admin_user):
+        with pytest.raises(HTTPException) as exc_info:
+            await authorize(db_session, admin_user, "proof_point", uuid.uuid4())
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.detail == "Proof point not found"
+
+    @pytest.mark.asyncio
+    async def test_other_gm_is_403(self, db_session, sample_thesis, other_gm_user):
+        with pytest.raises(HTTPException) as exc_info:
+            await authorize(db_session, other_gm_user, "thesis", sample_thesis.id, write=True)
+        assert exc_info.value.status_code == 403
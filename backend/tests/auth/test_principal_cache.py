@@ -0,0 +1,87 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+import pytest
+from canvas.auth.principal_cache import NOTIFY_SQL, InvalidationListener, PrincipalCache
+from canvas.models.user import User, UserRole
+
+
+def _user(**overrides):
+    fields = dict(id=uuid.uuid4(), email="cached@test.com", password_hash="x", name="Cached", role=UserRole.GM)
+    fields.update(overrides)
+    return User(**fields)
+
+
+class TestPrincipalCache:
+    def test_hit_returns_fresh_copy(self):
+        cache = PrincipalCache(max_size=10, ttl_seconds=60)
+        user = _user()
+        cache.put(user)
+        first = cache.get_by_id(user.id)
+        second = cache.get_by_id(user.id)
+        assert first.id == user.id and first.role == UserRole.GM
+        assert first is not user and first is not second
+
+    def test_forwarded_email_lookup_is_case_insensitive(self):
+        cache = PrincipalCache(max_size=10, ttl_seconds=60)
+        user = _user()
+        cache.put(user, email="Cached@Test.com")
+        assert cache.get_by_email("cached@test.com").id == user.id
+
+    def test_entries_expire(self):
+        cache = PrincipalCache(max_size=10, ttl_seconds=5)
+        user = _user()
+        with patch("canvas.auth.principal_cache.time.monotonic", return_value=100.0):
+            cache.put(user)
+        with patch("canvas.auth.principal_cache.time.monotonic", return_value=106.0):
+            assert cache.get_by_id(user.id) is None
+
+    def test_lru_eviction(self):
+        cache = PrincipalCache(max_size=2, ttl_seconds=60)
+        a, b, c = _user(), _user(), _user()
+        cache.put(a)
+        cache.put(b)
+        cache.get_by_id(a.id)
+        cache.put(c)
+        assert cache.get_by_id(a.id) is not None
+        assert cache.get_by_id(b.id) is None
+
+    def test_invalidate_drops_id_and_email_entries(self):
+        cache = PrincipalCache(max_size=10, ttl_seconds=60)
+        user = _user()
+        cache.put(user, email=user.email)
+        cache.invalidate(user.id)
+        assert cache.get_by_id(user.id) is None
+        assert cache.get_by_email(user.email) is None
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = PrincipalCache(max_size=0, ttl_seconds=60)
+        user = _user()
+        cache.put(user)
+        assert cache.get_by_id(user.id) is None
+
+
+class TestInvalidationListener:
+    @pytest.mark.asyncio
+    async def test_announced_invalidation_reaches_other_workers(self, _engine):
+        cache = PrincipalCache(max_size=10, ttl_seconds=60)
+        listener = InvalidationListener(cache, retry_seconds=0.1)
+        listener.start(_engine.url)
+        try:
+            await asyncio.wait_for(listener.subscribed.wait(), 5)
+            user, other = _user(), _user()
+            cache.put(user)
+            cache.put(other)
+
+            async with _engine.connect() as conn:
+                await conn.execute(NOTIFY_SQL, {"user_id": str(user.id)})
+                await conn.commit()
+
+            for _ in range(50):
+                if cache.get_by_id(user.id) is None:
+                    break
+                await asyncio.sleep(0.1)
+            assert cache.get_by_id(user.id) is None
+            assert cache.get_by_id(other.id) is not None
+        finally:
+            await listener.stop()
@@ -45,6 +45,38 @@ class TestUserManagementRoutes:
         assert "data" in data
         assert data["data"]["role"] == "viewer"
 
+    @pytest.mark.asyncio
+    async def test_update_user_role_invalidates_cached_principal(self, authed_client: AsyncClient, client: AsyncClient, gm_user, gm_token, db: AsyncSession):
+        """A cached GM principal picks up a role change on the next request."""
+        gm_headers = {"Authorization": f"Bearer {gm_token}"}
+        response = await client.get("/api/auth/me", headers=gm_headers)
+        assert response.json()["data"]["role"] == "gm"
+
+        await authed_client.patch(f"/api/auth/users/{gm_user.id}", json={"role": "viewer"})
+
+        response = await client.get("/api/auth/me", headers=gm_headers)
+        assert response.json()["data"]["role"] == "viewer"
+
+    @pytest.mark.asyncio
+    async def test_deactivated_user_rejected_immediately(self, authed_client: AsyncClient, client: AsyncClient, viewer_user, viewer_token, db: AsyncSession):
+        """A cached principal is rejected on the request after deactivation."""
+        viewer_headers = {"Authorization": f"Bearer {viewer_token}"}
+        response = await client.get("/api/auth/me", headers=viewer_headers)
+        assert response.status_code == 200
+
+        response = await authed_client.patch(f"/api/auth/users/{viewer_user.id}", json={"is_active": False})
+        assert response.status_code == 200
+        assert response.json()["data"]["is_active"] is False
+
+        response = await client.get("/api/auth/me", headers=viewer_headers)
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_deactivate_self_conflict(self, authed_client: AsyncClient, admin_user, db: AsyncSession):
+        """PATCH /api/auth/users/{id} cannot deactivate the calling admin."""
+        response = await authed_client.patch(f"/api/auth/users/{admin_user.id}", json={"is_active": False})
+        assert response.status_code == 409
+
     @pytest.mark.asyncio
     async def test_update_user_role_non_admin_forbidden(self, client: AsyncClient, gm_token, gm_user, db: AsyncSession):
         """PATCH /api/auth/users/{id} as GM returns 403."""
@@ -171,7 +171,7 @@ class TestAttachmentServiceIntegration:
         attachment_service: AttachmentService, sample_png_file: UploadFile,
         sample_vbu, sample_proof_point
     ):
-        """Test storage path follows expected directory structure."""
+        """Test storage path is the content-addressed blob path."""
         attachment = await attachment_service.upload(
             file=sample_png_file,
             vbu_id=sample_vbu.id,
@@ -181,6 +181,164 @@ class TestAttachmentServiceIntegration:
             db=db_session
         )
 
-        expected_prefix = str(Path(attachment_service.upload_dir) / str(sample_vbu.id) / "proof_point")
-        assert str(attachment.storage_path).startswith(expected_prefix)
-        assert attachment.storage_path.endswith(".png")
+        sha = attachment.sha256
+        assert attachment.storage_path == str(Path(attachment_service.upload_dir) / "blobs" / sha[:2] / sha[2:4] / sha)
+        assert attachment.download_url == f"/api/attachments/{attachment.id}/blob/{sha}"
+
+    @pytest.mark.asyncio
+    async def test_identical_uploads_share_blob_until_last_delete(
+        self, db_session: AsyncSession, sample_user: User,
+        attachment_service: AttachmentService, sample_vbu, sample_proof_point
+    ):
+        """Test duplicate content is stored once and removed with its last reference."""
+        content = b"%PDF-1.4 same deck"
+        first, second = [
+            await attachment_service.upload(
+                file=_make_upload_file(name, content, "application/pdf"),
+                vbu_id=sample_vbu.id,
+                entity_type="proof_point",
+                entity_id=sample_proof_point.id,
+                uploaded_by=sample_user.id,
+                db=db_session
+            )
+            for name in ("a.pdf", "b.pdf")
+        ]
+
+        assert first.storage_path == second.storage_path
+        blob_path = Path(first.storage_path)
+
+        await attachment_service.delete(first.id, db_session)
+        assert blob_path.exists()
+
+        await attachment_service.delete(second.id, db_session)
+        assert not blob_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_sweep_removes_blobs_orphaned_by_cascades(
+        self, db_session: AsyncSession, sample_user: User,
+        attachment_service: AttachmentService, sample_vbu, sample_proof_point, sample_thesis, temp_upload_dir
+    ):
+        """Test blobs left behind by a cascading proof point delete are swept, referenced ones kept."""
+        import os
+        import time
+        from sqlalchemy import delete
+        from canvas.models.proof_point import ProofPoint
+
+        other = ProofPoint(thesis_id=sample_thesis.id, description="Keeps its file")
+        db_session.add(other)
+        await db_session.commit()
+        orphaned, kept = [
+            await attachment_service.upload(
+                file=_make_upload_file(f"{i}.pdf", f"%PDF-1.4 deck {i}".encode(), "application/pdf"),
+                vbu_id=sample_vbu.id,
+                entity_type="proof_point",
+                entity_id=proof_point_id,
+                uploaded_by=sample_user.id,
+                db=db_session
+            )
+            for i, proof_point_id in enumerate((sample_proof_point.id, other.id))
+        ]
+        stale_staging = temp_upload_dir / "incoming" / "abandoned"
+        fresh_staging = temp_upload_dir / "incoming" / "in-flight"
+        stale_staging.write_bytes(b"partial")
+        fresh_staging.write_bytes(b"partial")
+        os.utime(stale_staging, (time.time() - 7200, time.time() - 7200))
+
+        await db_session.execute(delete(ProofPoint).where(ProofPoint.id == sample_proof_point.id))
+        await db_session.commit()
+        assert Path(orphaned.storage_path).exists()
+
+        counts = await attachment_service.sweep_orphaned_blobs(db_session, grace_seconds=3600)
+
+        assert counts == {"blobs_removed": 1, "blobs_kept": 1, "stale_files_removed": 1}
+        assert not Path(orphaned.storage_path).exists()
+        assert Path(kept.storage_path).exists()
+        assert not stale_staging.exists()
+        assert fresh_staging.exists()
+
+    @pytest.mark.asyncio
+    async def test_blob_download_is_immutable(
+        self, db_session: AsyncSession, sample_user: User,
+        attachment_service: AttachmentService, sample_png_file: UploadFile,
+        sample_vbu, sample_proof_point
+    ):
+        """Test hash URL download carries immutable cache headers and rejects a wrong digest."""
+        attachment = await attachment_service.upload(
+            file=sample_png_file,
+            vbu_id=sample_vbu.id,
+            entity_type="proof_point",
+            entity_id=sample_proof_point.id,
+            uploaded_by=sample_user.id,
+            db=db_session
+        )
+
+        response = await attachment_service.download(attachment.id, db_session, sha256=attachment.sha256)
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["etag"] == f'"{attachment.sha256}"'
+
+        with pytest.raises(HTTPException) as exc_info:
+            await attachment_service.download(attachment.id, db_session, sha256="0" * 64)
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_accel_redirect_hands_body_to_nginx(
+        self, db_session: AsyncSession, sample_user: User,
+        sample_png_file: UploadFile, sample_vbu, sample_proof_point, temp_upload_dir
+    ):
+        """Test accel mode returns an empty response pointing nginx at the blob."""
+        settings = Settings(
+            database_url="postgresql+asyncpg://canvas:canvas_dev@db:5432/canvas_test",
+            cors_origins=["*"],
+            secret_key="test",
+            upload_dir=str(temp_upload_dir),
+            attachment_accel_redirect_prefix="/_attachments"
+        )
+        service = AttachmentService(settings)
+        attachment = await service.upload(
+            file=sample_png_file,
+            vbu_id=sample_vbu.id,
+            entity_type="proof_point",
+            entity_id=sample_proof_point.id,
+            uploaded_by=sample_user.id,
+            db=db_session
+        )
+
+        response = await service.download(attachment.id, db_session, sha256=attachment.sha256)
+        sha = attachment.sha256
+        assert response.headers["x-accel-redirect"] == f"/_attachments/blobs/{sha[:2]}/{sha[2:4]}/{sha}"
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["content-disposition"] == 'attachment; filename="test.png"'
+        assert "immutable" in response.headers["cache-control"]
+        assert response.body == b""
+
+    @pytest.mark.asyncio
+    async def test_save_file_streams_size_and_digest(self, attachment_service: AttachmentService, temp_upload_dir):
+        """Test streamed save reports received byte count and SHA-256."""
+        import hashlib
+        content = b"abc" * 700_000
+        storage_path = temp_upload_dir / "streamed.csv"
+
+        size_bytes, sha256 = await attachment_service._save_file(
+            _make_upload_file("streamed.csv", content, "text/csv"), storage_path
+        )
+
+        assert size_bytes == len(content)
+        assert sha256 == hashlib.sha256(content).hexdigest()
+        assert storage_path.read_bytes() == content
+
+    @pytest.mark.asyncio
+    async def test_save_file_enforces_limit_while_streaming(self, attachment_service: AttachmentService, temp_upload_dir):
+        """Test size limit applies to received bytes even when the declared size lies."""
+        from starlette.datastructures import Headers
+        oversized = UploadFile(
+            file=io.BytesIO(b"x" * (attachment_service.max_size_bytes + 1)),
+            size=10, filename="small.png", headers=Headers({"content-type": "image/png"})
+        )
+        storage_path = temp_upload_dir / "oversized.png"
+
+        with pytest.raises(HTTPException) as exc_info:
+            await attachment_service._save_file(oversized, storage_path)
+
+        assert exc_info.value.status_code == 413
+        assert not storage_path.exists()
+        assert not list(temp_upload_dir.iterdir())
@@ -52,6 +52,51 @@ class TestCanvasAPINestedData:
         assert "proof_points" in thesis
         assert len(thesis["proof_points"]) > 0
 
+    async def test_get_canvas_thesis_category(self, client: AsyncClient, admin_token: str, sample_thesis, db_session):
+        from canvas.models.thesis_category import ThesisCategory
+        category = ThesisCategory(name="Market Test", color="#123456")
+        db_session.add(category)
+        await db_session.flush()
+        sample_thesis.category_id = category.id
+        await db_session.commit()
+        canvas = await db_session.get(Canvas, sample_thesis.canvas_id)
+        response = await client.get(f"/api/vbus/{canvas.vbu_id}/canvas", headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == 200
+        thesis = response.json()["data"]["theses"][0]
+        assert thesis["category_name"] == "Market Test"
+        assert thesis["category_color"] == "#123456"
+        assert thesis["proof_points"] == []
+
+    async def test_get_canvas_hides_portfolio_notes_from_gm(self, client: AsyncClient, gm_token: str, gm_vbu: VBU, gm_canvas: Canvas, db_session):
+        gm_canvas.portfolio_notes = "Admin only"
+        await db_session.commit()
+        response = await client.get(f"/api/vbus/{gm_vbu.id}/canvas", headers={"Authorization": f"Bearer {gm_token}"})
+        assert response.status_code == 200
+        assert response.json()["data"]["portfolio_notes"] is None
+
+class TestCanvasAPIConditionalGet:
+    async def test_get_canvas_not_modified(self, client: AsyncClient, admin_token: str, canvas_with_proof_points: Canvas):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        url = f"/api/vbus/{canvas_with_proof_points.vbu_id}/canvas"
+        first = await client.get(url, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second = await client.get(url, headers={**headers, "If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+
+    async def test_get_canvas_etag_changes_after_edit(self, client: AsyncClient, admin_token: str, canvas_with_proof_points: Canvas):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        url = f"/api/vbus/{canvas_with_proof_points.vbu_id}/canvas"
+        etag = (await client.get(url, headers=headers)).headers["etag"]
+        pp_id = (await client.get(url, headers=headers)).json()["data"]["theses"][0]["proof_points"][0]["id"]
+
+        await client.delete(f"/api/proof-points/{pp_id}", headers=headers)
+        response = await client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
 class TestCanvasAPIValidation:
     async def test_update_canvas_invalid_lifecycle_lane(self, client: AsyncClient, admin_token: str, test_vbu: VBU):
         payload = {"lifecycle_lane": "invalid"}
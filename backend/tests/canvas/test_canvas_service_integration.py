@@ -1,7 +1,10 @@
+import asyncio
 import pytest
 import pytest_asyncio
 from uuid import uuid4
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from canvas.services.canvas_service import CanvasService
 from canvas.models.user import User, UserRole
 from canvas.models.vbu import VBU
@@ -9,6 +12,7 @@ from canvas.models.canvas import Canvas, LifecycleLane
 from canvas.models.thesis import Thesis
 from canvas.models.proof_point import ProofPoint, ProofPointStatus
 from canvas.auth.service import AuthService
+from canvas.ranking import MAX_RANK_LENGTH
 
 @pytest.fixture
 def canvas_service():
@@ -102,7 +106,82 @@ class TestCanvasServiceThesis:
         assert reordered[0].id == t2.id and reordered[0].order == 1
         assert reordered[1].id == t1.id and reordered[1].order == 2
 
+    async def test_concurrent_creates_respect_thesis_limit(self, canvas_service: CanvasService, _engine):
+        """Two creates racing for the fifth slot: one wins, the other sees the limit"""
+        sessions = async_sessionmaker(_engine, expire_on_commit=False)
+        async with sessions() as db:
+            user = User(email=f"race-{uuid4()}@test.com", password_hash="x", name="Race GM", role=UserRole.GM)
+            db.add(user)
+            await db.flush()
+            vbu = VBU(name="Race VBU", gm_id=user.id)
+            db.add(vbu)
+            await db.flush()
+            canvas = Canvas(vbu_id=vbu.id, lifecycle_lane=LifecycleLane.BUILD)
+            db.add(canvas)
+            await db.flush()
+            db.add_all([Thesis(canvas_id=canvas.id, text=f"Thesis {i}") for i in range(4)])
+            await db.commit()
+        try:
+            async def create(text):
+                async with sessions() as db:
+                    return await canvas_service.create_thesis(canvas.id, text, None, db)
+
+            results = await asyncio.gather(create("Racer A"), create("Racer B"), return_exceptions=True)
+
+            assert sum(isinstance(r, Thesis) for r in results) == 1
+            [rejected] = [r for r in results if isinstance(r, HTTPException)]
+            assert rejected.status_code == 422
+            async with sessions() as db:
+                assert await db.scalar(select(func.count()).select_from(Thesis).where(Thesis.canvas_id == canvas.id)) == 5
+        finally:
+            async with sessions() as db:
+                await db.execute(delete(VBU).where(VBU.id == vbu.id))
+                await db.execute(delete(User).where(User.id == user.id))
+                await db.commit()
+
+
 class TestCanvasServiceProofPoint:
+    async def test_concurrent_appends_get_distinct_ranks(self, canvas_service: CanvasService, _engine):
+        """Single and batch creates racing on one thesis all succeed, in distinct slots"""
+        sessions = async_sessionmaker(_engine, expire_on_commit=False)
+        async with sessions() as db:
+            user = User(email=f"race-{uuid4()}@test.com", password_hash="x", name="Race GM", role=UserRole.GM)
+            db.add(user)
+            await db.flush()
+            vbu = VBU(name="Race VBU", gm_id=user.id)
+            db.add(vbu)
+            await db.flush()
+            canvas = Canvas(vbu_id=vbu.id, lifecycle_lane=LifecycleLane.BUILD)
+            db.add(canvas)
+            await db.flush()
+            thesis = Thesis(canvas_id=canvas.id, text="Race thesis")
+            db.add(thesis)
+            await db.commit()
+        try:
+            async def create(description):
+                async with sessions() as db:
+                    return await canvas_service.create_proof_point(thesis.id, description, "not_started", None, None, db)
+
+            async def batch(description):
+                async with sessions() as db:
+                    return await canvas_service.apply_proof_point_batch(thesis.id, [{"description": description}], [], [], db)
+
+            results = await asyncio.gather(
+                *[create(f"Single {i}") for i in range(4)], *[batch(f"Batch {i}") for i in range(2)],
+                return_exceptions=True,
+            )
+
+            assert not [r for r in results if isinstance(r, Exception)]
+            async with sessions() as db:
+                ranks = (await db.scalars(select(ProofPoint.rank).where(ProofPoint.thesis_id == thesis.id))).all()
+            assert len(set(ranks)) == len(ranks) == 6
+        finally:
+            async with sessions() as db:
+                await db.execute(delete(VBU).where(VBU.id == vbu.id))
+                await db.execute(delete(User).where(User.id == user.id))
+                await db.commit()
+
+
     async def test_create_proof_point(self, canvas_service: CanvasService, test_vbu: VBU, db_session: AsyncSession):
         canvas = await canvas_service.get_canvas_by_vbu(test_vbu.id, db_session)
         thesis = await canvas_service.create_thesis(canvas.id, "Test thesis", 1, db_session)
@@ -125,3 +204,46 @@ class TestCanvasServiceProofPoint:
         await canvas_service.delete_proof_point(pp.id, db_session)
         result = await db_session.get(ProofPoint, pp.id)
         assert result is None
+
+
+class TestCanvasServiceRankRebalance:
+    async def _ranks(self, model, parent_col, parent_id, db_session: AsyncSession):
+        rows = (await db_session.execute(
+            select(model.id, model.rank).where(parent_col == parent_id).order_by(model.rank)
+        )).all()
+        assert all(len(row.rank) <= MAX_RANK_LENGTH for row in rows)
+        return [row.id for row in rows]
+
+    async def test_repeated_moves_to_front_renumber(self, canvas_service: CanvasService, test_vbu: VBU, db_session: AsyncSession):
+        canvas = await canvas_service.get_canvas_by_vbu(test_vbu.id, db_session)
+        thesis = await canvas_service.create_thesis(canvas.id, "Test thesis", 1, db_session)
+        pps = [
+            await canvas_service.create_proof_point(thesis.id, f"PP {i}", ProofPointStatus.NOT_STARTED.value, None, None, db_session)
+            for i in range(3)
+        ]
+        expected = [pp.id for pp in pps]
+        for _ in range(400):
+            await canvas_service.move_proof_point(expected[-1], None, db_session)
+            expected = expected[-1:] + expected[:-1]
+        assert await self._ranks(ProofPoint, ProofPoint.thesis_id, thesis.id, db_session) == expected
+
+    async def test_repeated_reorders_renumber(self, canvas_service: CanvasService, test_vbu: VBU, db_session: AsyncSession):
+        canvas_id = (await canvas_service.get_canvas_by_vbu(test_vbu.id, db_session)).id
+        expected = [(await canvas_service.create_thesis(canvas_id, f"T{i}", None, db_session)).id for i in range(3)]
+        for _ in range(400):
+            await canvas_service.reorder_theses(canvas_id, [{"id": str(expected[-1]), "order": 1}], db_session)
+            expected = expected[-1:] + expected[:-1]
+        assert await self._ranks(Thesis, Thesis.canvas_id, canvas_id, db_session) == expected
+
+    async def test_long_appends_renumber(self, canvas_service: CanvasService, test_vbu: VBU, db_session: AsyncSession):
+        canvas = await canvas_service.get_canvas_by_vbu(test_vbu.id, db_session)
+        thesis = await canvas_service.create_thesis(canvas.id, "Test thesis", 1, db_session)
+        added = [ProofPoint(thesis_id=thesis.id, description=f"PP {i}") for i in range(250)]
+        db_session.add_all(added)
+        await db_session.flush()
+        result = await canvas_service.apply_proof_point_batch(
+            thesis.id, [{"description": f"Batch {i}"} for i in range(250)], [], [], db_session
+        )
+        expected = [pp.id for pp in added] + [pp.id for pp in result["created"]]
+        assert await self._ranks(ProofPoint, ProofPoint.thesis_id, thesis.id, db_session) == expected
+
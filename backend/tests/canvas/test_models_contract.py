@@ -52,7 +52,7 @@ def test_thesis_model_contract():
     
     # Check constraints
     assert Thesis.canvas_id.nullable is False
-    assert Thesis.order.nullable is False
+    assert Thesis.rank.nullable is False
     assert Thesis.text.nullable is False
     # Check FK target
     assert str(Thesis.canvas_id.foreign_keys.pop().column) == "canvases.id"
@@ -103,6 +103,25 @@ class TestProofPointAPI:
         assert data["data"]["description"] == "Updated proof point"
         assert data["data"]["evidence_note"] == "Updated evidence"
     
+    async def test_update_proof_point_target_review_month(self, client: AsyncClient, gm_token: str, sample_proof_point: ProofPoint):
+        """Test PATCH sets target_review_month to the first of the month and clears it with null"""
+        headers = {"Authorization": f"Bearer {gm_token}"}
+        response = await client.patch(
+            f"/api/proof-points/{sample_proof_point.id}",
+            json={"target_review_month": "2026-07"},
+            headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["data"]["target_review_month"] == "2026-07-01"
+
+        response = await client.patch(
+            f"/api/proof-points/{sample_proof_point.id}",
+            json={"target_review_month": None},
+            headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["data"]["target_review_month"] is None
+    
     async def test_update_proof_point_status_change(self, client: AsyncClient, gm_token: str, sample_proof_point: ProofPoint):
         """Test PATCH updates status from not_started to in_progress"""
         headers = {"Authorization": f"Bearer {gm_token}"}
@@ -155,6 +174,57 @@ class TestProofPointAPI:
         data = response.json()
         assert "error" in data
 
+    
+    async def test_batch_proof_points(self, client: AsyncClient, gm_token: str, sample_thesis: Thesis, sample_proof_point: ProofPoint, db_session: AsyncSession):
+        """Test PATCH /api/theses/{thesis_id}/proof-points applies creates, updates and deletes together"""
+        doomed = ProofPoint(thesis_id=sample_thesis.id, description="Remove me", status=ProofPointStatus.NOT_STARTED)
+        db_session.add(doomed)
+        await db_session.commit()
+        headers = {"Authorization": f"Bearer {gm_token}"}
+        response = await client.patch(
+            f"/api/theses/{sample_thesis.id}/proof-points",
+            json={
+                "create": [
+                    {"description": "First", "target_review_month": "2026-04"},
+                    {"description": "Second", "status": "in_progress"},
+                ],
+                "update": [{"id": str(sample_proof_point.id), "status": "observed", "target_review_month": None}],
+                "delete": [str(doomed.id)],
+            },
+            headers=headers
+        )
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [pp["description"] for pp in data["created"]] == ["First", "Second"]
+        assert data["created"][0]["target_review_month"] == "2026-04-01"
+        assert data["updated"][0]["status"] == "observed"
+        assert data["deleted"] == [str(doomed.id)]
+        
+        listing = await client.get(f"/api/theses/{sample_thesis.id}/proof-points", headers=headers)
+        assert {pp["description"] for pp in listing.json()["data"]} == {"Test proof point", "First", "Second"}
+    
+    async def test_batch_proof_points_rejects_foreign_ids(self, client: AsyncClient, gm_token: str, sample_thesis: Thesis):
+        """Test batch with a proof point from another thesis returns 404 and writes nothing"""
+        headers = {"Authorization": f"Bearer {gm_token}"}
+        response = await client.patch(
+            f"/api/theses/{sample_thesis.id}/proof-points",
+            json={"create": [{"description": "Orphan"}], "delete": [str(uuid4())]},
+            headers=headers
+        )
+        assert response.status_code == 404
+        listing = await client.get(f"/api/theses/{sample_thesis.id}/proof-points", headers=headers)
+        assert all(pp["description"] != "Orphan" for pp in listing.json()["data"])
+    
+    async def test_batch_proof_points_forbidden_other_gm(self, client: AsyncClient, other_gm_token: str, sample_thesis: Thesis):
+        """Test batch on another GM's thesis returns 403"""
+        headers = {"Authorization": f"Bearer {other_gm_token}"}
+        response = await client.patch(
+            f"/api/theses/{sample_thesis.id}/proof-points",
+            json={"create": [{"description": "Nope"}]},
+            headers=headers
+        )
+        assert response.status_code == 403
+
 
 # Uses client and db fixtures from conftest.py
 
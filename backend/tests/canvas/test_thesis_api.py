@@ -1,6 +1,6 @@
 import pytest
 from httpx import AsyncClient
-from uuid import uuid4
+from uuid import uuid4, UUID
 from canvas.models.user import User
 from canvas.models.canvas import Canvas
 from canvas.models.thesis import Thesis
@@ -90,4 +90,17 @@ class TestThesisAPIReordering:
             ]
         }
         response = await client.put(f"/api/canvases/{other_canvas_with_theses.id}/theses/reorder", json=payload, headers={"Authorization": f"Bearer {gm_token}"})
-        assert response.status_code == 403
\ No newline at end of file
+        assert response.status_code == 403
+
+    async def test_move_thesis_rewrites_one_rank(self, client: AsyncClient, admin_token: str, canvas_with_theses: Canvas):
+        first, second, third = canvas_with_theses.theses
+        untouched = {first.id: first.rank, second.id: second.rank}
+        response = await client.post(f"/api/theses/{third.id}/move", json={"after_id": None}, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == 200
+        assert response.json()["data"]["order"] == 1
+
+        listing = await client.get(f"/api/canvases/{canvas_with_theses.id}/theses", headers={"Authorization": f"Bearer {admin_token}"})
+        theses = listing.json()["data"]
+        assert [t["id"] for t in theses] == [str(third.id), str(first.id), str(second.id)]
+        assert [t["order"] for t in theses] == [1, 2, 3]
+        assert {UUID(t["id"]): t["rank"] for t in theses if UUID(t["id"]) in untouched} == untouched
@@ -73,4 +73,29 @@ class TestVBUAPIPagination:
         meta = response.json()["meta"]
         assert "total" in meta
         assert "page" in meta
-        assert "per_page" in meta
\ No newline at end of file
+        assert "per_page" in meta
+    async def test_list_vbus_cursor_pagination(self, client: AsyncClient, admin_token: str, gm_user: User, db_session):
+        db_session.add_all([VBU(name=f"Cursor VBU {i}", gm_id=gm_user.id) for i in range(3)])
+        await db_session.commit()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        first = await client.get("/api/vbus?cursor=&per_page=2", headers=headers)
+        assert first.status_code == 200
+        body = first.json()
+        assert [v["name"] for v in body["data"]] == ["Cursor VBU 0", "Cursor VBU 1"]
+        assert body["meta"]["total"] is None
+        assert body["meta"]["next_cursor"]
+
+        second = await client.get(f"/api/vbus?cursor={body['meta']['next_cursor']}&per_page=2", headers=headers)
+        assert second.status_code == 200
+        assert [v["name"] for v in second.json()["data"]] == ["Cursor VBU 2"]
+        assert second.json()["meta"]["next_cursor"] is None
+
+    async def test_list_vbus_cursor_exact_count(self, client: AsyncClient, gm_token: str, gm_vbu: VBU):
+        response = await client.get("/api/vbus?cursor=&count=exact", headers={"Authorization": f"Bearer {gm_token}"})
+        assert response.status_code == 200
+        assert response.json()["meta"]["total"] == 1
+
+    async def test_list_vbus_invalid_cursor(self, client: AsyncClient, admin_token: str):
+        response = await client.get("/api/vbus?cursor=not-a-cursor", headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == 422
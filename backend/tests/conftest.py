@@ -25,8 +25,10 @@ from canvas.models.monthly_review import MonthlyReview
 from canvas.models.commitment import Commitment
 from canvas.main import create_app
 from canvas.db import get_db_session
+from canvas.metrics import instrument_engine
 from canvas.auth.service import AuthService
 from canvas.auth.user_service import UserService
+from canvas.auth.principal_cache import principal_cache
 
 TEST_DB_URL = os.environ["CANVAS_DATABASE_URL"]
 SYNC_DB_URL = TEST_DB_URL.replace("+asyncpg", "")
@@ -42,16 +44,55 @@ _sync_engine.dispose()
 async def _engine():
     """Per-test async engine with NullPool."""
     eng = create_async_engine(TEST_DB_URL, echo=False, poolclass=NullPool)
+    instrument_engine(eng)
     yield eng
     await eng.dispose()
 
 
+class QueryCounter:
+    """Records the SQL statements issued on an engine while the block runs.
+
+    Use as `with count_queries() as queries: ...` and then check
+    `queries.count`, or call `queries.assert_at_most(budget)`.
+    """
+
+    def __init__(self, engine):
+        self.sync_engine = engine.sync_engine
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def assert_at_most(self, budget, label=""):
+        assert self.count <= budget, (
+            f"{label or 'block'} issued {self.count} statements, budget is {budget}:\n"
+            + "\n".join(f"  {i + 1}. {' '.join(sql.split())[:200]}" for i, sql in enumerate(self.statements))
+        )
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.sync_engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.sync_engine, "before_cursor_execute", self._record)
+
+
 @pytest_asyncio.fixture
 async def engine(_engine):
     """Public engine fixture."""
     return _engine
 
 
+@pytest.fixture
+def count_queries(_engine):
+    """Factory for QueryCounter blocks on the engine behind db_session and the app."""
+    return lambda: QueryCounter(_engine)
+
+
 @pytest_asyncio.fixture
 async def _connection(_engine):
     """Per-test connection with outer transaction for rollback isolation."""
@@ -111,6 +152,14 @@ async def client(app):
         yield c
 
 
+@pytest.fixture(autouse=True)
+def _clear_principal_cache():
+    """Users are recreated per test; never serve one test's principals to another."""
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
 # --- Service fixtures ---
 
 @pytest.fixture
@@ -0,0 +1,74 @@
+import os
+import signal
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from canvas.pdf.renderer import PDFRenderer, PDFRenderBusyError
+from canvas.pdf.service import PDFService
+from canvas.models.canvas import LifecycleLane
+from canvas.models.proof_point import ProofPointStatus
+
+
+def _weasyprint_available() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):  # OSError: Pango/Cairo system libraries missing
+        return False
+    return True
+
+
+def _canvas():
+    return SimpleNamespace(
+        vbu=SimpleNamespace(name="Acme"),
+        lifecycle_lane=LifecycleLane.BUILD,
+        success_description=None,
+        future_state_intent="Grow",
+        primary_constraint=None,
+        theses=[SimpleNamespace(order=1, text="T1", proof_points=[
+            SimpleNamespace(status=ProofPointStatus.IN_PROGRESS, description="PP", evidence_note=None),
+        ])],
+    )
+
+
+class TestPDFRenderer:
+    @pytest.mark.asyncio
+    async def test_full_queue_fails_fast_without_spawning(self):
+        renderer = PDFRenderer(workers=1, max_queue=0)
+        renderer._pending = 1
+        with pytest.raises(PDFRenderBusyError):
+            await renderer.render({})
+        assert renderer._executor is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not _weasyprint_available(), reason="WeasyPrint system libraries not installed")
+    async def test_pool_is_rebuilt_after_a_worker_dies(self):
+        renderer = PDFRenderer(workers=1, max_queue=1, timeout_seconds=60)
+        context = PDFService(AsyncMock(), renderer=renderer)._template_context(_canvas())
+        try:
+            await renderer.start()
+            broken = renderer._executor
+            for pid in list(broken._processes):
+                os.kill(pid, signal.SIGKILL)
+
+            # Depending on when the pool notices, this render fails or already
+            # lands on a fresh pool; either way the broken one is dropped
+            try:
+                await renderer.render(context)
+            except BrokenProcessPool:
+                pass
+            assert renderer._executor is not broken
+
+            pdf = await renderer.render(context)
+            assert pdf.startswith(b"%PDF")
+            assert renderer._pending == 0
+        finally:
+            renderer.shutdown()
+
+
+class TestPDFServiceTemplateContext:
+    def test_context_is_plain_values(self):
+        context = PDFService(AsyncMock(), renderer=PDFRenderer())._template_context(_canvas())
+        assert context["lifecycle_lane"] == "build"
+        assert context["success_description"] == ""
+        assert context["theses"][0]["proof_points"][0]["status"] == "in_progress"
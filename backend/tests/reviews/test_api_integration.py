@@ -24,6 +24,15 @@ class TestReviewAPIIntegration:
         resp = await client.get(f"/api/canvases/{canvas.id}/reviews", headers={"Authorization": f"Bearer {viewer_token}"})
         assert resp.status_code == status.HTTP_200_OK
 
+    async def test_list_reviews_not_modified(self, client: AsyncClient, admin_token, canvas, sample_review):
+        """Test unchanged review lists are answered with 304"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        resp = await client.get(f"/api/canvases/{canvas.id}/reviews", headers=headers)
+        assert resp.status_code == status.HTTP_200_OK
+        etag = resp.headers["etag"]
+        resp_again = await client.get(f"/api/canvases/{canvas.id}/reviews", headers={**headers, "If-None-Match": etag})
+        assert resp_again.status_code == status.HTTP_304_NOT_MODIFIED
+
     async def test_create_review_admin_any_canvas(self, client: AsyncClient, admin_token, canvas, test_thesis):
         """Test admin can create review for any canvas"""
         payload = {
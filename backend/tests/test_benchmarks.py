@@ -0,0 +1,51 @@
+import argparse
+import pytest
+from benchmarks.compare import compare
+from benchmarks.report import Recorder, percentile
+from benchmarks.run import parse_mix
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_recorder_skips_warmup_and_counts_errors():
+    recorder = Recorder()
+    recorder.route("GET /api/vbus", 5.0, 200)
+    recorder.recording = True
+    for ms in (10, 20, 30):
+        recorder.route("GET /api/vbus", ms / 1000, 200)
+    recorder.route("GET /api/vbus", 0.04, 500)
+    recorder.scenario("dashboard", 0.1, failed=True)
+
+    report = recorder.report(2.0, {"commit": "abc"})
+    route = report["routes"]["GET /api/vbus"]
+    assert route["count"] == 4
+    assert route["errors"] == 1
+    assert route["p50_ms"] == 20.0
+    assert route["max_ms"] == 40.0
+    assert route["throughput_rps"] == 2.0
+    assert route["statuses"] == {"200": 3, "500": 1}
+    assert report["scenarios"]["dashboard"]["errors"] == 1
+
+
+def test_compare_flags_routes_slower_than_threshold():
+    def report(p95):
+        return {"meta": {}, "scenarios": {}, "routes": {
+            "GET /a": {"p50_ms": 1.0, "p95_ms": p95, "p99_ms": 3.0, "throughput_rps": 10.0},
+            "GET /b": {"p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0, "throughput_rps": 10.0},
+        }}
+
+    rows, regressions = compare(report(2.0), report(2.4), "p95_ms", 10.0)
+    assert [row["name"] for row in regressions] == ["GET /a"]
+    assert rows[0]["p95_ms"] == (2.0, 2.4, pytest.approx(20.0))
+
+
+def test_parse_mix_rejects_unknown_scenarios():
+    assert parse_mix("dashboard=3,pdf_export") == {"dashboard": 3.0, "pdf_export": 1.0}
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("checkout=1")
@@ -0,0 +1,32 @@
+from starlette.requests import Request
+from canvas.etag import make_etag, etag_matches, not_modified_response
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_make_etag_is_quoted_and_stable():
+    """Test make_etag returns the same strong validator for the same parts"""
+    etag = make_etag("v1", 3, None)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("v1", 3, None)
+    assert etag != make_etag("v1", 4, None)
+
+
+def test_etag_matches_list_and_weak_prefix():
+    """Test If-None-Match parsing handles lists, W/ prefixes and *"""
+    etag = make_etag("v1")
+    assert etag_matches(_request(f'"other", W/{etag}'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('"other"'), etag)
+    assert not etag_matches(_request(), etag)
+
+
+def test_not_modified_response_has_no_body():
+    """Test 304 responses carry the validator and no body"""
+    response = not_modified_response(make_etag("v1"))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == make_etag("v1")
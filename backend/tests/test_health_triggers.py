@@ -0,0 +1,146 @@
+"""Statement-level health triggers and the recompute CLI from migration 016.
+
+The suite builds its schema with create_all, so these tests install the
+migration's functions and triggers on the per-test connection; the outer
+transaction rolls the DDL back with everything else.
+"""
+import importlib.util
+import json
+from pathlib import Path
+import pytest
+import pytest_asyncio
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from canvas import recompute_health
+from canvas.models.canvas import Canvas
+from canvas.models.proof_point import ProofPoint, ProofPointStatus
+from canvas.models.thesis import Thesis
+from canvas.models.vbu import VBU
+
+MIGRATION = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "016_statement_health_trigger.py"
+
+
+def _run_upgrade(sync_conn):
+    spec = importlib.util.spec_from_file_location("migration_016", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with Operations.context(MigrationContext.configure(sync_conn)):
+        migration.upgrade()
+
+
+@pytest_asyncio.fixture
+async def health_triggers(_connection):
+    await _connection.run_sync(_run_upgrade)
+
+
+async def _make_canvas(db_session, gm_user, name, statuses_per_thesis):
+    """A canvas with one thesis per entry, each holding proof points with the given statuses."""
+    vbu = VBU(name=name, gm_id=gm_user.id)
+    db_session.add(vbu)
+    await db_session.flush()
+    canvas = Canvas(vbu_id=vbu.id, lifecycle_lane="build")
+    db_session.add(canvas)
+    await db_session.flush()
+    theses = []
+    for i, statuses in enumerate(statuses_per_thesis):
+        thesis = Thesis(canvas_id=canvas.id, text=f"{name} thesis {i}")
+        db_session.add(thesis)
+        await db_session.flush()
+        db_session.add_all([
+            ProofPoint(thesis_id=thesis.id, description=f"{name} pp {j}", status=status)
+            for j, status in enumerate(statuses)
+        ])
+        theses.append(thesis)
+    await db_session.commit()
+    return canvas, theses
+
+
+async def _health(db_session, *canvases):
+    result = await db_session.execute(
+        select(Canvas.id, Canvas.health_indicator_cache).where(Canvas.id.in_([c.id for c in canvases]))
+    )
+    health = dict(result.all())
+    return [health[c.id] for c in canvases]
+
+
+@pytest.mark.asyncio
+async def test_multi_row_update_recomputes_each_affected_canvas(health_triggers, db_session, gm_user):
+    first, first_theses = await _make_canvas(
+        db_session, gm_user, "First", [[ProofPointStatus.NOT_STARTED, ProofPointStatus.NOT_STARTED]]
+    )
+    second, second_theses = await _make_canvas(db_session, gm_user, "Second", [[ProofPointStatus.NOT_STARTED]])
+    untouched, _ = await _make_canvas(db_session, gm_user, "Untouched", [[ProofPointStatus.OBSERVED]])
+    await db_session.execute(update(Canvas).where(Canvas.id == untouched.id).values(health_indicator_cache="Stale"))
+
+    await db_session.execute(
+        update(ProofPoint)
+        .where(ProofPoint.thesis_id == first_theses[0].id)
+        .values(status=ProofPointStatus.OBSERVED)
+    )
+    await db_session.execute(
+        update(ProofPoint)
+        .where(ProofPoint.thesis_id.in_([first_theses[0].id, second_theses[0].id]))
+        .where(ProofPoint.description.in_(["First pp 0", "Second pp 0"]))
+        .values(status=ProofPointStatus.STALLED)
+    )
+
+    assert await _health(db_session, first, second, untouched) == ["At Risk", "At Risk", "Stale"]
+
+
+@pytest.mark.asyncio
+async def test_delete_recomputes_canvas_from_remaining_proof_points(health_triggers, db_session, gm_user):
+    canvas, theses = await _make_canvas(
+        db_session, gm_user, "Deleting", [[ProofPointStatus.STALLED, ProofPointStatus.OBSERVED]]
+    )
+    assert await _health(db_session, canvas) == ["At Risk"]
+
+    await db_session.execute(delete(ProofPoint).where(ProofPoint.status == ProofPointStatus.STALLED))
+    assert await _health(db_session, canvas) == ["On Track"]
+
+    await db_session.execute(delete(ProofPoint).where(ProofPoint.thesis_id == theses[0].id))
+    assert await _health(db_session, canvas) == ["Not Started"]
+
+
+@pytest.mark.asyncio
+async def test_thesis_delete_recomputes_its_canvas(health_triggers, db_session, gm_user):
+    canvas, theses = await _make_canvas(
+        db_session, gm_user, "Thesis delete", [[ProofPointStatus.STALLED], [ProofPointStatus.IN_PROGRESS]]
+    )
+    assert await _health(db_session, canvas) == ["At Risk"]
+
+    await db_session.execute(delete(Thesis).where(Thesis.id == theses[0].id))
+    assert await _health(db_session, canvas) == ["In Progress"]
+
+
+@pytest.mark.asyncio
+async def test_recompute_cli_repairs_every_canvas_across_batches(
+    health_triggers, _connection, db_session, gm_user, monkeypatch, capsys
+):
+    canvases = [
+        (await _make_canvas(db_session, gm_user, name, statuses))[0]
+        for name, statuses in (
+            ("Cli A", [[ProofPointStatus.STALLED]]),
+            ("Cli B", [[ProofPointStatus.OBSERVED]]),
+            ("Cli C", [[ProofPointStatus.IN_PROGRESS]]),
+            ("Cli D", []),
+            ("Cli E", [[ProofPointStatus.NOT_STARTED]]),
+        )
+    ]
+    await db_session.execute(update(Canvas).values(health_indicator_cache="Stale"))
+    await db_session.commit()
+
+    def session_on_test_connection():
+        return AsyncSession(bind=_connection, expire_on_commit=False)
+
+    monkeypatch.setattr(recompute_health, "AsyncSessionLocal", session_on_test_connection)
+    await recompute_health.main(batch_size=2)
+
+    output = json.loads(capsys.readouterr().out)
+    assert output["status"] == "success"
+    assert output["canvases"] == len(canvases)
+    assert output["batches"] == 3
+    assert await _health(db_session, *canvases) == [
+        "At Risk", "On Track", "In Progress", "Not Started", "Not Started",
+    ]
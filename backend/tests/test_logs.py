@@ -0,0 +1,56 @@
+import io
+import json
+import logging
+import pytest
+import structlog
+from canvas.logs import LogPipeline
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = LogPipeline(max_queue=3)
+    stream = io.StringIO()
+    pipeline._output.setStream(stream)
+    pipeline.install("INFO")
+    yield pipeline, stream
+    pipeline.stop()
+    logging.getLogger().removeHandler(pipeline._handler)
+
+
+def lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_records_are_rendered_as_json_by_the_listener(pipeline):
+    pipeline, stream = pipeline
+    structlog.get_logger("canvas.test").info("order_placed", order_id=7)
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        logging.getLogger("canvas.test").error("failed %s", "twice", exc_info=True)
+    pipeline.stop()
+
+    first, second = lines(stream)
+    assert first["event"] == "order_placed"
+    assert first["order_id"] == 7
+    assert first["level"] == "info"
+    assert first["logger"] == "canvas.test"
+    assert "timestamp" in first
+    assert second["event"] == "failed twice"
+    assert "ValueError: bad" in second["exception"]
+
+
+def test_full_queue_drops_and_counts_records(pipeline):
+    pipeline, stream = pipeline
+    pipeline.stop()
+    log = logging.getLogger("canvas.test")
+    for i in range(5):
+        log.warning("record %d", i)
+    assert pipeline.metrics()["dropped"] == 2
+    assert pipeline.metrics()["queued"] == 3
+
+    pipeline.start()
+    pipeline.stop()
+    events = [line["event"] for line in lines(stream)]
+    assert events == ["Dropped 2 log records: log queue full", "record 0", "record 1", "record 2"]
+    assert pipeline.metrics()["queued"] == 0
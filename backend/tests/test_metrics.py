@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from canvas.metrics import (
+    Histogram, InstrumentedQueuePool, POOL_WAIT, RequestStats, instrument_engine, render_metrics, request_stats,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", (0.1, 1.0), ("route",))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+    lines = histogram.render()
+
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_sum{route="/a"} 5.55' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+
+
+def test_server_timing_reports_queries_and_durations():
+    stats = RequestStats()
+    stats.queries = 3
+    stats.db_seconds = 0.0125
+    assert stats.server_timing(0.05) == 'db;dur=12.50;desc="3 queries", pool;dur=0.00, total;dur=50.00'
+
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_counts_queries_for_current_request():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=InstrumentedQueuePool)
+    instrument_engine(engine)
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+            with pytest.raises(Exception):
+                await conn.execute(text("SELECT * FROM missing_table"))
+    finally:
+        request_stats.reset(token)
+        await engine.dispose()
+
+    assert stats.queries == 3
+    assert stats.db_seconds > 0
+    assert stats.pool_wait_seconds > 0
+    body = render_metrics(engine.pool)
+    assert "canvas_db_pool_connections_in_use 0" in body
+    assert POOL_WAIT.name + "_count" in body
+
+
+@pytest.mark.asyncio
+async def test_responses_carry_server_timing_and_metrics_are_scraped(client, admin_token):
+    response = await client.get("/api/vbus", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+
+    metrics = await client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'canvas_http_request_duration_seconds_count{method="GET",route="/api/vbus",status="200"}' in metrics.text
+    assert 'canvas_http_request_db_queries_bucket{method="GET",route="/api/vbus",le="+Inf"}' in metrics.text
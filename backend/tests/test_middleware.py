@@ -0,0 +1,87 @@
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from canvas import middleware
+from canvas.middleware import RequestContextMiddleware
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.lines = []
+
+    def info(self, event, **fields):
+        self.lines.append(("info", fields))
+
+    def warning(self, event, **fields):
+        self.lines.append(("warning", fields))
+
+
+@pytest.fixture
+def access_log(monkeypatch):
+    recorder = RecordingLogger()
+    monkeypatch.setattr(middleware, "logger", recorder)
+    return recorder
+
+
+def make_app(**options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, **options)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int, request: Request) -> dict:
+        return {"request_id": request.state.request_id}
+
+    @app.get("/boom")
+    async def boom() -> dict:
+        raise RuntimeError("boom")
+
+    return app
+
+
+async def get(app: FastAPI, url: str):
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(url)
+
+
+@pytest.mark.asyncio
+async def test_sets_request_id_and_server_timing(access_log):
+    response = await get(make_app(sample_rate=1.0), "/items/7")
+
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == response.json()["request_id"]
+    assert response.headers["server-timing"].startswith('db;dur=0.00;desc="0 queries"')
+    [(level, fields)] = access_log.lines
+    assert level == "info"
+    assert fields["route"] == "/items/{item_id}"
+    assert fields["path"] == "/items/7"
+    assert fields["status"] == 200
+    assert fields["request_id"] == response.headers["x-request-id"]
+
+
+@pytest.mark.asyncio
+async def test_unsampled_fast_requests_are_not_logged(access_log):
+    response = await get(make_app(sample_rate=0.0), "/items/7")
+
+    assert response.status_code == 200
+    assert access_log.lines == []
+
+
+@pytest.mark.asyncio
+async def test_slow_requests_are_always_logged(access_log):
+    await get(make_app(sample_rate=0.0, slow_request_ms=0.0), "/items/7")
+
+    [(level, fields)] = access_log.lines
+    assert level == "warning"
+    assert fields["slow"] is True
+
+
+@pytest.mark.asyncio
+async def test_unhandled_errors_are_logged_as_500(access_log):
+    response = await get(make_app(sample_rate=0.0), "/boom")
+
+    assert response.status_code == 500
+    [(level, fields)] = access_log.lines
+    assert level == "warning"
+    assert fields["status"] == 500
+    assert fields["route"] == "/boom"
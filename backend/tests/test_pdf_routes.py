@@ -192,3 +192,30 @@ async def test_export_canvas_pdf_content_headers(client: AsyncClient, admin_user
     assert response.headers["content-type"] == "application/pdf"
     assert response.headers["content-disposition"].startswith("attachment")
     assert "filename=" in response.headers["content-disposition"]
+
+
+@pytest.mark.asyncio
+async def test_export_canvas_pdf_filename_uses_vbu_name(client: AsyncClient, admin_user: User, admin_token: str, db_session, monkeypatch):
+    """Content-Disposition names the file after the VBU, independent of the renderer"""
+    class StubRenderer:
+        async def render(self, context: dict) -> bytes:
+            return b"%PDF-stub"
+
+    monkeypatch.setattr("canvas.pdf.service.pdf_renderer", StubRenderer())
+
+    vbu = VBU(name="Stub VBU", gm_id=admin_user.id)
+    db_session.add(vbu)
+    await db_session.commit()
+
+    canvas = Canvas(vbu_id=vbu.id, lifecycle_lane="build")
+    db_session.add(canvas)
+    await db_session.commit()
+
+    response = await client.get(
+        f"/api/vbus/{vbu.id}/canvas/pdf",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="Stub VBU_canvas.pdf"'
+    assert response.content == b"%PDF-stub"
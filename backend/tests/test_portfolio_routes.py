@@ -135,6 +135,78 @@ async def test_update_portfolio_notes_admin_success(client: AsyncClient, admin_u
     assert "updated_at" in data["data"]
 
 
+@pytest.mark.asyncio
+async def test_update_portfolio_notes_appends_version_without_touching_canvases(
+    client: AsyncClient, admin_user: User, admin_token: str, db_session, count_queries
+):
+    """Notes are one versioned row read by the summary; canvases are left alone"""
+    from sqlalchemy import select
+    vbus = [VBU(name=f"Notes VBU {i}", gm_id=admin_user.id) for i in range(3)]
+    db_session.add_all(vbus)
+    await db_session.commit()
+    canvases = [Canvas(vbu_id=vbu.id, lifecycle_lane="build") for vbu in vbus]
+    db_session.add_all(canvases)
+    await db_session.commit()
+    before = {c.id: c.updated_at for c in canvases}
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    first = await client.patch("/api/portfolio/notes", json={"notes": "First"}, headers=headers)
+    summary = await client.get("/api/portfolio/summary", headers=headers)
+    etag = summary.headers["etag"]
+    with count_queries() as queries:
+        second = await client.patch("/api/portfolio/notes", json={"notes": "Second <b>"}, headers=headers)
+
+    assert second.json()["data"]["version"] == first.json()["data"]["version"] + 1
+    assert not any("canvases" in sql or "portfolio_summaries" in sql for sql in queries.statements)
+    summary = await client.get("/api/portfolio/summary", headers={**headers, "If-None-Match": etag})
+    assert summary.status_code == 200
+    assert {row["portfolio_notes"] for row in summary.json()["data"]} == {"Second &lt;b&gt;"}
+    db_session.expire_all()
+    result = await db_session.execute(select(Canvas.id, Canvas.updated_at, Canvas.portfolio_notes))
+    assert {row.id: row.updated_at for row in result if row.id in before} == before
+
+
+@pytest.mark.asyncio
+async def test_notes_migration_downgrade_restores_latest_notes(
+    client: AsyncClient, admin_user: User, admin_token: str, db_session, _connection
+):
+    """Downgrading 019 writes the latest notes version back to canvases and summaries"""
+    import importlib.util
+    from pathlib import Path
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from sqlalchemy import text
+
+    vbus = [VBU(name=f"Downgrade VBU {i}", gm_id=admin_user.id) for i in range(2)]
+    db_session.add_all(vbus)
+    await db_session.commit()
+    db_session.add_all([Canvas(vbu_id=vbu.id, lifecycle_lane="build") for vbu in vbus])
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    await client.patch("/api/portfolio/notes", json={"notes": "Older"}, headers=headers)
+    await client.patch("/api/portfolio/notes", json={"notes": "Latest"}, headers=headers)
+
+    def downgrade(sync_conn):
+        path = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "019_portfolio_notes.py"
+        spec = importlib.util.spec_from_file_location("migration_019", path)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+        with Operations.context(MigrationContext.configure(sync_conn)):
+            migration.downgrade()
+
+    await _connection.run_sync(downgrade)
+
+    vbu_ids = [vbu.id for vbu in vbus]
+    canvases = await _connection.execute(
+        text("SELECT portfolio_notes FROM canvases WHERE vbu_id = ANY(:ids)"), {"ids": vbu_ids}
+    )
+    summaries = await _connection.execute(
+        text("SELECT portfolio_notes FROM portfolio_summaries WHERE vbu_id = ANY(:ids)"), {"ids": vbu_ids}
+    )
+    assert [row.portfolio_notes for row in canvases] == ["Latest", "Latest"]
+    assert [row.portfolio_notes for row in summaries] == ["Latest", "Latest"]
+
+
 @pytest.mark.asyncio
 async def test_update_portfolio_notes_gm_forbidden(client: AsyncClient, gm_token: str):
     """GM cannot update portfolio notes"""
@@ -174,3 +246,134 @@ async def test_update_portfolio_notes_unauthorized(client: AsyncClient):
     """Unauthorized request returns 401"""
     response = await client.patch("/api/portfolio/notes", json={"notes": "test"})
     assert response.status_code in (401, 403)
+
+
+@pytest.mark.asyncio
+async def test_portfolio_summary_follows_canvas_updates(client: AsyncClient, admin_token: str, gm_vbu: VBU):
+    """Summary row is refreshed by the write that changes the canvas"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.put(f"/api/vbus/{gm_vbu.id}/canvas", json={"lifecycle_lane": "milk"}, headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/api/portfolio/summary", headers=headers)
+    row = next(r for r in response.json()["data"] if r["id"] == str(gm_vbu.id))
+    assert row["lifecycle_lane"] == "milk"
+    assert row["gm_name"] == "Test GM"
+
+
+@pytest.mark.asyncio
+async def test_portfolio_summary_currently_testing_text(client: AsyncClient, admin_token: str, gm_canvas: Canvas, sample_thesis, db_session):
+    """Currently testing text is denormalized from the referenced thesis"""
+    gm_canvas.currently_testing_type = "thesis"
+    gm_canvas.currently_testing_id = sample_thesis.id
+    await db_session.commit()
+    sample_thesis.text = "Renamed thesis"
+    await db_session.commit()
+
+    response = await client.get("/api/portfolio/summary", headers={"Authorization": f"Bearer {admin_token}"})
+    row = next(r for r in response.json()["data"] if r["id"] == str(gm_canvas.vbu_id))
+    assert row["currently_testing"] == "Renamed thesis"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_portfolio_summaries(db_session, gm_vbu: VBU):
+    """Full rebuild recreates rows removed out-of-band"""
+    from sqlalchemy import delete, select
+    from canvas.models.portfolio_summary import PortfolioSummary
+    from canvas.portfolio.summary import refresh_all_summaries
+
+    await db_session.execute(delete(PortfolioSummary))
+    rows = await refresh_all_summaries(db_session)
+    assert rows >= 1
+    result = await db_session.execute(select(PortfolioSummary).where(PortfolioSummary.vbu_id == gm_vbu.id))
+    assert result.scalar_one().name == gm_vbu.name
+
+
+@pytest.mark.asyncio
+async def test_thesis_health_counts_and_signal(client: AsyncClient, admin_token: str, gm_canvas: Canvas, sample_thesis, db_session):
+    """Thesis health counts scored proof points in SQL and omits detail unless asked"""
+    from canvas.models.proof_point import ProofPoint, ProofPointStatus
+    from canvas.models.thesis import Thesis
+
+    db_session.add_all([
+        ProofPoint(thesis_id=sample_thesis.id, description="A", status=ProofPointStatus.OBSERVED),
+        ProofPoint(thesis_id=sample_thesis.id, description="B", status=ProofPointStatus.OBSERVED),
+        ProofPoint(thesis_id=sample_thesis.id, description="C", status=ProofPointStatus.NOT_OBSERVED),
+        ProofPoint(thesis_id=sample_thesis.id, description="D", status=ProofPointStatus.IN_PROGRESS),
+        Thesis(canvas_id=gm_canvas.id, text="Unscored thesis"),
+    ])
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = await client.get(f"/api/portfolio/thesis-health?vbu_id={gm_canvas.vbu_id}", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["meta"]["total"] == 2
+    first, second = body["data"]
+    assert (first["thesis_order"], first["observed"], first["not_observed"]) == (1, 2, 1)
+    assert (first["total_scored"], first["total_proof_points"], first["signal"]) == (3, 4, "strengthening")
+    assert first["status_counts"] == {
+        "not_started": 0, "in_progress": 1, "observed": 2, "not_observed": 1, "stalled": 0,
+    }
+    assert "proof_points" not in first
+    assert (second["thesis_order"], second["signal"]) == (2, "neutral")
+
+    response = await client.get(
+        f"/api/portfolio/thesis-health?vbu_id={gm_canvas.vbu_id}&signal=neutral&include_proof_points=true",
+        headers=headers,
+    )
+    body = response.json()
+    assert body["meta"]["total"] == 1
+    assert body["data"][0]["proof_points"] == []
+
+    response = await client.get(
+        f"/api/portfolio/thesis-health?vbu_id={gm_canvas.vbu_id}&include_proof_points=true&per_page=1",
+        headers=headers,
+    )
+    body = response.json()
+    assert body["meta"]["total"] == 2 and len(body["data"]) == 1
+    assert sorted(pp["description"] for pp in body["data"][0]["proof_points"]) == ["A", "B", "C", "D"]
+
+
+@pytest.mark.asyncio
+async def test_thesis_health_invalid_signal_filter(client: AsyncClient, admin_token: str):
+    """Invalid signal filter returns 422"""
+    response = await client.get("/api/portfolio/thesis-health?signal=sideways", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_portfolio_ndjson_is_role_scoped(client: AsyncClient, admin_user: User, gm_user: User, gm_token: str, db_session):
+    """NDJSON export streams only the rows the caller can see"""
+    import json
+    vbu1 = VBU(name="Admin VBU", gm_id=admin_user.id)
+    vbu2 = VBU(name="GM VBU", gm_id=gm_user.id)
+    db_session.add_all([vbu1, vbu2])
+    await db_session.commit()
+    db_session.add_all([
+        Canvas(vbu_id=vbu1.id, lifecycle_lane="build", health_indicator_cache="On Track"),
+        Canvas(vbu_id=vbu2.id, lifecycle_lane="sell", health_indicator_cache="At Risk"),
+    ])
+    await db_session.commit()
+
+    response = await client.get("/api/portfolio/export", headers={"Authorization": f"Bearer {gm_token}"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["GM VBU"]
+    assert rows[0]["vbu_id"] == str(vbu2.id)
+    assert rows[0]["lifecycle_lane"] == "sell"
+
+
+@pytest.mark.asyncio
+async def test_export_portfolio_csv(client: AsyncClient, admin_token: str, gm_vbu: VBU):
+    """CSV export starts with a header row and carries an attachment filename"""
+    import csv
+    import io
+    response = await client.get("/api/portfolio/export?format=csv", headers={"Authorization": f"Bearer {admin_token}"})
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="portfolio.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert any(row["vbu_id"] == str(gm_vbu.id) and row["name"] == gm_vbu.name for row in rows)
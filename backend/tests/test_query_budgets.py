@@ -0,0 +1,322 @@
+"""SQL statement budgets for the API routes.
+
+Every API route, reads and writes alike, is either listed in BUDGETS with its
+own statement ceiling or in UNBUDGETED. Each budgeted route is called against
+a small populated canvas and must stay within its ceiling. The scaling tests
+grow the dataset under a route and assert its statement count does not move,
+which is what catches an N+1.
+"""
+import uuid
+from datetime import date
+import pytest
+from sqlalchemy import select
+from httpx import AsyncClient
+from canvas.config import Settings
+from canvas.models.canvas import Canvas, LifecycleLane
+from canvas.models.commitment import Commitment
+from canvas.models.monthly_review import MonthlyReview
+from canvas.models.proof_point import ProofPoint, ProofPointStatus
+from canvas.models.thesis import Thesis
+from canvas.models.thesis_category import ThesisCategory
+from canvas.models.vbu import VBU
+from canvas.ratelimit import MemoryBackend, rate_limiter
+from canvas.routes.attachment import get_attachment_service
+from canvas.services.attachment_service import AttachmentService
+
+# (method, route template) -> most statements one call may issue, including the
+# auth lookup and the test session's savepoints. These are the measured counts:
+# raise one only with a reason, since any growth is what this file exists to catch.
+BUDGETS = {
+    ("POST", "/api/attachments"): 7,
+    ("DELETE", "/api/attachments/{attachment_id}"): 7,
+    ("POST", "/api/auth/login"): 4,
+    ("POST", "/api/auth/logout"): 0,
+    ("GET", "/api/auth/me"): 3,
+    ("POST", "/api/auth/refresh"): 3,
+    ("POST", "/api/auth/register"): 5,
+    ("POST", "/api/auth/reset-password"): 6,
+    ("GET", "/api/auth/users"): 4,
+    ("PATCH", "/api/auth/users/{user_id}"): 7,
+    ("DELETE", "/api/auth/users/{user_id}"): 6,
+    ("POST", "/api/auth/users/{user_id}/reset-password"): 6,
+    ("GET", "/api/canvases/{canvas_id}/reviews"): 8,
+    ("POST", "/api/canvases/{canvas_id}/reviews"): 11,
+    ("GET", "/api/canvases/{canvas_id}/theses"): 7,
+    ("POST", "/api/canvases/{canvas_id}/theses"): 10,
+    ("PUT", "/api/canvases/{canvas_id}/theses/reorder"): 7,
+    ("GET", "/api/portfolio/export"): 4,
+    ("PATCH", "/api/portfolio/notes"): 4,
+    ("GET", "/api/portfolio/summary"): 5,
+    ("GET", "/api/portfolio/thesis-health"): 5,
+    ("PATCH", "/api/proof-points/{proof_point_id}"): 7,
+    ("DELETE", "/api/proof-points/{proof_point_id}"): 6,
+    ("POST", "/api/proof-points/{proof_point_id}/move"): 6,
+    ("GET", "/api/reviews/{review_id}"): 7,
+    ("PATCH", "/api/theses/{thesis_id}"): 7,
+    ("DELETE", "/api/theses/{thesis_id}"): 6,
+    ("POST", "/api/theses/{thesis_id}/move"): 10,
+    ("GET", "/api/theses/{thesis_id}/proof-points"): 4,
+    ("POST", "/api/theses/{thesis_id}/proof-points"): 8,
+    ("PATCH", "/api/theses/{thesis_id}/proof-points"): 9,
+    ("GET", "/api/thesis-categories"): 4,
+    ("GET", "/api/vbus"): 6,
+    ("POST", "/api/vbus"): 11,
+    ("GET", "/api/vbus/{vbu_id}"): 5,
+    ("PATCH", "/api/vbus/{vbu_id}"): 10,
+    ("DELETE", "/api/vbus/{vbu_id}"): 6,
+    ("GET", "/api/vbus/{vbu_id}/canvas"): 5,
+    ("PUT", "/api/vbus/{vbu_id}/canvas"): 8,
+}
+
+# Routes that serve files or answer without a session, covered by their own tests
+UNBUDGETED = {
+    ("GET", "/api/health"),
+    ("OPTIONS", "/api/health"),
+    ("GET", "/api/vbus/{vbu_id}/canvas/pdf"),
+    ("GET", "/api/attachments/{attachment_id}"),
+    ("GET", "/api/attachments/{attachment_id}/blob/{sha256}"),
+}
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde"
+
+
+def _request_kwargs(method, route, ids):
+    """Body, form or cookie for one budgeted call; reads and deletes need none."""
+    if method == "POST" and route == "/api/attachments":
+        return {"files": {"file": ("proof.png", PNG, "image/png")}, "data": {"proof_point_id": str(ids["proof_point_id"])}}
+    if route == "/api/auth/login":
+        return {"json": {"email": "admin@test.com", "password": "Admin123!"}}
+    if route == "/api/auth/refresh":
+        return {"headers": {"Cookie": f"refresh_token={ids['refresh_token']}"}}
+    if route == "/api/auth/register":
+        return {"json": {"email": "budget@test.com", "password": "Budget123!", "name": "Budget User"}}
+    if route == "/api/auth/reset-password":
+        return {"json": {"current_password": "Admin123!", "new_password": "Admin1234!"}}
+    if method == "PATCH" and route == "/api/auth/users/{user_id}":
+        return {"json": {"role": "gm"}}
+    if method == "POST" and route == "/api/canvases/{canvas_id}/reviews":
+        return {"json": {
+            "review_date": "2025-06-15",
+            "currently_testing_type": "thesis",
+            "currently_testing_id": str(ids["thesis_id"]),
+            "commitments": [{"text": "Ship it", "order": 1}, {"text": "Measure it", "order": 2}],
+        }}
+    if method == "POST" and route == "/api/canvases/{canvas_id}/theses":
+        return {"json": {"text": "New thesis"}}
+    if route == "/api/canvases/{canvas_id}/theses/reorder":
+        return {"json": {"thesis_orders": [{"id": str(ids["thesis_id"]), "order": 1}]}}
+    if route == "/api/portfolio/notes":
+        return {"json": {"notes": "Budget notes"}}
+    if method == "PATCH" and route == "/api/proof-points/{proof_point_id}":
+        return {"json": {"status": "observed"}}
+    if route.endswith("/move"):
+        return {"json": {"after_id": None}}
+    if method == "PATCH" and route == "/api/theses/{thesis_id}":
+        return {"json": {"text": "Edited thesis"}}
+    if method == "POST" and route == "/api/theses/{thesis_id}/proof-points":
+        return {"json": {"description": "New proof point"}}
+    if method == "PATCH" and route == "/api/theses/{thesis_id}/proof-points":
+        return {"json": {
+            "create": [{"description": "Batch proof point"}],
+            "update": [{"id": str(ids["proof_point_id"]), "status": "observed"}],
+        }}
+    if method == "POST" and route == "/api/vbus":
+        return {"json": {"name": "Budget VBU", "gm_id": str(ids["gm_id"])}}
+    if method == "PATCH" and route == "/api/vbus/{vbu_id}":
+        return {"json": {"name": "Renamed VBU"}}
+    if method == "PUT" and route == "/api/vbus/{vbu_id}/canvas":
+        return {"json": {"product_name": "Renamed product"}}
+    return {}
+
+
+async def _add_canvas(db_session, gm_id, name, theses=1, proof_points=1, reviewed_by=None):
+    vbu = VBU(id=uuid.uuid4(), name=name, gm_id=gm_id)
+    db_session.add(vbu)
+    await db_session.flush()
+    canvas = Canvas(id=uuid.uuid4(), vbu_id=vbu.id, product_name=name, lifecycle_lane=LifecycleLane.BUILD)
+    db_session.add(canvas)
+    await db_session.flush()
+    await _add_theses(db_session, canvas, theses, proof_points)
+    if reviewed_by is not None:
+        await _add_reviews(db_session, canvas, reviewed_by, 1)
+    await db_session.commit()
+    return canvas
+
+
+async def _add_theses(db_session, canvas, count, proof_points, category=None):
+    theses = []
+    for i in range(count):
+        thesis = Thesis(
+            id=uuid.uuid4(), canvas_id=canvas.id, text=f"Thesis {i + 1}",
+            category_id=category.id if category else None,
+        )
+        db_session.add(thesis)
+        await db_session.flush()
+        await _add_proof_points(db_session, thesis, proof_points)
+        theses.append(thesis)
+    return theses
+
+
+async def _add_proof_points(db_session, thesis, count):
+    for i in range(count):
+        db_session.add(ProofPoint(
+            id=uuid.uuid4(), thesis_id=thesis.id, description=f"Proof point {i + 1}",
+            status=ProofPointStatus.OBSERVED if i % 2 else ProofPointStatus.NOT_STARTED,
+        ))
+    await db_session.flush()
+
+
+async def _add_reviews(db_session, canvas, user, count, offset=0):
+    for i in range(count):
+        review = MonthlyReview(
+            id=uuid.uuid4(), canvas_id=canvas.id, review_date=date(2025, 1 + offset + i, 15), created_by=user.id,
+        )
+        db_session.add(review)
+        await db_session.flush()
+        for order in (1, 2):
+            db_session.add(Commitment(id=uuid.uuid4(), monthly_review_id=review.id, text=f"Commit {order}", order=order))
+    await db_session.flush()
+
+
+async def _statements(client, count_queries, url, headers):
+    with count_queries() as queries:
+        response = await client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return queries.count
+
+
+def test_every_route_has_a_budget(app):
+    routes = {
+        (method, route.path) for route in app.routes if route.path.startswith("/api/")
+        for method in getattr(route, "methods", ()) if method != "HEAD"
+    }
+    assert not set(BUDGETS) & UNBUDGETED
+    assert routes - UNBUDGETED == set(BUDGETS)
+
+
+@pytest.fixture
+def attachment_service(app, tmp_path):
+    service = AttachmentService(Settings(upload_dir=str(tmp_path)))
+    app.dependency_overrides[get_attachment_service] = lambda: service
+    return service
+
+
+@pytest.fixture
+def fresh_rate_limits(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backend", MemoryBackend())
+
+
+@pytest.mark.parametrize("method,route", sorted(BUDGETS))
+async def test_route_stays_within_statement_budget(
+    method, route, client: AsyncClient, admin_user, admin_token, gm_user, sample_user, sample_canvas,
+    db_session, auth_service, attachment_service, fresh_rate_limits, count_queries
+):
+    category = ThesisCategory(id=uuid.uuid4(), name=f"Category {uuid.uuid4()}")
+    db_session.add(category)
+    await db_session.flush()
+    theses = await _add_theses(db_session, sample_canvas, 3, 2, category)
+    await _add_reviews(db_session, sample_canvas, admin_user, 2)
+    await db_session.commit()
+    review_id = (await db_session.execute(
+        select(MonthlyReview.id).where(MonthlyReview.canvas_id == sample_canvas.id).limit(1)
+    )).scalar_one()
+    proof_point_id = (await db_session.execute(
+        select(ProofPoint.id).where(ProofPoint.thesis_id == theses[1].id).limit(1)
+    )).scalar_one()
+    ids = {
+        "vbu_id": sample_canvas.vbu_id, "canvas_id": sample_canvas.id, "thesis_id": theses[1].id,
+        "proof_point_id": proof_point_id, "review_id": review_id, "user_id": sample_user.id,
+        "gm_id": gm_user.id, "refresh_token": await auth_service.create_refresh_token(admin_user),
+    }
+    headers = {"Authorization": f"Bearer {admin_token}", "X-CSRF-Token": "test"}
+    if "{attachment_id}" in route:
+        uploaded = await client.post("/api/attachments", headers=headers, **_request_kwargs("POST", "/api/attachments", ids))
+        assert uploaded.status_code == 201, uploaded.text
+        ids["attachment_id"] = uploaded.json()["data"]["id"]
+    kwargs = _request_kwargs(method, route, ids)
+    headers.update(kwargs.pop("headers", {}))
+
+    with count_queries() as queries:
+        response = await client.request(method, route.format(**ids), headers=headers, **kwargs)
+
+    assert response.status_code < 400, response.text
+    queries.assert_at_most(BUDGETS[(method, route)], f"{method} {route}")
+
+
+class TestStatementsStayFlat:
+    """Growing the data under a route must not add statements to it."""
+
+    async def test_canvas_document_theses_and_proof_points(
+        self, client: AsyncClient, admin_token, sample_canvas, db_session, count_queries
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        [thesis] = await _add_theses(db_session, sample_canvas, 1, 1)
+        await db_session.commit()
+        urls = [
+            f"/api/vbus/{sample_canvas.vbu_id}/canvas",
+            f"/api/canvases/{sample_canvas.id}/theses",
+            f"/api/theses/{thesis.id}/proof-points",
+        ]
+        await client.get("/api/auth/me", headers=headers)
+        before = [await _statements(client, count_queries, url, headers) for url in urls]
+
+        await _add_proof_points(db_session, thesis, 6)
+        await _add_theses(db_session, sample_canvas, 4, 4)
+        await db_session.commit()
+        after = [await _statements(client, count_queries, url, headers) for url in urls]
+
+        assert after == before
+
+    async def test_portfolio_summary_thesis_health_and_vbus(
+        self, client: AsyncClient, admin_user, admin_token, gm_user, db_session, count_queries
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        await _add_canvas(db_session, gm_user.id, "Scale 0", reviewed_by=admin_user)
+        urls = [
+            "/api/portfolio/summary",
+            "/api/portfolio/thesis-health?include_proof_points=true&per_page=500",
+            "/api/portfolio/export?format=ndjson",
+            "/api/vbus",
+            "/api/vbus?cursor=",
+        ]
+        await client.get("/api/auth/me", headers=headers)
+        before = [await _statements(client, count_queries, url, headers) for url in urls]
+
+        for i in range(1, 8):
+            await _add_canvas(db_session, gm_user.id, f"Scale {i}", theses=3, proof_points=3, reviewed_by=admin_user)
+        after = [await _statements(client, count_queries, url, headers) for url in urls]
+
+        assert after == before
+
+    async def test_reviews(self, client: AsyncClient, admin_user, admin_token, sample_canvas, db_session, count_queries):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        await _add_reviews(db_session, sample_canvas, admin_user, 1)
+        await db_session.commit()
+        url = f"/api/canvases/{sample_canvas.id}/reviews"
+        await client.get("/api/auth/me", headers=headers)
+        before = await _statements(client, count_queries, url, headers)
+
+        await _add_reviews(db_session, sample_canvas, admin_user, 6, offset=1)
+        await db_session.commit()
+        after = await _statements(client, count_queries, url, headers)
+
+        assert after == before
+
+    async def test_cascading_deletes(
+        self, client: AsyncClient, admin_user, admin_token, gm_user, db_session, count_queries
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}", "X-CSRF-Token": "test"}
+        small = await _add_canvas(db_session, gm_user.id, "Delete small", reviewed_by=admin_user)
+        large = await _add_canvas(db_session, gm_user.id, "Delete large", theses=4, proof_points=4)
+        await _add_reviews(db_session, large, admin_user, 4)
+        await db_session.commit()
+        await client.get("/api/auth/me", headers=headers)
+
+        counts = []
+        for canvas in (small, large):
+            with count_queries() as queries:
+                response = await client.delete(f"/api/vbus/{canvas.vbu_id}", headers=headers)
+            assert response.status_code == 204, response.text
+            counts.append(queries.count)
+
+        assert counts[0] == counts[1]
@@ -0,0 +1,50 @@
+import random
+import pytest
+from canvas.ranking import MAX_RANK_LENGTH, rank_between, rank_for_position, renumbered, rerank
+
+
+class TestRankBetween:
+    def test_open_ends(self):
+        first = rank_for_position(1)
+        assert rank_between(None, first) < first
+        assert rank_between(first, None) > first
+
+    def test_always_finds_room(self):
+        keys = [rank_for_position(1), rank_for_position(2)]
+        for _ in range(200):
+            index = random.randint(0, len(keys))
+            lo = keys[index - 1] if index else None
+            hi = keys[index] if index < len(keys) else None
+            keys.insert(index, rank_between(lo, hi))
+        assert keys == sorted(keys)
+        assert len(set(keys)) == len(keys)
+
+    def test_rejects_inverted_bounds(self):
+        with pytest.raises(ValueError):
+            rank_between(rank_for_position(2), rank_for_position(1))
+
+
+class TestRerank:
+    def test_single_move_changes_one_row(self):
+        current = [(i, rank_for_position(i)) for i in range(1, 6)]
+        changes = rerank(current, [5, 1, 2, 3, 4])
+        assert list(changes) == [5]
+        assert changes[5] < rank_for_position(1)
+
+    def test_any_permutation_sorts_correctly(self):
+        current = [(i, rank_for_position(i)) for i in range(1, 8)]
+        for _ in range(100):
+            desired = [i for i, _ in current]
+            random.shuffle(desired)
+            ranks = dict(current) | rerank(current, desired)
+            assert sorted(desired, key=ranks.get) == desired
+            assert len(set(ranks.values())) == len(ranks)
+
+
+class TestRenumbered:
+    def test_keys_follow_given_order(self):
+        ids = ["c", "a", "b"]
+        ranks = renumbered(ids)
+        assert sorted(ids, key=ranks.get) == ids
+        assert all(len(rank) < MAX_RANK_LENGTH for rank in ranks.values())
+        assert ranks["c"] == rank_for_position(1)
@@ -0,0 +1,115 @@
+import asyncio
+import time
+import uuid
+import pytest
+from fastapi import HTTPException
+from canvas.ratelimit import MemoryBackend, PostgresBackend, RateLimitBackend, RateLimiter, RedisBackend
+
+
+class _FailingBackend(RateLimitBackend):
+    async def hit(self, key, window_start, window_seconds):
+        raise ConnectionRefusedError()
+
+
+async def _serve_resp(reader, writer, store):
+    """Minimal Redis-protocol stand-in supporting INCR, EXPIRE and GET."""
+    while line := await reader.readline():
+        args = []
+        for _ in range(int(line[1:])):
+            length = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(length + 2))[:-2].decode())
+        command = args[0].upper()
+        if command == "INCR":
+            store[args[1]] = store.get(args[1], 0) + 1
+            writer.write(b":%d\r\n" % store[args[1]])
+        elif command == "EXPIRE":
+            writer.write(b":1\r\n")
+        elif command == "GET" and args[1] in store:
+            value = str(store[args[1]]).encode()
+            writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+        elif command == "GET":
+            writer.write(b"$-1\r\n")
+        else:
+            writer.write(b"-ERR unknown command\r\n")
+        await writer.drain()
+    writer.close()
+
+
+def _window(seconds=60):
+    return int(time.time() // seconds) * seconds
+
+
+class TestMemoryBackend:
+    @pytest.mark.asyncio
+    async def test_rolls_current_count_into_previous(self):
+        backend = MemoryBackend()
+        start = _window()
+        assert await backend.hit("k", start, 60) == (1, 0)
+        assert await backend.hit("k", start, 60) == (2, 0)
+        assert await backend.hit("k", start + 60, 60) == (1, 2)
+        assert await backend.hit("k", start + 300, 60) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_keys(self):
+        backend = MemoryBackend(max_keys=2)
+        for key in ("a", "b", "c"):
+            await backend.hit(key, _window(), 60)
+        assert list(backend._counters) == ["b", "c"]
+
+
+class TestRateLimitBackend:
+    def test_backend_must_implement_hit(self):
+        class Incomplete(RateLimitBackend):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_rejects_past_limit_with_retry_after(self):
+        limiter = RateLimiter(MemoryBackend())
+        for _ in range(3):
+            await limiter.hit("login:1.2.3.4", limit=3, window_seconds=60)
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter.hit("login:1.2.3.4", limit=3, window_seconds=60)
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+        await limiter.hit("login:5.6.7.8", limit=3, window_seconds=60)
+
+    @pytest.mark.asyncio
+    async def test_fails_open_when_backend_is_down(self):
+        limiter = RateLimiter(_FailingBackend())
+        for _ in range(5):
+            await limiter.hit("login:1.2.3.4", limit=1, window_seconds=60)
+
+
+class TestRedisBackend:
+    @pytest.mark.asyncio
+    async def test_counts_through_resp_stand_in(self):
+        store = {}
+        server = await asyncio.start_server(lambda r, w: _serve_resp(r, w, store), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        backend = RedisBackend(f"redis://127.0.0.1:{port}/0")
+        try:
+            assert await backend.hit("k", 600, 60) == (1, 0)
+            assert await backend.hit("k", 600, 60) == (2, 0)
+            assert await backend.hit("k", 660, 60) == (1, 2)
+            assert store["ratelimit:k:660"] == 1
+        finally:
+            await backend.close()
+            await asyncio.sleep(0.01)
+            server.close()
+            await server.wait_closed()
+
+
+class TestPostgresBackend:
+    @pytest.mark.asyncio
+    async def test_counts_in_unlogged_table(self, engine):
+        backend = PostgresBackend(engine)
+        key = f"test:{uuid.uuid4()}"
+        assert await backend.hit(key, 600, 60) == (1, 0)
+        assert await backend.hit(key, 600, 60) == (2, 0)
+        assert await backend.hit(key, 660, 60) == (1, 2)
+        await backend.purge()
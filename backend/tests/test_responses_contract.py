@@ -1,6 +1,11 @@
 import re
-from datetime import datetime
-from canvas import success_response, list_response
+from datetime import datetime, timezone
+from enum import Enum
+from uuid import uuid4
+import json
+from fastapi import Response
+from pydantic import BaseModel
+from canvas import success_response, list_response, raw_success_response, json_response
 
 
 def test_success_response_structure():
@@ -39,4 +44,43 @@ def test_response_timestamp_format():
     assert re.match(iso_pattern, timestamp)
     
     # Should be parseable as datetime
-    datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
\ No newline at end of file
+    datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+def test_raw_success_response_wraps_document():
+    """Test raw_success_response embeds pre-serialized JSON in the envelope"""
+    response = raw_success_response('{"id": 1, "items": []}')
+    body = json.loads(response.body)
+
+    assert response.media_type == "application/json"
+    assert body["data"] == {"id": 1, "items": []}
+    assert "timestamp" in body["meta"]
+
+
+class _Status(str, Enum):
+    ON_TRACK = "On Track"
+
+
+class _Item(BaseModel):
+    id: object
+    status: _Status
+    created_at: datetime
+
+
+def test_json_response_serializes_models_in_envelope():
+    """Test json_response renders nested models, UUIDs, enums and datetimes"""
+    item_id = uuid4()
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    injected = Response()
+    del injected.headers["content-length"]
+    injected.headers["ETag"] = '"abc"'
+    response = json_response(
+        list_response([_Item(id=item_id, status=_Status.ON_TRACK, created_at=created_at)], 1),
+        response=injected,
+    )
+    body = json.loads(response.body)
+
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == '"abc"'
+    assert body["data"] == [{"id": str(item_id), "status": "On Track", "created_at": "2024-05-01T12:30:00Z"}]
+    assert body["meta"]["total"] == 1
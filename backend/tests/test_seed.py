@@ -0,0 +1,46 @@
+import uuid
+from datetime import date
+from pathlib import Path
+from canvas.seed import COLUMNS, PortfolioGenerator, parse_args
+
+CATEGORY_ID = uuid.UUID(int=1)
+UPLOADER_ID = uuid.UUID(int=2)
+
+
+def _generate(tmp_path, *argv):
+    args = parse_args(["--vbus", "3", "--theses", "5", "--proof-points", "4", "--reviews", "14",
+                       "--attachments", "6", "--blobs", "2", "--blob-kb", "1", "--as-of", "2026-03-01", *argv])
+    generator = PortfolioGenerator(args, [CATEGORY_ID], UPLOADER_ID)
+    generator.make_blobs(tmp_path)
+    gm_ids = [row[0] for row in generator.users("gm", 2, "hash")]
+    return generator, generator.batch(1, args.vbus, gm_ids, [])
+
+
+def test_same_seed_generates_same_rows(tmp_path):
+    _, first = _generate(tmp_path)
+    _, second = _generate(tmp_path)
+    _, other = _generate(tmp_path, "--seed", "7")
+    assert first == second
+    assert first["vbus"] != other["vbus"]
+
+
+def test_rows_match_requested_shape_and_constraints(tmp_path):
+    generator, rows = _generate(tmp_path)
+    assert len(rows["vbus"]) == len(rows["canvases"]) == 3
+    assert len(rows["theses"]) == 15
+    assert len(rows["proof_points"]) == 60
+    assert len(rows["monthly_reviews"]) == 42
+    assert len(rows["attachments"]) == 18
+    for table, records in rows.items():
+        assert all(len(record) == len(COLUMNS[table]) for record in records)
+
+    review_dates = [(r[1], r[2]) for r in rows["monthly_reviews"]]
+    assert len(set(review_dates)) == len(review_dates)
+    assert max(r[2] for r in rows["monthly_reviews"]) == date(2026, 3, 1)
+    assert min(r[2] for r in rows["monthly_reviews"]) == date(2025, 2, 1)
+    assert {c[3] for c in rows["commitments"]} <= {1, 2, 3}
+    assert len({(t[1], t[2]) for t in rows["theses"]}) == 15
+
+    blob_paths = {path for path, _, _ in generator.blobs}
+    assert all(a[4] in blob_paths and (a[1] is None) != (a[2] is None) for a in rows["attachments"])
+    assert all(tmp_path in Path(path).parents for path in blob_paths)
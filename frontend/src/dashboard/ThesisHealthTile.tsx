@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { apiClient } from '../api/client';
+import { listProofPoints } from '../api/canvas';
 
 type Status = 'observed' | 'not_observed' | 'in_progress' | 'not_started' | 'stalled';
 
@@ -18,10 +19,21 @@ interface ThesisHealth {
   not_observed: number;
   total_scored: number;
   total_proof_points: number;
+  status_counts: Record<Status, number>;
   signal: 'strengthening' | 'weakening' | 'neutral';
-  proof_points: PPInfo[];
 }
 
+interface ThesisHealthPage {
+  data: ThesisHealth[];
+  meta: { total: number };
+}
+
+// Theses are fetched a page at a time up to this many; beyond it the tile says it is partial
+const PER_PAGE = 500;
+const MAX_PAGES = 4;
+
+type Detail = PPInfo[] | 'loading' | 'error';
+
 const statusColors: Record<Status, { bg: string; label: string }> = {
   observed:     { bg: 'bg-green-500',  label: 'Observed' },
   not_observed: { bg: 'bg-red-400',    label: 'Not Observed' },
@@ -38,38 +50,39 @@ const signalConfig = {
   neutral:       { icon: '—', color: 'text-gray-400',  label: 'Neutral' },
 };
 
-function groupByStatus(pps: PPInfo[]): { status: Status; pps: PPInfo[] }[] {
-  const map = new Map<Status, PPInfo[]>();
-  for (const pp of pps) {
-    const s = pp.status as Status;
-    if (!map.has(s)) map.set(s, []);
-    map.get(s)!.push(pp);
+function groupByStatus(counts: Record<Status, number>): { status: Status; count: number }[] {
+  return statusOrder.filter(s => counts[s] > 0).map(s => ({ status: s, count: counts[s] }));
+}
+
+function sumCounts(items: ThesisHealth[]): Record<Status, number> {
+  const totals = { observed: 0, not_observed: 0, in_progress: 0, not_started: 0, stalled: 0 };
+  for (const item of items) {
+    for (const s of statusOrder) totals[s] += item.status_counts[s];
   }
-  return statusOrder.filter(s => map.has(s)).map(s => ({ status: s, pps: map.get(s)! }));
+  return totals;
 }
 
-function ClickableBar({ groups, total, vbuId, navigate }: {
-  groups: { status: Status; pps: PPInfo[] }[];
+function ClickableBar({ groups, total, onSelect }: {
+  groups: { status: Status; count: number }[];
   total: number;
-  vbuId: string;
-  navigate: (path: string) => void;
+  onSelect: (status: Status) => void;
 }) {
   if (total === 0) return <div className="h-4 w-full bg-gray-100 rounded-full" />;
   return (
     <div className="h-4 w-full bg-gray-100 rounded-full overflow-hidden flex">
-      {groups.map(({ status, pps }) => {
-        const pct = (pps.length / total) * 100;
+      {groups.map(({ status, count }) => {
+        const pct = (count / total) * 100;
         const cfg = statusColors[status];
         return (
           <div
             key={status}
             className={`${cfg.bg} h-full cursor-pointer hover:brightness-110 transition-all relative group`}
             style={{ width: `${pct}%` }}
-            title={`${cfg.label}: ${pps.length} proof point${pps.length !== 1 ? 's' : ''} — click to view`}
-            onClick={() => navigate(`/vbus/${vbuId}/canvas#pp-${pps[0].id}`)}
+            title={`${cfg.label}: ${count} proof point${count !== 1 ? 's' : ''} — click to view`}
+            onClick={() => onSelect(status)}
           >
             <div className="absolute bottom-full left-1/2 -translate-x-1/2 mb-1 hidden group-hover:block z-10 bg-gray-800 text-white text-xs rounded px-2 py-1 whitespace-nowrap pointer-events-none">
-              {cfg.label} ({pps.length})
+              {cfg.label} ({count})
             </div>
           </div>
         );
@@ -81,15 +94,59 @@ function ClickableBar({ groups, total, vbuId, navigate }: {
 export const ThesisHealthTile: React.FC<{ vbuIds?: string[] }> = ({ vbuIds = [] }) => {
   const navigate = useNavigate();
   const [items, setItems] = useState<ThesisHealth[]>([]);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [expanded, setExpanded] = useState<string | null>(null);
+  const [details, setDetails] = useState<Record<string, Detail>>({});
+  const vbuFilter = vbuIds.join(',');
 
   useEffect(() => {
-    apiClient.get<{ data: ThesisHealth[] }>('/portfolio/thesis-health')
-      .then(res => setItems(res.data.data))
-      .catch(() => setError('Failed to load thesis health data'))
-      .finally(() => setLoading(false));
-  }, []);
+    let cancelled = false;
+    const load = async () => {
+      const loaded: ThesisHealth[] = [];
+      let matching = 0;
+      for (let page = 1; page <= MAX_PAGES; page++) {
+        const res = await apiClient.get<ThesisHealthPage>('/portfolio/thesis-health', {
+          params: { page, per_page: PER_PAGE, ...(vbuFilter ? { vbu_id: vbuFilter } : {}) },
+        });
+        loaded.push(...res.data.data);
+        matching = res.data.meta.total;
+        if (loaded.length >= matching || res.data.data.length === 0) break;
+      }
+      if (!cancelled) {
+        setItems(loaded);
+        setTotal(matching);
+        setError(null);
+      }
+    };
+    setLoading(true);
+    load()
+      .catch(() => { if (!cancelled) setError('Failed to load thesis health data'); })
+      .finally(() => { if (!cancelled) setLoading(false); });
+    return () => { cancelled = true; };
+  }, [vbuFilter]);
+
+  const toggle = (thesisId: string) => {
+    if (expanded === thesisId) {
+      setExpanded(null);
+      return;
+    }
+    setExpanded(thesisId);
+    const current = details[thesisId];
+    if (current !== undefined && current !== 'error') return;
+    setDetails(d => ({ ...d, [thesisId]: 'loading' }));
+    listProofPoints(thesisId)
+      .then(pps => setDetails(d => ({ ...d, [thesisId]: pps.map(({ id, status, description }) => ({ id, status, description })) })))
+      .catch(() => setDetails(d => ({ ...d, [thesisId]: 'error' })));
+  };
+
+  // Jump to the first loaded proof point with that status, or to the canvas
+  const openCanvas = (vbuId: string, thesisId?: string) => (status: Status) => {
+    const detail = thesisId ? details[thesisId] : undefined;
+    const pp = Array.isArray(detail) ? detail.find(p => p.status === status) : undefined;
+    navigate(pp ? `/vbus/${vbuId}/canvas#pp-${pp.id}` : `/vbus/${vbuId}/canvas`);
+  };
 
   if (loading) {
     return (
@@ -107,37 +164,36 @@ export const ThesisHealthTile: React.FC<{ vbuIds?: string[] }> = ({ vbuIds = []
   if (error) return <div className="bg-white rounded-lg border border-neutral-100 p-6 text-sm text-red-600">{error}</div>;
   if (items.length === 0) return null;
 
-  // Apply VBU filter
-  const filtered = vbuIds.length > 0 ? items.filter(i => vbuIds.includes(i.vbu_id)) : items;
-  if (filtered.length === 0) return null;
-
   // Build VBU aggregates
-  const vbuMap = new Map<string, { vbu_id: string; vbu_name: string; pps: PPInfo[] }>();
-  for (const item of filtered) {
-    let agg = vbuMap.get(item.vbu_id);
+  const byVbu = new Map<string, { vbu_id: string; vbu_name: string; items: ThesisHealth[] }>();
+  for (const item of items) {
+    let agg = byVbu.get(item.vbu_id);
     if (!agg) {
-      agg = { vbu_id: item.vbu_id, vbu_name: item.vbu_name, pps: [] };
-      vbuMap.set(item.vbu_id, agg);
+      agg = { vbu_id: item.vbu_id, vbu_name: item.vbu_name, items: [] };
+      byVbu.set(item.vbu_id, agg);
     }
-    agg.pps.push(...item.proof_points);
+    agg.items.push(item);
   }
-  const aggregates = Array.from(vbuMap.values());
+  const aggregates = Array.from(byVbu.values()).map(agg => ({ ...agg, counts: sumCounts(agg.items) }));
 
   return (
     <div className="space-y-6">
       {/* Section 1: Overall VBU Proof Point Trend */}
       <div className="bg-white rounded-lg border border-neutral-100 p-6" role="region" aria-label="Portfolio proof point overview">
         <h2 className="text-lg font-semibold text-navy mb-4">Proof Point Overview</h2>
+        {items.length < total && (
+          <p className="text-xs text-amber-600 mb-3">Showing the first {items.length} of {total} theses; filter by VBU to see the rest.</p>
+        )}
         <div className="space-y-3">
           {aggregates.map(agg => {
-            const groups = groupByStatus(agg.pps);
+            const pps = agg.items.reduce((n, t) => n + t.total_proof_points, 0);
             return (
               <div key={agg.vbu_id} className="flex items-center gap-3">
                 <span className="text-sm font-medium text-gray-700 w-32 shrink-0 truncate" title={agg.vbu_name}>{agg.vbu_name}</span>
                 <div className="flex-1">
-                  <ClickableBar groups={groups} total={agg.pps.length} vbuId={agg.vbu_id} navigate={navigate} />
+                  <ClickableBar groups={groupByStatus(agg.counts)} total={pps} onSelect={openCanvas(agg.vbu_id)} />
                 </div>
-                <span className="text-xs text-gray-500 w-10 text-right shrink-0">{agg.pps.length}</span>
+                <span className="text-xs text-gray-500 w-10 text-right shrink-0">{pps}</span>
               </div>
             );
           })}
@@ -167,36 +223,74 @@ export const ThesisHealthTile: React.FC<{ vbuIds?: string[] }> = ({ vbuIds = []
               </tr>
             </thead>
             <tbody>
-              {filtered.map(t => {
+              {items.map(t => {
                 const cfg = signalConfig[t.signal];
-                const groups = groupByStatus(t.proof_points);
+                const isOpen = expanded === t.thesis_id;
+                const detail = details[t.thesis_id];
                 return (
-                  <tr key={t.thesis_id} className="border-b border-neutral-50 hover:bg-gray-50">
-                    <td className="py-2 pr-3 text-gray-600 whitespace-nowrap">{t.vbu_name}</td>
-                    <td className="py-2 pr-3 text-gray-800 max-w-xs truncate" title={t.thesis_text}>
-                      {t.thesis_order}. {t.thesis_text}
-                    </td>
-                    <td className="py-2 pr-3 whitespace-nowrap">
-                      {t.category_name
-                        ? (() => {
-                            const [bg, fg] = (t.category_color || '').split(',');
-                            return <span className="inline-flex items-center px-2 py-0.5 rounded-full text-xs font-medium" style={{ backgroundColor: bg || '#f3f4f6', color: fg || '#6b7280' }}>{t.category_name}</span>;
-                          })()
-                        : <span className="text-gray-400 text-xs">—</span>
-                      }
-                    </td>
-                    <td className="py-2 pr-3">
-                      <div className="flex items-center gap-2">
-                        <div className="flex-1">
-                          <ClickableBar groups={groups} total={t.proof_points.length} vbuId={t.vbu_id} navigate={navigate} />
+                  <React.Fragment key={t.thesis_id}>
+                    <tr className="border-b border-neutral-50 hover:bg-gray-50">
+                      <td className="py-2 pr-3 text-gray-600 whitespace-nowrap">{t.vbu_name}</td>
+                      <td className="py-2 pr-3 text-gray-800 max-w-xs truncate" title={t.thesis_text}>
+                        <button
+                          type="button"
+                          className="mr-1 text-gray-400 hover:text-gray-600"
+                          aria-expanded={isOpen}
+                          aria-label={`${isOpen ? 'Hide' : 'Show'} proof points`}
+                          onClick={() => toggle(t.thesis_id)}
+                        >
+                          {isOpen ? '▾' : '▸'}
+                        </button>
+                        {t.thesis_order}. {t.thesis_text}
+                      </td>
+                      <td className="py-2 pr-3 whitespace-nowrap">
+                        {t.category_name
+                          ? (() => {
+                              const [bg, fg] = (t.category_color || '').split(',');
+                              return <span className="inline-flex items-center px-2 py-0.5 rounded-full text-xs font-medium" style={{ backgroundColor: bg || '#f3f4f6', color: fg || '#6b7280' }}>{t.category_name}</span>;
+                            })()
+                          : <span className="text-gray-400 text-xs">—</span>
+                        }
+                      </td>
+                      <td className="py-2 pr-3">
+                        <div className="flex items-center gap-2">
+                          <div className="flex-1">
+                            <ClickableBar groups={groupByStatus(t.status_counts)} total={t.total_proof_points} onSelect={openCanvas(t.vbu_id, t.thesis_id)} />
+                          </div>
+                          <span className="text-xs text-gray-400 shrink-0 w-8 text-right">{t.total_proof_points}</span>
                         </div>
-                        <span className="text-xs text-gray-400 shrink-0 w-8 text-right">{t.proof_points.length}</span>
-                      </div>
-                    </td>
-                    <td className="py-2 text-center">
-                      <span className={`text-sm font-semibold ${cfg.color}`} title={cfg.label}>{cfg.icon}</span>
-                    </td>
-                  </tr>
+                      </td>
+                      <td className="py-2 text-center">
+                        <span className={`text-sm font-semibold ${cfg.color}`} title={cfg.label}>{cfg.icon}</span>
+                      </td>
+                    </tr>
+                    {isOpen && (
+                      <tr className="border-b border-neutral-50 bg-gray-50">
+                        <td />
+                        <td colSpan={4} className="py-2 pr-3 text-xs">
+                          {detail === 'loading' && <span className="text-gray-400">Loading proof points…</span>}
+                          {detail === 'error' && <span className="text-red-600">Failed to load proof points</span>}
+                          {Array.isArray(detail) && detail.length === 0 && <span className="text-gray-400">No proof points</span>}
+                          {Array.isArray(detail) && detail.length > 0 && (
+                            <ul className="space-y-1">
+                              {detail.map(pp => (
+                                <li key={pp.id} className="flex items-center gap-2">
+                                  <span className={`inline-block w-2 h-2 rounded-full shrink-0 ${statusColors[pp.status].bg}`} title={statusColors[pp.status].label} />
+                                  <button
+                                    type="button"
+                                    className="text-left text-gray-700 hover:underline truncate"
+                                    onClick={() => navigate(`/vbus/${t.vbu_id}/canvas#pp-${pp.id}`)}
+                                  >
+                                    {pp.description}
+                                  </button>
+                                </li>
+                              ))}
+                            </ul>
+                          )}
+                        </td>
+                      </tr>
+                    )}
+                  </React.Fragment>
                 );
               })}
             </tbody>